@@ -147,6 +147,7 @@ export default function App() {
       const data = await streamResearch({ question, audience, pdfFile }, (eventType, eventData) => {
         if (eventType === "status") setProgress(eventData);
         if (eventType === "plan") setPlanSteps(eventData.steps || []);
+        if (eventType === "report_delta") setReport((prev) => (prev || "") + eventData.text);
         if (eventType === "complete") setMetrics(eventData.metrics || null);
       });
       setReport(data?.report || "Research completed but no report was generated.");
@@ -2,15 +2,56 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+
+from research_agent.api.routers import research, stats
+from research_agent.api.warmup import WarmupState, warm_up
+from research_agent.config import settings
+from research_agent.llm.adapter import get_llm
+from research_agent.memory.checkpoint import open_checkpointer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Open the shared Ollama connection pool and checkpointer, warm up in the background.
+
+    Both are closed on shutdown.  ``/health`` answers 503 until the warm-up
+    (graph compile, tool warm-up, model preload) has finished.
+    """
+    llm = get_llm()
+    await llm.open()
+    exit_stack = contextlib.AsyncExitStack()
+    app.state.checkpointer = await exit_stack.enter_async_context(open_checkpointer())
+    app.state.warmup = WarmupState(ready=not settings.warmup_on_startup)
+    task = None
+    if settings.warmup_on_startup:
+        task = asyncio.create_task(warm_up(app, llm, app.state.warmup))
+    try:
+        yield
+    finally:
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        app.state.graph = None
+        app.state.checkpointer = None
+        del app.state.warmup
+        await exit_stack.aclose()
+        await llm.aclose()
 
-from research_agent.api.routers import research
 
 app = FastAPI(
     title="Research Agent",
     version="0.1.0",
     description="Autonomous technical research agent powered by LangGraph and Ollama.",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -22,6 +63,7 @@ app.add_middleware(
 )
 
 app.include_router(research.router, prefix="/api")
+app.include_router(stats.router, prefix="/api")
 
 
 @app.get("/")
@@ -30,5 +72,10 @@ async def index() -> dict:
 
 
 @app.get("/health")
-async def health() -> dict:
-    return {"status": "ok"}
+async def health() -> JSONResponse:
+    # Without a lifespan (e.g. a bare TestClient) there is nothing to wait for.
+    warmup: WarmupState | None = getattr(app.state, "warmup", None)
+    if warmup is None:
+        return JSONResponse({"status": "ok"})
+    body = {"status": "ok" if warmup.ready else "warming", "warmup": warmup.as_dict()}
+    return JSONResponse(body, status_code=200 if warmup.ready else 503)
@@ -6,7 +6,7 @@ import json
 import logging
 import uuid
 from collections.abc import AsyncGenerator
-from typing import Literal
+from typing import Any, Literal
 
 from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile
 from pydantic import BaseModel
@@ -14,7 +14,9 @@ from starlette.responses import StreamingResponse
 
 from research_agent.config import settings
 from research_agent.graph.builder import build_graph
-from research_agent.graph.state import AgentState
+from research_agent.graph.nodes import end_run
+from research_agent.graph.state import AgentState, RunMetrics, apply_update
+from research_agent.memory.checkpoint import discard_checkpoints, resumable_state, run_config
 from research_agent.memory.store import RunStore
 from research_agent.report.renderer import render_report
 from research_agent.tools.base import EvidenceItem
@@ -83,6 +85,7 @@ async def _build_initial_state(
         desired_depth=desired_depth,
         max_iters=max_iters,
         timebox_minutes=timebox_minutes,
+        max_parallel_steps=settings.max_parallel_steps,
         run_id=run_id,
         pdf_context=pdf_context,
         pdf_filename=pdf_filename,
@@ -100,8 +103,6 @@ def _summarize_metrics(metrics_data: dict | None) -> dict | None:
     """Summarize metrics from a raw state dict (works on plain dicts from LangGraph)."""
     if not metrics_data:
         return None
-    from research_agent.graph.state import RunMetrics
-
     return RunMetrics.model_validate(metrics_data).summary()
 
 
@@ -116,29 +117,68 @@ def _status_from_state(node: str, state: dict) -> dict:
         "tool": state.get("pending_tool", ""),
         "evidence_count": len(state.get("evidence", [])),
         "confidence": state.get("confidence", 0.0),
+        "stop_reason": state.get("stop_reason", ""),
     }
     metrics = state.get("metrics")
-    if metrics:
-        payload["metrics"] = _summarize_metrics(
-            metrics if isinstance(metrics, dict) else metrics.model_dump()
-        )
+    if isinstance(metrics, RunMetrics):
+        payload["metrics"] = metrics.summary()  # no dump/re-validate round trip
+    elif metrics:
+        payload["metrics"] = _summarize_metrics(metrics)
     return payload
 
 
-async def _stream_research(initial_state: AgentState, run_id: str) -> AsyncGenerator[str, None]:
-    """Async generator that yields SSE events as the graph executes."""
-    graph = build_graph()
-    state_dict = initial_state.model_dump()
+def _graph(request: Request) -> Any:
+    """The graph compiled at start-up, or a fresh one if warm-up hasn't produced it."""
+    return getattr(request.app.state, "graph", None) or build_graph(_checkpointer(request))
+
+
+def _checkpointer(request: Request) -> Any:
+    return getattr(request.app.state, "checkpointer", None)
+
+
+async def _finish_run(state_dict: dict, checkpointer: Any) -> AgentState:
+    """Render and store the report of a finished run and drop its checkpoints."""
+    final_state = AgentState.model_validate(state_dict)
+    final_state.report = render_report(final_state)
+
+    store = RunStore()
+    store.save(final_state)
+    await discard_checkpoints(checkpointer, final_state.run_id)
+    return final_state
+
 
+async def _stream_research(
+    state_dict: dict,
+    run_id: str,
+    graph: Any,
+    checkpointer: Any = None,
+    *,
+    resume: bool = False,
+) -> AsyncGenerator[str, None]:
+    """Async generator that yields SSE events as the graph executes.
+
+    ``state_dict`` is the initial state, or with ``resume`` the checkpointed
+    state the run continues from.
+    """
     # Emit initial status
-    yield _sse_event("status", _status_from_state("plan", state_dict))
+    yield _sse_event("status", _status_from_state("resume" if resume else "plan", state_dict))
 
     try:
-        async for chunk in graph.astream(state_dict, stream_mode="updates"):
-            # chunk is {node_name: update_dict}
+        async for mode, chunk in graph.astream(
+            None if resume else state_dict,
+            config=run_config(run_id),
+            stream_mode=["updates", "custom"],
+        ):
+            # Custom events are emitted by nodes, e.g. report tokens as they stream in
+            if mode == "custom":
+                if chunk.get("type") == "report_delta":
+                    yield _sse_event("report_delta", {"text": chunk["text"]})
+                continue
+
+            # Update chunks are {node_name: update_dict}
             for node_name, update in chunk.items():
-                # Merge update into running state
-                state_dict.update(update)
+                # Merge update into running state (list fields are deltas)
+                apply_update(state_dict, update)
 
                 # After plan node, emit the plan steps
                 if node_name == "plan" and "plan" in update:
@@ -148,11 +188,7 @@ async def _stream_research(initial_state: AgentState, run_id: str) -> AsyncGener
                 yield _sse_event("status", _status_from_state(node_name, state_dict))
 
         # Graph completed — render report, save, emit complete
-        final_state = AgentState.model_validate(state_dict)
-        final_state.report = render_report(final_state)
-
-        store = RunStore()
-        store.save(final_state)
+        final_state = await _finish_run(state_dict, checkpointer)
 
         yield _sse_event(
             "complete",
@@ -168,6 +204,44 @@ async def _stream_research(initial_state: AgentState, run_id: str) -> AsyncGener
     except Exception as exc:
         logger.exception("Streaming research failed for run %s", run_id)
         yield _sse_event("error", {"message": str(exc)})
+    finally:
+        # Also reached when the client disconnects and the stream is closed.
+        end_run(run_id)
+
+
+async def _invoke(graph: Any, state_dict: dict[str, Any] | None, run_id: str) -> dict[str, Any]:
+    """Run the graph to completion; ``None`` continues from the checkpoint."""
+    try:
+        result: dict[str, Any] = await graph.ainvoke(state_dict, config=run_config(run_id))
+        return result
+    finally:
+        end_run(run_id)
+
+
+def _wants_sse(request: Request) -> bool:
+    return "text/event-stream" in request.headers.get("accept", "")
+
+
+def _sse_response(events: AsyncGenerator[str, None]) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+def _research_response(final_state: AgentState) -> ResearchResponse:
+    return ResearchResponse(
+        run_id=final_state.run_id,
+        question=final_state.question,
+        report=final_state.report,
+        evidence_count=len(final_state.evidence),
+        iterations=final_state.iteration,
+        metrics=final_state.metrics.summary(),
+    )
 
 
 @router.post("/research")
@@ -194,37 +268,39 @@ async def run_research(
         pdf_file=pdf_file,
         run_logger=run_logger,
     )
+    graph = _graph(request)
+    checkpointer = _checkpointer(request)
 
     # SSE streaming path
-    accept = request.headers.get("accept", "")
-    if "text/event-stream" in accept:
-        return StreamingResponse(
-            _stream_research(initial_state, run_id),
-            media_type="text/event-stream",
-            headers={
-                "Cache-Control": "no-cache",
-                "X-Accel-Buffering": "no",
-            },
+    if _wants_sse(request):
+        return _sse_response(
+            _stream_research(initial_state.model_dump(), run_id, graph, checkpointer)
         )
 
     # Standard JSON path (backward compat for CLI/tests)
-    graph = build_graph()
-    final_state_dict = await graph.ainvoke(initial_state.model_dump())
-    final_state = AgentState.model_validate(final_state_dict)
-
-    final_state.report = render_report(final_state)
-
-    store = RunStore()
-    store.save(final_state)
-
-    return ResearchResponse(
-        run_id=run_id,
-        question=question,
-        report=final_state.report,
-        evidence_count=len(final_state.evidence),
-        iterations=final_state.iteration,
-        metrics=final_state.metrics.summary(),
-    )
+    final_state_dict = await _invoke(graph, initial_state.model_dump(), run_id)
+    return _research_response(await _finish_run(final_state_dict, checkpointer))
+
+
+@router.post("/runs/{run_id}/resume")
+async def resume_run(request: Request, run_id: str):
+    """Continue an interrupted run from its last completed node."""
+    checkpointer = _checkpointer(request)
+    if checkpointer is None:
+        raise HTTPException(status_code=409, detail="Checkpointing is disabled")
+    graph = _graph(request)
+    state_dict = await resumable_state(graph, run_id)
+    if state_dict is None:
+        if RunStore().get(run_id) is not None:
+            raise HTTPException(status_code=409, detail="Run already completed")
+        raise HTTPException(status_code=404, detail="No checkpoint for this run")
+
+    setup_logging(run_id).info("Resuming research run")
+    if _wants_sse(request):
+        return _sse_response(_stream_research(state_dict, run_id, graph, checkpointer, resume=True))
+
+    final_state_dict = await _invoke(graph, None, run_id)
+    return _research_response(await _finish_run(final_state_dict, checkpointer))
 
 
 @router.get("/runs")
@@ -0,0 +1,20 @@
+"""Operational statistics for the LLM backends."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter
+
+from research_agent.llm.adapter import get_llm
+from research_agent.tools import TOOL_FLIGHT
+
+router = APIRouter()
+
+
+@router.get("/stats")
+async def get_stats() -> dict:
+    llm = get_llm()
+    return {
+        "hosts": llm.client.host_stats(),
+        "scheduler": llm.scheduler.stats(),
+        "coalesced": {"llm": llm.flight.stats(), "tools": TOOL_FLIGHT.stats()},
+    }
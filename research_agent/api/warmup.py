@@ -0,0 +1,80 @@
+"""Start-up warm-up for the API process.
+
+Right after a deploy the first request used to pay for compiling the graph,
+initialising tool dependencies and — by far the largest cost — Ollama loading
+the model into memory.  :func:`warm_up` does all of that in the background as
+soon as the app starts, and ``/health`` reports the process as ready only once
+it has finished.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastapi import FastAPI
+
+from research_agent.graph.builder import build_graph
+from research_agent.llm.adapter import LLMAdapter
+from research_agent.tools import TOOL_REGISTRY
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WarmupState:
+    """Progress and timings of the start-up warm-up."""
+
+    ready: bool = False
+    started_at: float = field(default_factory=time.time)
+    duration_ms: float = 0.0
+    graph_compile_ms: float = 0.0
+    tool_warmup_ms: dict[str, float] = field(default_factory=dict)
+    model_load_ms: dict[str, float | None] = field(default_factory=dict)  # per model@host
+    errors: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "duration_ms": round(self.duration_ms, 1),
+            "graph_compile_ms": round(self.graph_compile_ms, 1),
+            "tool_warmup_ms": {k: round(v, 1) for k, v in self.tool_warmup_ms.items()},
+            "model_load_ms": {
+                k: None if v is None else round(v, 1) for k, v in self.model_load_ms.items()
+            },
+            "errors": self.errors,
+        }
+
+
+async def warm_up(app: FastAPI, llm: LLMAdapter, state: WarmupState) -> None:
+    """Compile the graph, warm the tools and preload every configured model."""
+    start = time.perf_counter()
+    try:
+        t0 = time.perf_counter()
+        app.state.graph = build_graph(getattr(app.state, "checkpointer", None))
+        state.graph_compile_ms = (time.perf_counter() - t0) * 1000
+
+        for name, tool_cls in TOOL_REGISTRY.items():
+            t0 = time.perf_counter()
+            try:
+                await tool_cls().warm_up()
+            except Exception as exc:
+                logger.warning("Warm-up of tool %s failed: %s", name, exc)
+                state.errors.append(f"tool {name}: {exc}")
+            state.tool_warmup_ms[name] = (time.perf_counter() - t0) * 1000
+
+        state.model_load_ms = await llm.preload_models()
+        state.errors.extend(
+            f"model {target}: not loaded"
+            for target, ms in state.model_load_ms.items()
+            if ms is None
+        )
+    except Exception as exc:
+        logger.exception("Warm-up failed")
+        state.errors.append(str(exc))
+    finally:
+        state.duration_ms = (time.perf_counter() - start) * 1000
+        state.ready = True
+        logger.info("Warm-up finished in %.0f ms (%d errors)", state.duration_ms, len(state.errors))
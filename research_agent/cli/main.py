@@ -37,9 +37,10 @@ async def _run(
     raw: bool,
 ) -> None:
     from research_agent.graph.builder import build_graph
+    from research_agent.graph.nodes import end_run
     from research_agent.graph.state import AgentState
-    from research_agent.memory.store import RunStore
-    from research_agent.report.renderer import render_report
+    from research_agent.llm.adapter import get_llm
+    from research_agent.memory.checkpoint import discard_checkpoints, open_checkpointer, run_config
     from research_agent.util.logging import setup_logging
 
     run_id = uuid.uuid4().hex[:12]
@@ -55,13 +56,38 @@ async def _run(
         desired_depth=depth,
         max_iters=max_iters,
         timebox_minutes=timebox,
+        max_parallel_steps=settings.max_parallel_steps,
         run_id=run_id,
     )
 
-    graph = build_graph()
-
-    with console.status("[bold green]Researching..."):
-        final_state_dict = await graph.ainvoke(initial_state.model_dump())
+    llm = get_llm()
+
+    try:
+        await llm.open()
+        async with open_checkpointer() as checkpointer:
+            graph = build_graph(checkpointer)
+            try:
+                with console.status("[bold green]Researching..."):
+                    final_state_dict = await graph.ainvoke(
+                        initial_state.model_dump(), config=run_config(run_id)
+                    )
+            except Exception:
+                if checkpointer is not None:
+                    console.print(f"[red]Run interrupted.[/red] Resume it with: resume {run_id}")
+                raise
+            finally:
+                end_run(run_id)
+            _finish(final_state_dict, raw)
+            await discard_checkpoints(checkpointer, run_id)
+    finally:
+        await llm.aclose()
+
+
+def _finish(final_state_dict: dict, raw: bool) -> None:
+    """Render, store and print the report of a finished run."""
+    from research_agent.graph.state import AgentState
+    from research_agent.memory.store import RunStore
+    from research_agent.report.renderer import render_report
 
     final_state = AgentState.model_validate(final_state_dict)
     final_state.report = render_report(final_state)
@@ -81,6 +107,55 @@ async def _run(
     )
 
 
+@app.command()
+def resume(
+    run_id: str = typer.Argument(..., help="Id of the interrupted run."),
+    raw: bool = typer.Option(False, "--raw", help="Print raw markdown instead of rendered."),
+) -> None:
+    """Resume an interrupted run from its last completed node."""
+    asyncio.run(_resume(run_id, raw))
+
+
+async def _resume(run_id: str, raw: bool) -> None:
+    from research_agent.graph.builder import build_graph
+    from research_agent.graph.nodes import end_run
+    from research_agent.llm.adapter import get_llm
+    from research_agent.memory.checkpoint import (
+        discard_checkpoints,
+        open_checkpointer,
+        resumable_state,
+        run_config,
+    )
+    from research_agent.util.logging import setup_logging
+
+    if not settings.checkpoint_enabled:
+        console.print("[red]Checkpointing is disabled (CHECKPOINT_ENABLED=false).[/red]")
+        raise typer.Exit(1)
+
+    logger = setup_logging(run_id)
+    llm = get_llm()
+    try:
+        await llm.open()
+        async with open_checkpointer() as checkpointer:
+            graph = build_graph(checkpointer)
+            state = await resumable_state(graph, run_id)
+            if state is None:
+                console.print(f"[red]No interrupted run {run_id} to resume.[/red]")
+                raise typer.Exit(1)
+            logger.info("CLI resume of run %s", run_id)
+            console.print(f"\n[bold]Research Agent[/bold]  resuming run_id={run_id}")
+            console.print(f"Question: {state.get('question', '')}\n")
+            try:
+                with console.status("[bold green]Researching..."):
+                    final_state_dict = await graph.ainvoke(None, config=run_config(run_id))
+            finally:
+                end_run(run_id)
+            _finish(final_state_dict, raw)
+            await discard_checkpoints(checkpointer, run_id)
+    finally:
+        await llm.aclose()
+
+
 @app.command()
 def runs(limit: int = typer.Option(20, help="Number of runs to list.")) -> None:
     """List previous research runs."""
@@ -91,5 +166,37 @@ def runs(limit: int = typer.Option(20, help="Number of runs to list.")) -> None:
         console.print(f"  {run['run_id']}  {run['created_at']}  {run['question'][:60]}")
 
 
+@app.command("stub-ollama")
+def stub_ollama(
+    mode: str = typer.Option("replay", help="record (proxy to --upstream) or replay."),
+    recordings: str = typer.Option(
+        "ollama_recordings.jsonl", help="JSONL file recorded to / replayed from."
+    ),
+    upstream: str = typer.Option(settings.ollama_host, help="Real Ollama used in record mode."),
+    host: str = typer.Option("127.0.0.1", help="Interface to listen on."),
+    port: int = typer.Option(11435, help="Port to listen on."),
+    latency_ms: float = typer.Option(50.0, help="Replay: time to first token."),
+    tokens_per_second: float = typer.Option(50.0, help="Replay: generation speed (0 = instant)."),
+    synthetic_tokens: int = typer.Option(48, help="Replay: length of unrecorded replies."),
+) -> None:
+    """Serve a local Ollama stand-in for benchmarking without a GPU."""
+    import uvicorn
+
+    from research_agent.llm.stub import StubConfig, create_stub_app
+
+    if mode not in ("record", "replay"):
+        raise typer.BadParameter("mode must be 'record' or 'replay'", param_hint="--mode")
+    config = StubConfig(
+        mode=mode,  # type: ignore[arg-type]
+        recordings_path=recordings,
+        upstream=upstream.rstrip("/"),
+        latency_ms=latency_ms,
+        tokens_per_second=tokens_per_second,
+        synthetic_tokens=synthetic_tokens,
+    )
+    console.print(f"Ollama stub ({mode}) on http://{host}:{port}  recordings={recordings}")
+    uvicorn.run(create_stub_app(config), host=host, port=port)
+
+
 if __name__ == "__main__":
     app()
@@ -2,19 +2,102 @@
 
 from __future__ import annotations
 
+from typing import Literal
+
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     ollama_host: str = "http://ollama:11434"
+    # Optional list of hosts (JSON array in the env); overrides ollama_host when set
+    ollama_hosts: list[str] = Field(default_factory=list)
+    ollama_health_interval_seconds: float = 15.0
+    # How many more in-flight requests a run's sticky host may have than the least busy one
+    ollama_affinity_slack: int = 2
     ollama_model: str = "gemma3:12b"
+    # Per-node model overrides (JSON object in the env), e.g. {"act": "gemma3:4b"}
+    ollama_node_models: dict[str, str] = Field(default_factory=dict)
     ollama_timeout_seconds: int = 300
+    # How long Ollama keeps a model loaded after a request ("" = server default, "-1" = forever)
+    ollama_keep_alive: str = "30m"
+    # Preload models, compile the graph and warm tools when the API starts
+    warmup_on_startup: bool = True
+
+    # Shared HTTP connection pool for Ollama
+    ollama_max_connections: int = 32
+    ollama_max_keepalive_connections: int = 16
+    ollama_keepalive_expiry_seconds: float = 60.0
     log_level: str = "INFO"
 
+    # Retries with exponential backoff + jitter on connection errors, connect timeouts and 5xx
+    llm_retry_max_attempts: int = 3
+    llm_retry_base_delay_seconds: float = 0.5
+    llm_retry_max_delay_seconds: float = 8.0
+    # With several hosts, send a duplicate request to another host once a call is
+    # slower than this latency percentile (0 disables hedging)
+    llm_hedge_percentile: float = 95.0
+    llm_hedge_min_delay_ms: float = 1_000.0
+    llm_hedge_min_samples: int = 20
+
+    # Prompt token budgets per node (JSON object in the env); context is packed to fit
+    llm_context_budgets: dict[str, int] = Field(
+        default_factory=lambda: {
+            "plan": 3_000,
+            "observe": 1_500,
+            "reflect": 2_000,
+            "compact": 2_000,
+            "write_report": 12_000,
+        }
+    )
+
+    # Per-node max output tokens (JSON object in the env), overriding the built-in profiles
+    llm_node_max_tokens: dict[str, int] = Field(default_factory=dict)
+
+    # Constrain act/reflect output with Ollama's JSON-schema ``format``
+    llm_structured_output: bool = True
+    # Dispatch well-formed "N. [tool] query" plan lines without an act LLM call
+    act_fast_path: bool = True
+    # Tool results summarised per observe call; 1 observes after every tool call
+    observe_batch_size: int = 4
+    # Drop evidence whose text is a near-duplicate (MinHash) of an earlier bibliography entry
+    evidence_near_duplicates: bool = True
+    # Evidence items offered to the report prompt, ranked by BM25 against the question,
+    # plan and notes and then packed into the write_report budget (0 offers all of them)
+    report_evidence_top_k: int = 20
+    # "sections" drafts the report sections in parallel and stitches them with a short call
+    report_mode: Literal["single", "sections"] = "single"
+    # Merge older notes into a running digest once the uncompacted notes exceed this many
+    # tokens; the merge runs in the background of act (0 disables compaction)
+    notes_compaction_tokens: int = 1_000
+    # Stop without a reflect LLM call when the evidence gathered since the last reflection
+    # is less novel than this (0.0 disables the gate)
+    reflect_novelty_threshold: float = 0.2
+
+    # Admission scheduler in front of the LLM backends
+    llm_max_concurrency_per_host: int = 4
+    llm_scheduler_aging_seconds: float = 30.0  # waiting this long raises priority by one class
+
+    # LLM response cache (opt-in per node)
+    llm_cache_enabled: bool = False
+    llm_cache_path: str = ""  # defaults to llm_cache.db next to db_path
+    llm_cache_ttl_seconds: int = 7 * 24 * 3600
+    llm_cache_max_memory_entries: int = 256
+    llm_cache_max_disk_entries: int = 10_000
+
+    # Chat-session mode: reuse Ollama's KV cache across act/observe/reflect calls
+    llm_session_mode: bool = False
+    llm_session_max_messages: int = 41
+    llm_session_max_tokens: int = 6_000
+    llm_session_max_runs: int = 64
+
     # Agent defaults
     max_iters: int = 6
     timebox_minutes: int = 5
+    # Share of the timebox held back for write_report; research stops at the rest
+    report_reserve_fraction: float = 0.25
     tool_call_limit: int = 30
+    max_parallel_steps: int = 4  # independent plan steps run concurrently per run
 
     # PDF upload limits
     pdf_max_size_mb: int = 20
@@ -22,6 +105,8 @@ class Settings(BaseSettings):
 
     # Persistence
     db_path: str = "runs/research_agent.db"
+    # Checkpoint graph state after every node (same database) so interrupted runs can resume
+    checkpoint_enabled: bool = True
 
     model_config = {"env_file": ".env", "extra": "ignore"}
 
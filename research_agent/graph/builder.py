@@ -2,16 +2,20 @@
 
 from __future__ import annotations
 
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, StateGraph
 
+from research_agent.config import settings
 from research_agent.graph.nodes import (
     act_node,
     observe_node,
     plan_node,
     reflect_node,
+    research_deadline,
     write_report_node,
 )
 from research_agent.graph.state import AgentState
+from research_agent.graph.steps import step_dependencies
 
 
 def _route_after_reflect(state: AgentState) -> str:
@@ -20,14 +24,42 @@ def _route_after_reflect(state: AgentState) -> str:
     return "act"
 
 
+def _waits_on_pending(state: AgentState) -> bool:
+    """Whether the next plan step needs a result that observe hasn't summarised yet."""
+    pending = {p.number for p in state.pending_results}
+    return bool(step_dependencies(state.plan[state.current_step_index]) & pending)
+
+
+def _defer_observe(state: AgentState) -> bool:
+    """Run the next plan step before observing, so observe can batch the results.
+
+    Only while the batch has room, the next step doesn't depend on a pending
+    result (its tool call is worked out from the notes) and the run is within
+    its tool and time limits (reflect, which enforces them, runs after observe).
+    """
+    return (
+        len(state.pending_results) < settings.observe_batch_size
+        and state.current_step_index < len(state.plan)
+        and not _waits_on_pending(state)
+        and state.tool_calls_made < state.tool_call_limit
+        and not research_deadline(state).expired
+    )
+
+
 def _route_after_act(state: AgentState) -> str:
     if state.status == "reflecting":
         return "reflect"
+    if _defer_observe(state):
+        return "act"
     return "observe"
 
 
-def build_graph() -> StateGraph:
-    """Construct and compile the Plan → Act → Observe → Reflect loop."""
+def build_graph(checkpointer: BaseCheckpointSaver | None = None) -> StateGraph:
+    """Construct and compile the Plan → Act → Observe → Reflect loop.
+
+    With a ``checkpointer`` the state is persisted after every node, keyed by
+    the ``thread_id`` in the run config (see :mod:`research_agent.memory.checkpoint`).
+    """
     graph = StateGraph(AgentState)
 
     graph.add_node("plan", plan_node)
@@ -39,11 +71,13 @@ def build_graph() -> StateGraph:
     graph.set_entry_point("plan")
 
     graph.add_edge("plan", "act")
-    graph.add_conditional_edges("act", _route_after_act, {"observe": "observe", "reflect": "reflect"})
+    graph.add_conditional_edges(
+        "act", _route_after_act, {"act": "act", "observe": "observe", "reflect": "reflect"}
+    )
     graph.add_edge("observe", "reflect")
     graph.add_conditional_edges(
         "reflect", _route_after_reflect, {"act": "act", "write_report": "write_report"}
     )
     graph.add_edge("write_report", END)
 
-    return graph.compile()
+    return graph.compile(checkpointer=checkpointer)
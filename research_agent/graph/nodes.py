@@ -2,72 +2,260 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
+from dataclasses import dataclass
 
+from langgraph.config import get_stream_writer
+from langgraph.types import StreamWriter
+
+from research_agent.config import settings
 from research_agent.graph.prompts import (
     ACT_SYSTEM,
     ACT_USER,
+    COMPACT_SYSTEM,
+    COMPACT_USER,
+    OBSERVE_BATCH_RESULT,
+    OBSERVE_BATCH_SYSTEM,
+    OBSERVE_BATCH_USER,
     OBSERVE_SYSTEM,
     OBSERVE_USER,
     PLAN_SYSTEM,
     PLAN_USER,
     REFLECT_SYSTEM,
     REFLECT_USER,
+    REPORT_SECTION_SYSTEM,
+    REPORT_SECTION_USER,
+    REPORT_SECTIONS,
+    REPORT_STITCH_SYSTEM,
+    REPORT_STITCH_USER,
     WRITE_REPORT_SYSTEM,
     WRITE_REPORT_USER,
 )
+from research_agent.graph.schemas import ActDecision, ObserveBatch, ReflectDecision
 from research_agent.graph.state import (
     AgentState,
     LLMCallMetric,
     NodeTimingMetric,
+    PendingResult,
+    ReflectionMetric,
     RunMetrics,
     ToolCallMetric,
 )
-from research_agent.llm.adapter import get_llm
+from research_agent.graph.steps import (
+    next_wave,
+    parse_tool_call,
+    step_number,
+    strip_dependencies,
+)
+from research_agent.llm.adapter import get_llm, json_object_complete
 from research_agent.llm.client import LLMResponse
-from research_agent.tools import TOOL_REGISTRY
+from research_agent.llm.profiles import REPORT_SECTION_MAX_TOKENS, profile_for
+from research_agent.tools import TOOL_FLIGHT, TOOL_REGISTRY
+from research_agent.tools.base import EvidenceItem, ToolResult
+from research_agent.util.bm25 import BM25
+from research_agent.util.context import PackedContext, Section, pack_context
+from research_agent.util.deadline import Deadline, DeadlineExceededError
+from research_agent.util.dedup import FingerprintIndex, canonical_url, evidence_key, fingerprint
+from research_agent.util.novelty import marginal_novelty
+from research_agent.util.pdf import split_pages
+from research_agent.util.tokens import estimate_tokens, truncate_to_tokens
 
 logger = logging.getLogger(__name__)
 
 
-def _llm_metric(node: str, response: LLMResponse) -> LLMCallMetric:
+# Prompt budget for nodes missing from settings.llm_context_budgets.
+DEFAULT_CONTEXT_BUDGET = 4_000
+
+# Newest notes never merged into the digest, so prompts keep their full text.
+NOTES_KEEP_RECENT = 4
+
+TRUNCATED_REPORT_MARKER = "\n\n_Report truncated: the run's time budget ran out._\n"
+
+_Compaction = tuple[str, int, LLMCallMetric]  # digest, notes merged, llm call
+
+# Note compactions in flight, by run id.  They outlive the act node that
+# started them; a later act of the run collects the result once it is done.
+_compactions: dict[str, asyncio.Task[_Compaction | None]] = {}
+
+
+def _llm_metric(
+    node: str,
+    response: LLMResponse,
+    *,
+    parse_fallback: bool = False,
+    packed: PackedContext | None = None,
+    batch_size: int = 1,
+) -> LLMCallMetric:
     """Build an LLMCallMetric from an LLMResponse."""
     return LLMCallMetric(
         node=node,
+        model=response.model,
         prompt_tokens=response.prompt_eval_count,
         completion_tokens=response.eval_count,
         duration_ms=response.total_duration_ns / 1_000_000,
+        ttft_ms=response.ttft_ms,
+        cache_status=response.cache_status,
+        cached_prompt_tokens=response.cached_prompt_tokens,
+        prompt_eval_saved_ms=response.prompt_eval_saved_ms,
+        host=response.host,
+        queue_wait_ms=response.queue_wait_ms,
+        parse_fallback=parse_fallback,
+        coalesced=response.coalesced,
+        retries=response.retries,
+        hedged=response.hedged,
+        output_tokens_saved=response.output_tokens_saved,
+        load_ms=response.load_duration_ns / 1_000_000,
+        batch_size=batch_size,
+        context_dropped_tokens=dict(packed.dropped_tokens) if packed else {},
+    )
+
+
+def _pack(node: str, sections: list[Section], *fixed: str) -> PackedContext:
+    """Pack ``sections`` into the node's prompt budget minus the ``fixed`` text."""
+    budget = settings.llm_context_budgets.get(node, DEFAULT_CONTEXT_BUDGET)
+    overhead = sum(estimate_tokens(text) for text in fixed)
+    packed = pack_context(sections, budget - overhead)
+    if packed.total_dropped_tokens:
+        logger.info(
+            "[%s_node] Context over budget, dropped tokens: %s", node, packed.dropped_tokens
+        )
+    return packed
+
+
+def research_deadline(state: AgentState, now: float | None = None) -> Deadline:
+    """When planning and research must end: the timebox minus the report's reserved share."""
+    start = state.start_time or now or time.time()
+    timebox = state.timebox_minutes * 60
+    return Deadline(start + timebox * (1 - settings.report_reserve_fraction))
+
+
+def report_deadline(state: AgentState) -> Deadline:
+    """When the report must be done: the end of the timebox, or its reserved share from now."""
+    now = time.time()
+    timebox = state.timebox_minutes * 60
+    start = state.start_time or now
+    return Deadline(max(start + timebox, now + timebox * settings.report_reserve_fraction))
+
+
+def _timing(
+    node: str, node_start: float, deadline: Deadline, *, exceeded: bool = False
+) -> NodeTimingMetric:
+    """Timing of a node, with the budget it had left when it started."""
+    return NodeTimingMetric(
+        node=node,
+        duration_ms=(time.time() - node_start) * 1000,
+        budget_ms=max(0.0, deadline.at - node_start) * 1000,
+        deadline_exceeded=exceeded,
     )
 
 
-def _copy_metrics(state: AgentState) -> RunMetrics:
-    """Return a mutable copy of the current run metrics."""
-    return RunMetrics(
-        llm_calls=list(state.metrics.llm_calls),
-        tool_calls=list(state.metrics.tool_calls),
-        node_timings=list(state.metrics.node_timings),
+def _act_reply_complete(text: str) -> bool:
+    """True once the act reply has a whole JSON object or both TOOL/QUERY lines."""
+    if json_object_complete(text):
+        return True
+    finished = {
+        line.split(":", 1)[0].strip().upper()
+        for line in text.splitlines(keepends=True)
+        if line.endswith("\n") and ":" in line
+    }
+    return {"TOOL", "QUERY"} <= finished
+
+
+def _parse_act_text(raw: str, default_query: str) -> ActDecision:
+    """Parse the legacy ``TOOL:``/``QUERY:`` line format.
+
+    Built with ``model_construct`` so an unknown tool name survives to the
+    registry lookup, which logs it and falls back to ``web_search``.
+    """
+    tool_name = "web_search"
+    query = default_query
+    for line in raw.strip().splitlines():
+        if line.upper().startswith("TOOL:"):
+            tool_name = line.split(":", 1)[1].strip().lower()
+        elif line.upper().startswith("QUERY:"):
+            query = line.split(":", 1)[1].strip()
+    return ActDecision.model_construct(tool=tool_name, query=query)
+
+
+def _parse_reflect_text(raw: str) -> ReflectDecision:
+    """Parse the legacy ``DECISION:``/``CONFIDENCE:``/``NEW_STEPS:`` line format."""
+    if "DECISION: STOP" in raw.upper():
+        confidence = 0.7
+        for line in raw.splitlines():
+            if line.upper().startswith("CONFIDENCE:"):
+                try:
+                    confidence = float(line.split(":", 1)[1].strip())
+                except ValueError:
+                    pass
+        return ReflectDecision.model_construct(
+            decision="STOP", confidence=confidence, reason="", new_steps=[]
+        )
+
+    new_steps: list[str] = []
+    in_new = False
+    for line in raw.splitlines():
+        if line.upper().startswith("NEW_STEPS:"):
+            rest = line.split(":", 1)[1].strip()
+            if rest:
+                new_steps.append(rest)
+            in_new = True
+        elif in_new and line.strip() and line.strip()[0].isdigit():
+            new_steps.append(line.strip())
+    return ReflectDecision.model_construct(
+        decision="CONTINUE", confidence=0.0, reason="", new_steps=new_steps
     )
 
 
+def _stream_writer() -> StreamWriter:
+    """Return the LangGraph custom stream writer, or a no-op outside a graph run."""
+    try:
+        return get_stream_writer()
+    except RuntimeError:
+        return lambda _chunk: None
+
+
 async def plan_node(state: AgentState) -> dict:
     """Generate an initial research plan."""
     node_start = time.time()
+    deadline = research_deadline(state, node_start)
     logger.info("[plan_node] Generating plan for: %s", state.question)
     llm = get_llm()
 
+    packed = _pack(
+        "plan",
+        [
+            Section("question", [state.question]),
+            Section("pdf", split_pages(state.pdf_context), query=state.question, keep_order=True),
+        ],
+        PLAN_SYSTEM,
+        PLAN_USER,
+    )
     pdf_section = ""
-    if state.pdf_context:
-        pdf_section = f"\nReference document ({state.pdf_filename}):\n{state.pdf_context[:8000]}\n"
+    if packed.items["pdf"]:
+        pdf_text = packed.text("pdf", "\n\n")
+        pdf_section = f"\nReference document ({state.pdf_filename}):\n{pdf_text}\n"
 
     prompt = PLAN_USER.format(
-        question=state.question,
+        question=packed.text("question"),
         audience=state.audience,
         desired_depth=state.desired_depth,
         pdf_section=pdf_section,
     )
-    response = await llm.query(prompt, system=PLAN_SYSTEM)
-    raw = response.text
+    response: LLMResponse | None = None
+    try:
+        response = await llm.query(
+            prompt,
+            system=PLAN_SYSTEM,
+            cache=True,
+            node="plan",
+            run_id=state.run_id,
+            deadline=deadline,
+        )
+    except DeadlineExceededError:
+        logger.warning("[plan_node] Deadline reached, falling back to a one-step plan")
+    raw = response.text if response else ""
 
     steps: list[str] = []
     for line in raw.strip().splitlines():
@@ -78,11 +266,10 @@ async def plan_node(state: AgentState) -> dict:
     if not steps:
         steps = [f"1. [web_search] {state.question}"]
 
-    metrics = _copy_metrics(state)
-    metrics.llm_calls.append(_llm_metric("plan", response))
-    metrics.node_timings.append(
-        NodeTimingMetric(node="plan", duration_ms=(time.time() - node_start) * 1000)
-    )
+    metrics = RunMetrics()
+    if response is not None:
+        metrics.llm_calls.append(_llm_metric("plan", response, packed=packed))
+    metrics.node_timings.append(_timing("plan", node_start, deadline, exceeded=response is None))
 
     logger.info("[plan_node] Plan has %d steps", len(steps))
     return {
@@ -94,19 +281,32 @@ async def plan_node(state: AgentState) -> dict:
     }
 
 
-async def act_node(state: AgentState) -> dict:
-    """Select and invoke the tool for the current plan step."""
-    node_start = time.time()
-    logger.info("[act_node] Step %d/%d", state.current_step_index + 1, len(state.plan))
+@dataclass
+class _StepOutcome:
+    """What running one plan step in ``act_node`` produced."""
+
+    step: str
+    tool_name: str
+    query: str
+    result: ToolResult
+    llm_call: LLMCallMetric | None  # None when the plan line named the call directly
+    tool_call: ToolCallMetric
+
+
+def _direct_tool_call(step: str) -> tuple[str, str] | None:
+    """Tool and query of a well-formed plan line naming a registered tool."""
+    if not settings.act_fast_path:
+        return None
+    call = parse_tool_call(step)
+    if call is None or call[0] not in TOOL_REGISTRY:
+        return None
+    return call
 
-    if state.current_step_index >= len(state.plan):
-        metrics = _copy_metrics(state)
-        metrics.node_timings.append(
-            NodeTimingMetric(node="act", duration_ms=(time.time() - node_start) * 1000)
-        )
-        return {"status": "reflecting", "last_tool_result": "", "metrics": metrics}
 
-    step = state.plan[state.current_step_index]
+async def _choose_tool(
+    state: AgentState, step: str, deadline: Deadline
+) -> tuple[ActDecision, LLMCallMetric]:
+    """Ask the LLM for the tool and query of ``step``."""
     llm = get_llm()
 
     notes_summary = "; ".join(state.notes[-5:]) if state.notes else "(none)"
@@ -115,88 +315,481 @@ async def act_node(state: AgentState) -> dict:
         evidence_count=len(state.evidence),
         notes_summary=notes_summary,
     )
-    response = await llm.query(prompt, system=ACT_SYSTEM)
-    raw = response.text
+    decision, response = await llm.query_structured(
+        prompt,
+        ActDecision,
+        system=ACT_SYSTEM,
+        until=_act_reply_complete,
+        cache=True,
+        node="act",
+        run_id=state.run_id,
+        session=True,
+        deadline=deadline,
+    )
+    parse_fallback = decision is None
+    if decision is None:
+        logger.warning("[act_node] Unstructured reply, falling back to line parsing")
+        decision = _parse_act_text(response.text, state.question)
+    return decision, _llm_metric("act", response, parse_fallback=parse_fallback)
 
-    tool_name = "web_search"
-    query = state.question
-    for line in raw.strip().splitlines():
-        if line.upper().startswith("TOOL:"):
-            tool_name = line.split(":", 1)[1].strip().lower()
-        elif line.upper().startswith("QUERY:"):
-            query = line.split(":", 1)[1].strip()
+
+def _fetched_urls(state: AgentState) -> set[str]:
+    """Canonical URLs that ``fetch_url`` already retrieved in this run."""
+    return {
+        canonical_url(c.query)
+        for c in state.metrics.tool_calls
+        if c.tool_name == "fetch_url" and c.success and not c.skipped_duplicate
+    }
+
+
+async def _run_step(state: AgentState, plan_step: str, deadline: Deadline) -> _StepOutcome:
+    """Work out the tool call for ``plan_step`` and run it.
+
+    Well-formed, independent plan lines are dispatched as written; the LLM
+    is only asked when the line is ambiguous or names an unknown tool.  A
+    ``fetch_url`` of a page this run already fetched is not executed.
+    Raises :class:`DeadlineExceededError` when ``deadline`` cuts either call off.
+    """
+    step = strip_dependencies(plan_step)
+    llm_call: LLMCallMetric | None = None
+    direct = _direct_tool_call(plan_step)
+    if direct is not None:
+        tool_name, query = direct
+    else:
+        decision, llm_call = await _choose_tool(state, step, deadline)
+        tool_name, query = decision.tool, decision.query
 
     tool_cls = TOOL_REGISTRY.get(tool_name)
     if tool_cls is None:
         logger.warning("[act_node] Unknown tool '%s', falling back to web_search", tool_name)
         tool_cls = TOOL_REGISTRY["web_search"]
 
+    flight_key = query
+    if tool_name == "fetch_url":
+        flight_key = canonical_url(query)
+        if flight_key in _fetched_urls(state):
+            logger.info("[act_node] Skipping fetch of %s, already fetched in this run", query)
+            return _StepOutcome(
+                step=step,
+                tool_name=tool_name,
+                query=query,
+                result=ToolResult(
+                    tool=tool_name,
+                    success=True,
+                    data=f"Already fetched earlier in this run: {query} (see earlier notes).",
+                ),
+                llm_call=llm_call,
+                tool_call=ToolCallMetric(
+                    tool_name=tool_name,
+                    query=query,
+                    skipped_duplicate=True,
+                    resolved_by="llm" if llm_call else "plan",
+                ),
+            )
+
     tool = tool_cls()
     tool_start = time.time()
-    result = await tool.run(query=query)
-    tool_duration_ms = (time.time() - tool_start) * 1000
-
-    new_evidence = list(state.evidence) + result.evidence
-    # Deduplicate bibliography by URL
-    bib = dict(state.bibliography)
-    for ev in result.evidence:
-        key = ev.url or ev.title
-        if key not in bib:
-            bib[key] = ev
+    # Concurrent runs issuing the same tool call share one execution; it is
+    # cancelled at the deadline unless another run is still waiting for it.
+    result, coalesced = await deadline.run(
+        TOOL_FLIGHT.do((tool_cls, flight_key), lambda: tool.run(query=query))
+    )
 
-    metrics = _copy_metrics(state)
-    metrics.llm_calls.append(_llm_metric("act", response))
-    metrics.tool_calls.append(
-        ToolCallMetric(
+    return _StepOutcome(
+        step=step,
+        tool_name=tool_name,
+        query=query,
+        result=result,
+        llm_call=llm_call,
+        tool_call=ToolCallMetric(
             tool_name=tool_name,
             query=query,
-            duration_ms=tool_duration_ms,
+            duration_ms=(time.time() - tool_start) * 1000,
             success=result.success,
-        )
+            coalesced=coalesced,
+            resolved_by="llm" if llm_call else "plan",
+        ),
+    )
+
+
+async def _run_wave(
+    state: AgentState, steps: list[str], deadline: Deadline
+) -> list[_StepOutcome | None]:
+    """Run plan ``steps`` concurrently; steps cut off by the deadline come back as None."""
+    results = await asyncio.gather(
+        *(_run_step(state, step, deadline) for step in steps), return_exceptions=True
+    )
+    outcomes: list[_StepOutcome | None] = []
+    for step, result in zip(steps, results):
+        if isinstance(result, DeadlineExceededError):
+            logger.warning("[act_node] Deadline reached, cancelled step: %s", step)
+            outcomes.append(None)
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            outcomes.append(result)
+    return outcomes
+
+
+def _note_items(state: AgentState) -> list[str]:
+    """Prompt lines for the notes: the digest of compacted notes, then the rest."""
+    items = [f"- Earlier notes (digest):\n{state.notes_digest}"] if state.notes_digest else []
+    return items + [f"- {n}" for n in state.notes[state.notes_compacted :]]
+
+
+def _notes_to_compact(state: AgentState) -> list[str]:
+    """Oldest uncompacted notes to merge into the digest, or [] when not due.
+
+    Compaction is due once the uncompacted notes exceed
+    ``settings.notes_compaction_tokens``.  The newest notes are left alone and
+    the batch is cut to what fits the ``compact`` prompt budget; anything left
+    over goes into a later merge.
+    """
+    live = state.notes[state.notes_compacted :]
+    threshold = settings.notes_compaction_tokens
+    if threshold <= 0 or sum(estimate_tokens(n) for n in live) <= threshold:
+        return []
+    room = settings.llm_context_budgets.get("compact", DEFAULT_CONTEXT_BUDGET) - estimate_tokens(
+        COMPACT_SYSTEM + COMPACT_USER + state.question + state.notes_digest
     )
+    batch: list[str] = []
+    for note in live[:-NOTES_KEEP_RECENT]:
+        room -= estimate_tokens(note) + 1
+        if batch and room < 0:
+            break
+        batch.append(note)
+    return batch
+
+
+async def _compact_notes(state: AgentState, deadline: Deadline) -> _Compaction | None:
+    """Merge older notes into the digest: ``(digest, notes merged, llm call)`` or None.
+
+    Runs in the background of ``act_node`` (see :func:`_start_compaction`).
+    A failed merge only logs: the notes stay uncompacted and are retried later.
+    """
+    batch = _notes_to_compact(state)
+    if not batch:
+        return None
+    prompt = COMPACT_USER.format(
+        question=state.question,
+        digest=state.notes_digest or "(empty)",
+        notes="\n".join(f"- {n}" for n in batch),
+    )
+    try:
+        response = await get_llm().query(
+            prompt,
+            system=COMPACT_SYSTEM,
+            node="compact",
+            run_id=state.run_id,
+            deadline=deadline,
+        )
+    except Exception as exc:
+        logger.warning("[act_node] Note compaction failed: %s", exc)
+        return None
+    digest = truncate_to_tokens(response.text.strip(), profile_for("compact").max_tokens)
+    if not digest:
+        return None
+    logger.info("[act_node] Compacted %d notes into the digest", len(batch))
+    return digest, len(batch), _llm_metric("compact", response)
+
+
+def _start_compaction(state: AgentState, deadline: Deadline) -> None:
+    """Start merging older notes into the digest, unless one is running or none is due.
+
+    Only one compaction per run is in flight, so the ``notes_compacted`` it
+    was started from is still current when its result is collected.
+    """
+    task = _compactions.get(state.run_id)
+    if task is not None and task.get_loop() is asyncio.get_running_loop():
+        return
+    if _notes_to_compact(state):
+        _compactions[state.run_id] = asyncio.ensure_future(_compact_notes(state, deadline))
+
+
+def _collect_compaction(run_id: str) -> _Compaction | None:
+    """Result of the run's compaction if it has finished; a running one is left alone."""
+    task = _compactions.get(run_id)
+    if task is None or not task.done():
+        return None
+    del _compactions[run_id]
+    return None if task.cancelled() else task.result()
+
+
+def _drop_compaction(run_id: str) -> None:
+    """Cancel the run's compaction, if any."""
+    task = _compactions.pop(run_id, None)
+    if task is not None:
+        task.cancel()
+
+
+def end_run(run_id: str) -> None:
+    """Release what the nodes keep for a run between steps.
+
+    Callers invoke it once the graph stops for ``run_id``, whether it finished,
+    failed or was cancelled; a resumed run simply starts over without it.
+    """
+    _drop_compaction(run_id)
+
+
+def _evidence_text(ev: EvidenceItem, result: ToolResult) -> str:
+    """Text fingerprinted for ``ev``: the fetched page when it is the result's only item."""
+    if len(result.evidence) == 1 and result.data:
+        return result.data
+    return ev.snippet
+
+
+def _fingerprint_index(state: AgentState) -> FingerprintIndex | None:
+    """Near-duplicate index over the run's bibliography, or None when disabled."""
+    if not settings.evidence_near_duplicates:
+        return None
+    index = FingerprintIndex()
+    for key, bands in state.fingerprints.items():
+        index.add(key, bands)
+    return index
+
+
+async def act_node(state: AgentState) -> dict:
+    """Select and invoke the tools for the next plan steps.
+
+    Consecutive steps that don't depend on each other (see
+    :func:`~research_agent.graph.steps.next_wave`) run concurrently, up to
+    ``state.max_parallel_steps`` and the remaining tool-call budget.  Their
+    results are merged in plan order, so the outcome doesn't depend on which
+    tool finished first.
+    """
+    node_start = time.time()
+    deadline = research_deadline(state, node_start)
+    logger.info("[act_node] Step %d/%d", state.current_step_index + 1, len(state.plan))
+
+    if state.current_step_index >= len(state.plan):
+        metrics = RunMetrics()
+        metrics.node_timings.append(_timing("act", node_start, deadline))
+        return {"status": "reflecting", "last_tool_result": "", "metrics": metrics}
+
+    limit = min(state.max_parallel_steps, state.tool_call_limit - state.tool_calls_made)
+    wave = next_wave(state.plan, state.current_step_index, limit)
+    if len(wave) > 1:
+        logger.info("[act_node] Running steps %d–%d in parallel", wave[0] + 1, wave[-1] + 1)
+    steps = [state.plan[i] for i in wave]
+    # Older notes are merged into the digest in the background; a merge that
+    # is not done when the tools are is picked up by a later act.
+    _start_compaction(state, deadline)
+    try:
+        outcomes = await _run_wave(state, steps, deadline)
+    except BaseException:
+        _drop_compaction(state.run_id)
+        raise
+    compacted = _collect_compaction(state.run_id)
+
+    # Evidence, bibliography and metrics are appended by the graph; return only the new items.
+    new_evidence: list[EvidenceItem] = []
+    bib: dict[str, EvidenceItem] = {}
+    fingerprints: dict[str, list[int]] = {}
+    index = _fingerprint_index(state)
+    pending_results = list(state.pending_results)
+    metrics = RunMetrics()
+    done = [o for o in outcomes if o is not None]
+    for i, outcome in zip(wave, outcomes):
+        if outcome is None:
+            continue
+        for ev in outcome.result.evidence:
+            key = evidence_key(ev)
+            if key in bib or key in state.bibliography:
+                outcome.tool_call.duplicate_evidence += 1
+                continue
+            bands = fingerprint(_evidence_text(ev, outcome.result))
+            if bands is not None and index is not None:
+                original = index.find(bands)
+                if original is not None:
+                    logger.info("[act_node] Dropping %s, near-duplicate of %s", key, original)
+                    outcome.tool_call.duplicate_evidence += 1
+                    continue
+                index.add(key, bands)
+            if bands is not None:
+                fingerprints[key] = bands
+            new_evidence.append(ev)
+            bib[key] = ev
+        # A skipped fetch has nothing new to summarise; its page was observed the first time.
+        if not outcome.tool_call.skipped_duplicate:
+            pending_results.append(
+                PendingResult(
+                    step=outcome.step,
+                    number=step_number(state.plan[i], i),
+                    tool=outcome.tool_name,
+                    query=outcome.query,
+                    output=outcome.result.data,
+                )
+            )
+        if outcome.llm_call is not None:
+            metrics.llm_calls.append(outcome.llm_call)
+        outcome.tool_call.parallel = len(wave)
+        metrics.tool_calls.append(outcome.tool_call)
+    update: dict = {}
+    if compacted is not None:
+        digest, merged, call = compacted
+        metrics.llm_calls.append(call)
+        update = {"notes_digest": digest, "notes_compacted": state.notes_compacted + merged}
     metrics.node_timings.append(
-        NodeTimingMetric(node="act", duration_ms=(time.time() - node_start) * 1000)
+        _timing("act", node_start, deadline, exceeded=len(done) < len(outcomes))
     )
 
-    return {
-        "last_tool_result": result.data,
-        "pending_tool": tool_name,
-        "pending_tool_query": query,
+    last = done[-1] if done else None
+    return update | {
+        "last_tool_result": last.result.data if last else "",
+        "pending_tool": last.tool_name if last else "",
+        "pending_tool_query": last.query if last else "",
+        "pending_results": pending_results,
+        "current_step_index": wave[-1] + 1,
         "evidence": new_evidence,
         "bibliography": bib,
-        "tool_calls_made": state.tool_calls_made + 1,
-        "status": "observing",
+        "fingerprints": fingerprints,
+        "tool_calls_made": state.tool_calls_made
+        + sum(1 for o in done if not o.tool_call.skipped_duplicate),
+        "status": "observing" if pending_results else "reflecting",
         "metrics": metrics,
     }
 
 
-async def observe_node(state: AgentState) -> dict:
-    """Summarise the latest tool output into a note."""
-    node_start = time.time()
-    logger.info("[observe_node] Summarising tool output")
-    llm = get_llm()
-
+def _pending_results(state: AgentState) -> list[PendingResult]:
+    """Tool results awaiting a note; falls back to the single ``last_tool_result``."""
+    if state.pending_results:
+        return list(state.pending_results)
     step = (
         state.plan[state.current_step_index] if state.current_step_index < len(state.plan) else ""
     )
+    return [
+        PendingResult(
+            step=step,
+            tool=state.pending_tool,
+            query=state.pending_tool_query,
+            output=state.last_tool_result,
+        )
+    ]
+
+
+async def _observe_one(
+    state: AgentState, pending: PendingResult, deadline: Deadline
+) -> tuple[str, LLMCallMetric]:
+    """Summarise a single tool result into a note."""
+    packed = _pack(
+        "observe",
+        [Section("tool_output", [pending.output])],
+        OBSERVE_SYSTEM,
+        OBSERVE_USER,
+        pending.step,
+    )
     prompt = OBSERVE_USER.format(
-        step=step,
-        tool=state.pending_tool,
-        tool_output=state.last_tool_result[:3000],
+        step=pending.step,
+        tool=pending.tool,
+        tool_output=packed.text("tool_output"),
+    )
+    response = await get_llm().query(
+        prompt,
+        system=OBSERVE_SYSTEM,
+        cache=True,
+        node="observe",
+        run_id=state.run_id,
+        session=True,
+        deadline=deadline,
     )
-    response = await llm.query(prompt, system=OBSERVE_SYSTEM)
+    return response.text.strip(), _llm_metric("observe", response, packed=packed)
 
-    new_notes = list(state.notes) + [response.text.strip()]
 
-    metrics = _copy_metrics(state)
-    metrics.llm_calls.append(_llm_metric("observe", response))
-    metrics.node_timings.append(
-        NodeTimingMetric(node="observe", duration_ms=(time.time() - node_start) * 1000)
+async def _observe_batch(
+    state: AgentState, batch: list[PendingResult], deadline: Deadline
+) -> tuple[dict[int, str], LLMCallMetric]:
+    """Summarise several tool results in one call.
+
+    Each result gets the node's usual ``tool_output`` budget.  Returns the
+    notes keyed by 0-based result index; results the model skipped or that
+    failed to parse are missing from the dict.
+    """
+    blocks: list[str] = []
+    dropped = 0
+    for i, pending in enumerate(batch, 1):
+        packed = _pack(
+            "observe",
+            [Section("tool_output", [pending.output])],
+            OBSERVE_BATCH_SYSTEM,
+            OBSERVE_BATCH_RESULT,
+            pending.step,
+        )
+        dropped += packed.dropped_tokens["tool_output"]
+        blocks.append(
+            OBSERVE_BATCH_RESULT.format(
+                id=i, step=pending.step, tool=pending.tool, tool_output=packed.text("tool_output")
+            )
+        )
+    prompt = OBSERVE_BATCH_USER.format(results="\n".join(blocks), count=len(batch))
+    parsed, response = await get_llm().query_structured(
+        prompt,
+        ObserveBatch,
+        system=OBSERVE_BATCH_SYSTEM,
+        max_tokens=profile_for("observe").max_tokens * len(batch),
+        cache=True,
+        node="observe",
+        run_id=state.run_id,
+        session=True,
+        deadline=deadline,
+    )
+    notes: dict[int, str] = {}
+    for item in parsed.notes if parsed else []:
+        if 1 <= item.id <= len(batch) and item.note.strip():
+            notes.setdefault(item.id - 1, item.note.strip())
+    metric = _llm_metric(
+        "observe",
+        response,
+        parse_fallback=len(notes) < len(batch),
+        batch_size=len(notes),
     )
+    metric.context_dropped_tokens = {"tool_output": dropped}
+    return notes, metric
+
+
+async def observe_node(state: AgentState) -> dict:
+    """Summarise the pending tool outputs into notes.
+
+    With several results pending (see ``settings.observe_batch_size``) a single
+    LLM call returns one note per result; any result it fails to cover is
+    summarised on its own.  Results not summarised when the deadline arrives
+    get no note; their evidence is already in the bibliography.
+    """
+    node_start = time.time()
+    deadline = research_deadline(state, node_start)
+    pending = _pending_results(state)
+    logger.info("[observe_node] Summarising %d tool output(s)", len(pending))
+
+    calls: list[LLMCallMetric] = []
+    notes: dict[int, str] = {}
+    exceeded = False
+    try:
+        if len(pending) > 1:
+            notes, metric = await _observe_batch(state, pending, deadline)
+            calls.append(metric)
+            if len(notes) < len(pending):
+                logger.warning(
+                    "[observe_node] Batched reply covered %d/%d results, "
+                    "observing the rest one by one",
+                    len(notes),
+                    len(pending),
+                )
+        for i, result in enumerate(pending):
+            if i not in notes:
+                notes[i], metric = await _observe_one(state, result, deadline)
+                calls.append(metric)
+    except DeadlineExceededError:
+        exceeded = True
+        logger.warning(
+            "[observe_node] Deadline reached, %d/%d results summarised", len(notes), len(pending)
+        )
+
+    metrics = RunMetrics()
+    metrics.llm_calls.extend(calls)
+    metrics.node_timings.append(_timing("observe", node_start, deadline, exceeded=exceeded))
 
     return {
-        "notes": new_notes,
-        "current_step_index": state.current_step_index + 1,
+        "notes": [notes[i] for i in range(len(pending)) if i in notes],
+        "pending_results": [],
         "status": "reflecting",
         "metrics": metrics,
     }
@@ -205,6 +798,7 @@ async def observe_node(state: AgentState) -> dict:
 async def reflect_node(state: AgentState) -> dict:
     """Decide whether to continue or stop."""
     node_start = time.time()
+    deadline = research_deadline(state, node_start)
     logger.info(
         "[reflect_node] Iteration %d, evidence=%d, steps=%d/%d",
         state.iteration,
@@ -213,26 +807,24 @@ async def reflect_node(state: AgentState) -> dict:
         len(state.plan),
     )
 
-    elapsed = time.time() - state.start_time if state.start_time else 0
-    timebox_exceeded = elapsed > state.timebox_minutes * 60
+    timebox_exceeded = deadline.expired  # the report's share of the timebox is held back
     iter_exceeded = state.iteration >= state.max_iters
     tool_limit_exceeded = state.tool_calls_made >= state.tool_call_limit
 
     if timebox_exceeded or iter_exceeded or tool_limit_exceeded:
-        reason = []
+        reasons = []
         if timebox_exceeded:
-            reason.append("timebox exceeded")
+            reasons.append("timebox exceeded")
         if iter_exceeded:
-            reason.append("max iterations reached")
+            reasons.append("max iterations reached")
         if tool_limit_exceeded:
-            reason.append("tool call limit reached")
-        logger.info("[reflect_node] Forced stop: %s", ", ".join(reason))
-        metrics = _copy_metrics(state)
-        metrics.node_timings.append(
-            NodeTimingMetric(node="reflect", duration_ms=(time.time() - node_start) * 1000)
-        )
+            reasons.append("tool call limit reached")
+        logger.info("[reflect_node] Forced stop: %s", ", ".join(reasons))
+        metrics = RunMetrics()
+        metrics.node_timings.append(_timing("reflect", node_start, deadline))
         return {
             "should_stop": True,
+            "stop_reason": ", ".join(reasons),
             "status": "writing",
             "iteration": state.iteration + 1,
             "metrics": metrics,
@@ -240,107 +832,302 @@ async def reflect_node(state: AgentState) -> dict:
 
     # If there are remaining plan steps, keep going
     if state.current_step_index < len(state.plan):
-        metrics = _copy_metrics(state)
-        metrics.node_timings.append(
-            NodeTimingMetric(node="reflect", duration_ms=(time.time() - node_start) * 1000)
-        )
+        metrics = RunMetrics()
+        metrics.node_timings.append(_timing("reflect", node_start, deadline))
         return {"status": "acting", "iteration": state.iteration + 1, "metrics": metrics}
 
+    # Steps added by the last reflection that turned up nothing new end the run without an LLM call
+    novelty = None
+    if state.evidence_reflected is not None:
+        novelty = marginal_novelty(
+            state.evidence[state.evidence_reflected :], state.evidence[: state.evidence_reflected]
+        )
+        threshold = settings.reflect_novelty_threshold
+        if novelty < threshold:
+            reason = f"evidence novelty {novelty:.2f} below {threshold:.2f}"
+            logger.info("[reflect_node] Stopping without LLM: %s", reason)
+            metrics = RunMetrics()
+            metrics.reflections.append(
+                ReflectionMetric(
+                    iteration=state.iteration,
+                    novelty=novelty,
+                    decision="STOP",
+                    reason=reason,
+                    used_llm=False,
+                )
+            )
+            metrics.node_timings.append(_timing("reflect", node_start, deadline))
+            return {
+                "should_stop": True,
+                "stop_reason": reason,
+                "status": "writing",
+                "iteration": state.iteration + 1,
+                "evidence_reflected": len(state.evidence),
+                "metrics": metrics,
+            }
+
     # Ask the LLM whether we have enough evidence
     llm = get_llm()
+    packed = _pack(
+        "reflect",
+        [
+            Section("question", [state.question]),
+            Section("notes", _note_items(state), query=state.question, keep_order=True),
+        ],
+        REFLECT_SYSTEM,
+        REFLECT_USER,
+    )
     prompt = REFLECT_USER.format(
-        question=state.question,
+        question=packed.text("question"),
         iteration=state.iteration,
         max_iters=state.max_iters,
         steps_completed=state.current_step_index,
         total_steps=len(state.plan),
         evidence_count=len(state.evidence),
-        notes="\n".join(f"- {n}" for n in state.notes[-10:]),
+        notes=packed.text("notes"),
     )
-    response = await llm.query(prompt, system=REFLECT_SYSTEM)
-    raw = response.text
+    try:
+        decision, response = await llm.query_structured(
+            prompt,
+            ReflectDecision,
+            system=REFLECT_SYSTEM,
+            node="reflect",
+            run_id=state.run_id,
+            session=True,
+            deadline=deadline,
+        )
+    except DeadlineExceededError:
+        logger.info("[reflect_node] Deadline reached during reflection, stopping")
+        metrics = RunMetrics()
+        metrics.node_timings.append(_timing("reflect", node_start, deadline, exceeded=True))
+        return {
+            "should_stop": True,
+            "stop_reason": "timebox exceeded",
+            "status": "writing",
+            "iteration": state.iteration + 1,
+            "metrics": metrics,
+        }
+    parse_fallback = decision is None
+    if decision is None:
+        logger.warning("[reflect_node] Unstructured reply, falling back to line parsing")
+        decision = _parse_reflect_text(response.text)
 
-    metrics = _copy_metrics(state)
-    metrics.llm_calls.append(_llm_metric("reflect", response))
-    metrics.node_timings.append(
-        NodeTimingMetric(node="reflect", duration_ms=(time.time() - node_start) * 1000)
+    metrics = RunMetrics()
+    metrics.llm_calls.append(
+        _llm_metric("reflect", response, parse_fallback=parse_fallback, packed=packed)
+    )
+    metrics.reflections.append(
+        ReflectionMetric(
+            iteration=state.iteration,
+            novelty=novelty,
+            decision=decision.decision,
+            reason=decision.reason,
+        )
     )
+    metrics.node_timings.append(_timing("reflect", node_start, deadline))
 
-    if "DECISION: STOP" in raw.upper():
-        confidence = 0.7
-        for line in raw.splitlines():
-            if line.upper().startswith("CONFIDENCE:"):
-                try:
-                    confidence = float(line.split(":", 1)[1].strip())
-                except ValueError:
-                    pass
+    if decision.decision == "STOP":
         return {
             "should_stop": True,
-            "confidence": confidence,
+            "stop_reason": decision.reason or "model judged the evidence sufficient",
+            "confidence": decision.confidence,
             "status": "writing",
             "iteration": state.iteration + 1,
+            "evidence_reflected": len(state.evidence),
             "metrics": metrics,
         }
 
-    # CONTINUE — parse optional new steps
-    new_steps: list[str] = []
-    in_new = False
-    for line in raw.splitlines():
-        if line.upper().startswith("NEW_STEPS:"):
-            rest = line.split(":", 1)[1].strip()
-            if rest:
-                new_steps.append(rest)
-            in_new = True
-        elif in_new and line.strip() and line.strip()[0].isdigit():
-            new_steps.append(line.strip())
-
-    plan = list(state.plan)
-    if new_steps:
-        plan.extend(new_steps)
-
     return {
-        "plan": plan,
+        "plan": list(decision.new_steps),  # appended to the plan
         "status": "acting",
         "iteration": state.iteration + 1,
+        "evidence_reflected": len(state.evidence),
         "metrics": metrics,
     }
 
 
-async def write_report_node(state: AgentState) -> dict:
-    """Produce the final Markdown report."""
-    node_start = time.time()
-    logger.info("[write_report_node] Writing report with %d evidence items", len(state.evidence))
-    llm = get_llm()
+def _report_context(state: AgentState) -> tuple[PackedContext, dict[str, str]]:
+    """Pack question, evidence, notes and PDF pages for the report prompts.
 
-    evidence_text = ""
-    seen_urls: set[str] = set()
-    idx = 1
-    for key, ev in state.bibliography.items():
-        if ev.url in seen_urls:
-            continue
-        seen_urls.add(ev.url)
-        evidence_text += f"[{idx}] {ev.title} — {ev.url}\n    Snippet: {ev.snippet[:200]}\n\n"
-        idx += 1
+    Evidence is numbered like the rendered Sources list; only the
+    ``report_evidence_top_k`` entries that rank highest (BM25) against the
+    question, plan and notes are offered to the prompt.  Returns the packed
+    context and the fields shared by every report prompt.
+    """
+    sources = state.sources()
+    evidence_items = [
+        f"[{idx}] {ev.title} — {ev.url}\n    Snippet: {ev.snippet[:200]}\n" for idx, ev in sources
+    ]
+    notes = _note_items(state)
+    ranker = BM25([f"{ev.title} {ev.snippet}" for _, ev in sources])
+    scores = ranker.scores("\n".join([state.question, *state.plan, *notes]))
+    top_k = settings.report_evidence_top_k
+    if top_k > 0 and len(sources) > top_k:
+        keep = sorted(sorted(range(len(scores)), key=lambda i: -scores[i])[:top_k])
+        evidence_items = [evidence_items[i] for i in keep]
+        scores = [scores[i] for i in keep]
 
-    notes_text = "\n".join(f"- {n}" for n in state.notes)
+    packed = _pack(
+        "write_report",
+        [
+            Section("question", [state.question]),
+            Section("evidence", evidence_items, keep_order=True, scores=scores),
+            Section("notes", notes, query=state.question, keep_order=True),
+            Section("pdf", split_pages(state.pdf_context), query=state.question, keep_order=True),
+        ],
+        WRITE_REPORT_SYSTEM,
+        WRITE_REPORT_USER,
+    )
 
     pdf_section = ""
-    if state.pdf_context:
-        pdf_section = f"\nReference document ({state.pdf_filename}):\n{state.pdf_context[:20000]}\n"
+    if packed.items["pdf"]:
+        pdf_text = packed.text("pdf", "\n\n")
+        pdf_section = f"\nReference document ({state.pdf_filename}):\n{pdf_text}\n"
 
-    prompt = WRITE_REPORT_USER.format(
-        question=state.question,
-        audience=state.audience,
-        evidence=evidence_text or "(no external evidence collected)",
-        notes=notes_text or "(no notes)",
-        pdf_section=pdf_section,
+    return packed, {
+        "question": packed.text("question"),
+        "audience": state.audience,
+        "evidence": packed.text("evidence") or "(no external evidence collected)",
+        "notes": packed.text("notes") or "(no notes)",
+        "pdf_section": pdf_section,
+    }
+
+
+async def _write_single(
+    state: AgentState, fields: dict[str, str], deadline: Deadline, writer: StreamWriter
+) -> tuple[str, list[LLMResponse], bool]:
+    """Write the whole report in one streamed call: ``(report, responses, cut off)``."""
+    # Stream the report so callers (e.g. the SSE endpoint) can forward tokens live.
+    response = LLMResponse()
+    streamed = ""
+    try:
+        async with deadline.limit():
+            async for chunk in get_llm().query_stream(
+                WRITE_REPORT_USER.format(**fields),
+                system=WRITE_REPORT_SYSTEM,
+                node="write_report",
+                run_id=state.run_id,
+            ):
+                if chunk.text:
+                    streamed += chunk.text
+                    writer({"type": "report_delta", "text": chunk.text})
+                if chunk.response is not None:
+                    response = chunk.response
+    except DeadlineExceededError:
+        logger.warning("[write_report_node] Deadline reached, keeping the partial report")
+        writer({"type": "report_delta", "text": TRUNCATED_REPORT_MARKER})
+        return streamed + TRUNCATED_REPORT_MARKER, [LLMResponse(text=streamed)], True
+    return response.text, [response], False
+
+
+def _section_text(heading: str, text: str) -> str:
+    """A drafted section, with its heading added if the model left it out."""
+    text = text.strip()
+    if not text.lstrip("#").strip().lower().startswith(heading.lower()):
+        text = f"## {heading}\n\n{text}"
+    return text
+
+
+async def _write_sections(
+    state: AgentState, fields: dict[str, str], deadline: Deadline, writer: StreamWriter
+) -> tuple[str, list[LLMResponse], bool]:
+    """Draft the report sections in parallel, then stitch them with a short call.
+
+    Every section is its own call over the same evidence, capped at its
+    entry in ``REPORT_SECTION_MAX_TOKENS``; a last call writes the title and
+    lead paragraph from the drafts.  Sections cut off by the deadline are
+    left out.  A diagram section without a Mermaid block is dropped too, so
+    ``render_report`` adds its placeholder; Sources always come from there.
+    """
+    llm = get_llm()
+
+    async def _draft(heading: str, instructions: str) -> LLMResponse:
+        return await llm.query(
+            REPORT_SECTION_USER.format(heading=heading, instructions=instructions, **fields),
+            system=REPORT_SECTION_SYSTEM,
+            max_tokens=REPORT_SECTION_MAX_TOKENS[heading],
+            node="write_report",
+            run_id=state.run_id,
+            deadline=deadline,
+        )
+
+    results = await asyncio.gather(
+        *(_draft(heading, instructions) for heading, instructions in REPORT_SECTIONS.items()),
+        return_exceptions=True,
     )
-    response = await llm.query(prompt, system=WRITE_REPORT_SYSTEM, max_tokens=8192)
+    responses: list[LLMResponse] = []
+    sections: list[str] = []
+    exceeded = False
+    for heading, result in zip(REPORT_SECTIONS, results):
+        if isinstance(result, DeadlineExceededError):
+            logger.warning("[write_report_node] Deadline reached, leaving out %s", heading)
+            exceeded = True
+            continue
+        if isinstance(result, BaseException):
+            raise result
+        responses.append(result)
+        if heading == "Architecture Diagram" and "```mermaid" not in result.text:
+            continue
+        sections.append(_section_text(heading, result.text))
 
-    metrics = _copy_metrics(state)
-    metrics.llm_calls.append(_llm_metric("write_report", response))
-    metrics.node_timings.append(
-        NodeTimingMetric(node="write_report", duration_ms=(time.time() - node_start) * 1000)
+    lead = ""
+    if sections:
+        drafts = "\n\n".join(truncate_to_tokens(section, 300) for section in sections)
+        try:
+            stitch = await llm.query(
+                REPORT_STITCH_USER.format(
+                    question=fields["question"], audience=fields["audience"], sections=drafts
+                ),
+                system=REPORT_STITCH_SYSTEM,
+                max_tokens=REPORT_SECTION_MAX_TOKENS["stitch"],
+                node="write_report",
+                run_id=state.run_id,
+                deadline=deadline,
+            )
+        except DeadlineExceededError:
+            exceeded = True
+        else:
+            responses.append(stitch)
+            lead = stitch.text.strip()
+
+    report = "\n\n".join(part for part in [lead, *sections] if part)
+    if exceeded:
+        report += TRUNCATED_REPORT_MARKER
+    writer({"type": "report_delta", "text": report})
+    return report, responses, exceeded
+
+
+async def write_report_node(state: AgentState) -> dict:
+    """Produce the final Markdown report.
+
+    With ``settings.report_mode == "sections"`` the sections are drafted in
+    parallel and stitched together; otherwise one streamed call writes the
+    whole report.  The report gets the rest of the timebox, but never less
+    than its reserved share (``settings.report_reserve_fraction``); if
+    generation is cut off at the deadline, what was written is kept and
+    marked as truncated.
+    """
+    node_start = time.time()
+    deadline = report_deadline(state)
+    logger.info(
+        "[write_report_node] Writing report (%s) with %d evidence items",
+        settings.report_mode,
+        len(state.evidence),
     )
+    packed, fields = _report_context(state)
+    write = _write_sections if settings.report_mode == "sections" else _write_single
+    report, responses, exceeded = await write(state, fields, deadline, _stream_writer())
+
+    # The report is the last LLM call of the run; its chat session can go,
+    # and so can a note compaction nobody will collect.
+    get_llm().end_session(state.run_id)
+    _drop_compaction(state.run_id)
+
+    metrics = RunMetrics()
+    for i, response in enumerate(responses):
+        metrics.llm_calls.append(
+            _llm_metric("write_report", response, packed=packed if i == 0 else None)
+        )
+    metrics.node_timings.append(_timing("write_report", node_start, deadline, exceeded=exceeded))
 
-    return {"report": response.text.strip(), "status": "done", "metrics": metrics}
+    return {"report": report.strip(), "status": "done", "metrics": metrics}
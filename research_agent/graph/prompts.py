@@ -18,13 +18,16 @@ Desired depth: {desired_depth}
 {pdf_section}
 Produce 3–7 research steps. Format each line as:
 <step number>. [tool_name] <query or action description>
+
+Independent steps run in parallel. If a step needs the results of earlier steps \
+(e.g. fetching a page found by a search), end it with "(after <step numbers>)", e.g.:
+3. [fetch_url] the most relevant page found in step 1 (after 1)
 """
 
 ACT_SYSTEM = (
     "You are a research execution assistant. Given a plan step, extract the tool name "
-    "and the exact query to send to that tool. Reply with exactly two lines:\n"
-    "TOOL: <tool_name>\n"
-    "QUERY: <the query string>"
+    "and the exact query to send to that tool. Reply with a single JSON object:\n"
+    '{"tool": "<tool_name>", "query": "<the query string>"}'
 )
 
 ACT_USER = """\
@@ -33,9 +36,8 @@ Current plan step: {step}
 Evidence collected so far (count): {evidence_count}
 Notes so far: {notes_summary}
 
-Extract the tool and query. Reply with exactly:
-TOOL: <tool_name>
-QUERY: <query>
+Extract the tool and query. Reply with only:
+{{"tool": "<tool_name>", "query": "<query>"}}
 """
 
 OBSERVE_SYSTEM = (
@@ -46,20 +48,44 @@ OBSERVE_SYSTEM = (
 OBSERVE_USER = """\
 Plan step: {step}
 Tool: {tool}
-Tool output (truncated to 3000 chars):
+Tool output (may be truncated):
 {tool_output}
 
 Summarise the key findings from this tool output in 2–4 sentences.
 """
 
+OBSERVE_BATCH_SYSTEM = (
+    "You are a research analyst. You are given several numbered tool results. Summarise each "
+    "one separately into a concise note (2–4 sentences), highlighting key facts, data points, "
+    "or conclusions. If a result is empty or irrelevant, say so in its note.\n\n"
+    "Reply with a single JSON object:\n"
+    '{"notes": [{"id": <result number>, "note": "<2–4 sentences>"}, ...]}\n'
+    "with exactly one note per result. Output only the JSON object."
+)
+
+OBSERVE_BATCH_RESULT = """\
+### Result {id}
+Plan step: {step}
+Tool: {tool}
+Tool output (may be truncated):
+{tool_output}
+"""
+
+OBSERVE_BATCH_USER = """\
+{results}
+Summarise the key findings of each of the {count} results above. Reply with only:
+{{"notes": [{{"id": 1, "note": "..."}}, ...]}}
+"""
+
 REFLECT_SYSTEM = (
     "You are a senior research reviewer. Based on the evidence and notes gathered so far, "
     "decide whether the agent has enough information to write a confident report, "
     "or whether additional research steps are needed.\n\n"
-    "Reply with exactly one of:\n"
-    "DECISION: CONTINUE\nREASON: <why more research is needed>\nNEW_STEPS: <optional new steps, one per line>\n"
-    "or\n"
-    "DECISION: STOP\nCONFIDENCE: <0.0 to 1.0>\nREASON: <why we can stop>"
+    "Reply with a single JSON object:\n"
+    '{"decision": "CONTINUE" or "STOP", "confidence": <0.0 to 1.0>, '
+    '"reason": "<one short sentence>", '
+    '"new_steps": ["<n>. [tool_name] <query>", ...]}\n'
+    "Only include new_steps (at most 3) when the decision is CONTINUE."
 )
 
 REFLECT_USER = """\
@@ -73,6 +99,24 @@ Notes:
 Should we continue researching or write the final report?
 """
 
+COMPACT_SYSTEM = (
+    "You are a research analyst keeping a running digest of the notes taken during a research "
+    "run. Merge the new notes into the digest: keep every distinct fact, figure, named tool or "
+    "source, drop repetition and notes that found nothing. Reply with the updated digest only, "
+    "as a concise Markdown bullet list."
+)
+
+COMPACT_USER = """\
+Research question: {question}
+Current digest:
+{digest}
+
+New notes:
+{notes}
+
+Write the updated digest.
+"""
+
 WRITE_REPORT_SYSTEM = (
     "You are a technical report writer. Using the research question, gathered evidence, "
     "and analyst notes, write a polished Markdown report with these sections:\n"
@@ -101,3 +145,55 @@ Notes:
 
 Write the full Markdown report now. Start directly with ## Summary — do NOT wrap the whole report in a ```markdown fence. You MUST use ```mermaid fenced code blocks for diagrams.
 """
+
+REPORT_SECTION_SYSTEM = (
+    "You are a technical report writer. Using the research question, gathered evidence, "
+    "and analyst notes, write ONE section of a Markdown report; the other sections are "
+    "written separately. Every claim must reference a source by number, e.g. [2]. Write for "
+    "the specified audience. If a reference document was provided, treat it as a primary "
+    "source and cite it.\n\n"
+    "IMPORTANT: Start your response with the section heading you are given and write only "
+    "that section. Do NOT wrap it in a ```markdown code fence."
+)
+
+REPORT_SECTION_USER = """\
+Research question: {question}
+Audience: {audience}
+{pdf_section}
+Evidence:
+{evidence}
+
+Notes:
+{notes}
+
+Write only this section, starting with its heading:
+## {heading}
+{instructions}
+"""
+
+# Sections drafted in parallel in ``report_mode="sections"``, in report order.
+REPORT_SECTIONS = {
+    "Summary": "A 2–3 sentence overview that answers the research question.",
+    "Key Findings": "A bullet list of the important discoveries.",
+    "Recommendations": "Actionable items with their tradeoffs.",
+    "Architecture Diagram": (
+        "A Mermaid diagram in a fenced ```mermaid block illustrating the key concepts or "
+        "architecture, followed by at most one sentence of explanation."
+    ),
+}
+
+REPORT_STITCH_SYSTEM = (
+    "You are the editor of a technical report whose sections were written separately. Write "
+    "its title as a level-1 Markdown heading, followed by a lead paragraph of 2–3 sentences "
+    "that introduces the sections and ties them together. Output nothing else."
+)
+
+REPORT_STITCH_USER = """\
+Research question: {question}
+Audience: {audience}
+
+Section drafts (may be truncated):
+{sections}
+
+Write the title and lead paragraph now.
+"""
@@ -0,0 +1,42 @@
+"""Typed response models for nodes that ask the LLM for a structured decision.
+
+Their JSON schemas are sent as Ollama's ``format`` so generation is constrained
+to valid, short output; the length caps keep the decisions from rambling.
+"""
+
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+ToolName = Literal["web_search", "fetch_url", "python_sandbox", "local_docs", "elastic_rag"]
+
+
+class ActDecision(BaseModel):
+    """Tool call chosen by ``act_node`` for the current plan step."""
+
+    tool: ToolName
+    query: str = Field(min_length=1, max_length=400)
+
+
+class ObserveNote(BaseModel):
+    """Note for one numbered tool result of a batched observe call."""
+
+    id: int = Field(ge=1)
+    note: str = Field(min_length=1, max_length=1200)
+
+
+class ObserveBatch(BaseModel):
+    """Notes returned by a batched ``observe_node`` call, one per tool result."""
+
+    notes: list[ObserveNote]
+
+
+class ReflectDecision(BaseModel):
+    """Continue/stop verdict returned by ``reflect_node``."""
+
+    decision: Literal["CONTINUE", "STOP"]
+    confidence: float = Field(default=0.7, ge=0.0, le=1.0)
+    reason: str = Field(default="", max_length=300)
+    new_steps: list[str] = Field(default_factory=list, max_length=3)
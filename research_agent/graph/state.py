@@ -1,21 +1,52 @@
-"""Typed state for the research agent LangGraph state machine."""
+"""Typed state for the research agent LangGraph state machine.
+
+Fields that only ever grow (plan, evidence, notes, bibliography, metrics) are
+reducer-backed channels: nodes return just the items they add and the graph
+merges them.  The reducers still build a new list or dict for an update that
+adds something (growing the old one in place would change values LangGraph
+has already handed to checkpoints), so merging stays linear in the state
+size; what it saves is the nodes' own copies, a small share of per-node time.
+"""
 
 from __future__ import annotations
 
-from typing import Literal
+from collections.abc import Callable
+from typing import Annotated, Any, Literal, TypeVar
 
 from pydantic import BaseModel, Field
 
 from research_agent.tools.base import EvidenceItem
 
+# Model loads longer than this count as a cold start (a warm model loads in a few ms).
+COLD_START_MS = 500.0
+
+T = TypeVar("T")
+V = TypeVar("V")
+
 
 class LLMCallMetric(BaseModel):
     """Metrics for a single LLM call."""
 
     node: str = ""
+    model: str = ""  # model that served the call
     prompt_tokens: int = 0
     completion_tokens: int = 0
     duration_ms: float = 0.0
+    ttft_ms: float = 0.0  # time to first token (streamed calls only)
+    cache_status: str = ""  # "hit" / "miss" for cacheable calls
+    cached_prompt_tokens: int = 0  # prompt tokens reused from Ollama's KV cache
+    prompt_eval_saved_ms: float = 0.0
+    host: str = ""  # Ollama host that served the call
+    queue_wait_ms: float = 0.0  # admission wait, excluded from duration_ms
+    parse_fallback: bool = False  # structured output failed; free-text parsing was used
+    coalesced: bool = False  # shared an identical in-flight call instead of running one
+    retries: int = 0  # transient Ollama failures retried for this call
+    hedged: bool = False  # a duplicate request was raced on a second host
+    output_tokens_saved: int = 0  # generation cut short once the reply was complete
+    load_ms: float = 0.0  # time Ollama spent loading the model first (cold start)
+    batch_size: int = 1  # tool results summarised by this call (batched observe)
+    # Tokens of each prompt section cut to fit the node's context budget
+    context_dropped_tokens: dict[str, int] = Field(default_factory=dict)
 
 
 class ToolCallMetric(BaseModel):
@@ -25,6 +56,21 @@ class ToolCallMetric(BaseModel):
     query: str = ""
     duration_ms: float = 0.0
     success: bool = True
+    coalesced: bool = False  # shared an identical in-flight tool call
+    parallel: int = 1  # plan steps run concurrently in this call's wave
+    resolved_by: Literal["plan", "llm"] = "llm"  # who chose the tool and query
+    duplicate_evidence: int = 0  # evidence items dropped as URL or near-duplicates
+    skipped_duplicate: bool = False  # fetch of an already fetched URL, not executed
+
+
+class PendingResult(BaseModel):
+    """A tool result waiting to be summarised by ``observe_node``."""
+
+    step: str = ""
+    number: int = 0  # the step's number in the plan, for ``(after N)`` dependencies
+    tool: str = ""
+    query: str = ""
+    output: str = ""
 
 
 class NodeTimingMetric(BaseModel):
@@ -32,6 +78,18 @@ class NodeTimingMetric(BaseModel):
 
     node: str = ""
     duration_ms: float = 0.0
+    budget_ms: float | None = None  # time left until the node's deadline when it started
+    deadline_exceeded: bool = False  # work was cancelled at the deadline
+
+
+class ReflectionMetric(BaseModel):
+    """Outcome of a reflection once the plan was exhausted."""
+
+    iteration: int = 0
+    novelty: float | None = None  # marginal novelty of the evidence since the last reflection
+    decision: Literal["CONTINUE", "STOP"] = "CONTINUE"
+    reason: str = ""
+    used_llm: bool = True
 
 
 class RunMetrics(BaseModel):
@@ -40,6 +98,7 @@ class RunMetrics(BaseModel):
     llm_calls: list[LLMCallMetric] = Field(default_factory=list)
     tool_calls: list[ToolCallMetric] = Field(default_factory=list)
     node_timings: list[NodeTimingMetric] = Field(default_factory=list)
+    reflections: list[ReflectionMetric] = Field(default_factory=list)
 
     @property
     def total_prompt_tokens(self) -> int:
@@ -57,6 +116,50 @@ class RunMetrics(BaseModel):
     def total_llm_time_ms(self) -> float:
         return sum(c.duration_ms for c in self.llm_calls)
 
+    @property
+    def llm_cache_hits(self) -> int:
+        return sum(1 for c in self.llm_calls if c.cache_status == "hit")
+
+    @property
+    def llm_cache_misses(self) -> int:
+        return sum(1 for c in self.llm_calls if c.cache_status == "miss")
+
+    @property
+    def total_queue_wait_ms(self) -> float:
+        return sum(c.queue_wait_ms for c in self.llm_calls)
+
+    @property
+    def total_prompt_eval_saved_ms(self) -> float:
+        return sum(c.prompt_eval_saved_ms for c in self.llm_calls)
+
+    @property
+    def parse_fallbacks(self) -> int:
+        return sum(1 for c in self.llm_calls if c.parse_fallback)
+
+    @property
+    def act_llm_calls_avoided(self) -> int:
+        """Tool calls dispatched straight from the plan line, without an act LLM call."""
+        return sum(1 for c in self.tool_calls if c.resolved_by == "plan")
+
+    @property
+    def observe_calls_saved(self) -> int:
+        """LLM calls avoided by summarising several tool results in one observe call."""
+        return sum(c.batch_size - 1 for c in self.llm_calls if c.batch_size > 1)
+
+    @property
+    def reflect_llm_calls_skipped(self) -> int:
+        """Reflections decided by the evidence-novelty gate instead of the LLM."""
+        return sum(1 for r in self.reflections if not r.used_llm)
+
+    def budget_usage(self) -> dict[str, float]:
+        """Share of its budget each node used, highest per node name."""
+        usage: dict[str, float] = {}
+        for n in self.node_timings:
+            if n.budget_ms:
+                share = round(min(1.0, n.duration_ms / n.budget_ms), 3)
+                usage[n.node] = max(usage.get(n.node, 0.0), share)
+        return usage
+
     @property
     def total_tool_time_ms(self) -> float:
         return sum(c.duration_ms for c in self.tool_calls)
@@ -65,6 +168,28 @@ class RunMetrics(BaseModel):
     def total_research_time_ms(self) -> float:
         return sum(n.duration_ms for n in self.node_timings)
 
+    def context_dropped_tokens(self) -> dict[str, int]:
+        """Tokens dropped by context packing, per ``node.section``."""
+        dropped: dict[str, int] = {}
+        for c in self.llm_calls:
+            for section, tokens in c.context_dropped_tokens.items():
+                if tokens:
+                    key = f"{c.node}.{section}"
+                    dropped[key] = dropped.get(key, 0) + tokens
+        return dropped
+
+    def llm_time_by_model(self) -> dict[str, dict[str, float]]:
+        """Call count and total/average LLM time per model."""
+        by_model: dict[str, dict[str, float]] = {}
+        for c in self.llm_calls:
+            entry = by_model.setdefault(c.model or "default", {"calls": 0, "total_ms": 0.0})
+            entry["calls"] += 1
+            entry["total_ms"] += c.duration_ms
+        for entry in by_model.values():
+            entry["avg_ms"] = round(entry["total_ms"] / entry["calls"], 1)
+            entry["total_ms"] = round(entry["total_ms"], 1)
+        return by_model
+
     def summary(self) -> dict:
         """Return a JSON-serializable summary of all metrics."""
         return {
@@ -72,14 +197,68 @@ class RunMetrics(BaseModel):
             "total_completion_tokens": self.total_completion_tokens,
             "total_llm_calls": self.total_llm_calls,
             "total_llm_time_ms": round(self.total_llm_time_ms, 1),
+            "total_queue_wait_ms": round(self.total_queue_wait_ms, 1),
+            "llm_time_by_model": self.llm_time_by_model(),
+            "llm_cache_hits": self.llm_cache_hits,
+            "llm_cache_misses": self.llm_cache_misses,
+            "total_cached_prompt_tokens": sum(c.cached_prompt_tokens for c in self.llm_calls),
+            "total_prompt_eval_saved_ms": round(self.total_prompt_eval_saved_ms, 1),
+            "coalesced_llm_calls": sum(1 for c in self.llm_calls if c.coalesced),
+            "coalesced_tool_calls": sum(1 for c in self.tool_calls if c.coalesced),
+            "parallel_tool_calls": sum(1 for c in self.tool_calls if c.parallel > 1),
+            "llm_retries": sum(c.retries for c in self.llm_calls),
+            "hedged_llm_calls": sum(1 for c in self.llm_calls if c.hedged),
+            "total_output_tokens_saved": sum(c.output_tokens_saved for c in self.llm_calls),
+            "cold_start_llm_calls": sum(1 for c in self.llm_calls if c.load_ms > COLD_START_MS),
+            "total_model_load_ms": round(sum(c.load_ms for c in self.llm_calls), 1),
+            "act_llm_calls_avoided": self.act_llm_calls_avoided,
+            "parse_fallbacks": self.parse_fallbacks,
+            "observe_calls_saved": self.observe_calls_saved,
+            "reflect_llm_calls_skipped": self.reflect_llm_calls_skipped,
+            "duplicate_evidence_dropped": sum(c.duplicate_evidence for c in self.tool_calls),
+            "duplicate_fetches_skipped": sum(1 for c in self.tool_calls if c.skipped_duplicate),
+            "deadline_exceeded_nodes": sum(1 for n in self.node_timings if n.deadline_exceeded),
+            "budget_usage": self.budget_usage(),
+            "context_dropped_tokens": self.context_dropped_tokens(),
             "total_tool_time_ms": round(self.total_tool_time_ms, 1),
             "total_research_time_ms": round(self.total_research_time_ms, 1),
             "llm_calls": [c.model_dump() for c in self.llm_calls],
             "tool_calls": [c.model_dump() for c in self.tool_calls],
             "node_timings": [n.model_dump() for n in self.node_timings],
+            "reflections": [r.model_dump() for r in self.reflections],
         }
 
 
+def append(left: list[T], right: list[T] | None) -> list[T]:
+    """Reducer for append-only lists: the update holds only the new items."""
+    return left + right if right else left
+
+
+def merge_bibliography(left: dict[str, V], right: dict[str, V] | None) -> dict[str, V]:
+    """Reducer for the bibliography: new keys are added, existing entries are kept.
+
+    Also used for ``fingerprints``, which shares its keys.
+    """
+    new = {key: item for key, item in right.items() if key not in left} if right else {}
+    return left | new if new else left
+
+
+def merge_metrics(left: RunMetrics | dict, right: RunMetrics | dict | None) -> RunMetrics:
+    """Reducer for run metrics: appends the calls, timings and reflections of the update."""
+    if isinstance(left, dict):
+        left = RunMetrics.model_validate(left)
+    if not right:
+        return left
+    if isinstance(right, dict):
+        right = RunMetrics.model_validate(right)
+    return RunMetrics.model_construct(
+        llm_calls=append(left.llm_calls, right.llm_calls),
+        tool_calls=append(left.tool_calls, right.tool_calls),
+        node_timings=append(left.node_timings, right.node_timings),
+        reflections=append(left.reflections, right.reflections),
+    )
+
+
 class AgentState(BaseModel):
     """Full state carried through the graph."""
 
@@ -90,6 +269,7 @@ class AgentState(BaseModel):
     max_iters: int = 6
     timebox_minutes: int = 5
     tool_call_limit: int = 30
+    max_parallel_steps: int = 4  # independent plan steps run concurrently
 
     # Optional PDF reference document
     pdf_context: str = ""
@@ -102,7 +282,7 @@ class AgentState(BaseModel):
     start_time: float = 0.0  # epoch seconds
 
     # Plan → Act → Observe → Reflect
-    plan: list[str] = Field(default_factory=list)
+    plan: Annotated[list[str], append] = Field(default_factory=list)
     current_step_index: int = 0
     scratchpad: str = ""
 
@@ -110,19 +290,51 @@ class AgentState(BaseModel):
     pending_tool: str = ""
     pending_tool_query: str = ""
     last_tool_result: str = ""
+    pending_results: list[PendingResult] = Field(default_factory=list)  # not yet observed
 
     # Evidence & notes
-    evidence: list[EvidenceItem] = Field(default_factory=list)
-    notes: list[str] = Field(default_factory=list)
-    bibliography: dict[str, EvidenceItem] = Field(default_factory=dict)
+    evidence: Annotated[list[EvidenceItem], append] = Field(default_factory=list)
+    notes: Annotated[list[str], append] = Field(default_factory=list)
+    notes_digest: str = ""  # running summary of notes[:notes_compacted]
+    notes_compacted: int = 0
+    bibliography: Annotated[dict[str, EvidenceItem], merge_bibliography] = Field(
+        default_factory=dict
+    )  # keyed by canonical URL (or title)
+    # LSH band hashes of each bibliography entry's text (util.dedup.fingerprint), for
+    # near-duplicate detection
+    fingerprints: Annotated[dict[str, list[int]], merge_bibliography] = Field(default_factory=dict)
 
     # Control flow
     status: Literal["planning", "acting", "observing", "reflecting", "writing", "done"] = "planning"
     should_stop: bool = False
+    stop_reason: str = ""
     confidence: float = 0.0  # 0.0–1.0
+    evidence_reflected: int | None = None  # len(evidence) at the last LLM-level reflection
 
     # Metrics
-    metrics: RunMetrics = Field(default_factory=RunMetrics)
+    metrics: Annotated[RunMetrics, merge_metrics] = Field(default_factory=RunMetrics)
 
     # Output
     report: str = ""
+
+    def sources(self) -> list[tuple[int, EvidenceItem]]:
+        """Bibliography entries with their citation numbers.
+
+        The report prompt and the rendered Sources list both number from here,
+        so ``[n]`` in the report always points at the n-th listed source.
+        """
+        return list(enumerate(self.bibliography.values(), 1))
+
+
+REDUCERS: dict[str, Callable[[Any, Any], Any]] = {
+    name: field.metadata[-1]
+    for name, field in AgentState.model_fields.items()
+    if field.metadata and callable(field.metadata[-1])
+}
+
+
+def apply_update(state: dict[str, Any], update: dict[str, Any]) -> None:
+    """Merge a node's update into ``state`` the way the graph's channels do."""
+    for key, value in update.items():
+        reducer = REDUCERS.get(key)
+        state[key] = reducer(state[key], value) if reducer and key in state else value
@@ -0,0 +1,79 @@
+"""Plan-step parsing: dependencies between steps and direct tool calls.
+
+The planner ends a step that needs the results of earlier steps with
+``(after N)`` or ``(after N, M)``; every other step is independent.
+:func:`next_wave` picks the consecutive run of steps that can execute
+concurrently, so ``act_node`` can fan them out and merge their results back
+in plan order.
+
+:func:`parse_tool_call` reads the tool and query straight off a well-formed
+step, letting ``act_node`` skip its LLM call.
+"""
+
+from __future__ import annotations
+
+import re
+
+_NUMBER = re.compile(r"^\s*(\d+)\s*[.)]")
+_CALL = re.compile(r"^\s*\d+\s*[.)]\s*\[\s*([a-z_]+)\s*\]\s*(.+?)\s*$", re.IGNORECASE)
+_URL = re.compile(r"^https?://\S+$")
+_MAX_QUERY_CHARS = 400  # ActDecision.query limit
+_AFTER = re.compile(r"\s*\(\s*after\s+(?:steps?\s+)?([\d\s,&and]+)\)\s*$", re.IGNORECASE)
+
+
+def step_number(step: str, index: int) -> int:
+    """The number the step was given in the plan, or its 1-based position."""
+    match = _NUMBER.match(step)
+    return int(match.group(1)) if match else index + 1
+
+
+def step_dependencies(step: str) -> set[int]:
+    """Step numbers named in the step's ``(after ...)`` suffix."""
+    match = _AFTER.search(step)
+    if not match:
+        return set()
+    return {int(n) for n in re.findall(r"\d+", match.group(1))}
+
+
+def strip_dependencies(step: str) -> str:
+    """The step without its ``(after ...)`` suffix."""
+    return _AFTER.sub("", step)
+
+
+def next_wave(plan: list[str], start: int, limit: int) -> list[int]:
+    """Indices of the steps from ``start`` on that can run concurrently.
+
+    Steps before ``start`` have finished, so only dependencies within the
+    wave matter: the wave ends at the first step that depends on a step
+    already in it, or once ``limit`` steps were taken.  It always contains
+    ``start`` when that is a valid index.
+    """
+    wave: list[int] = []
+    numbers: set[int] = set()
+    for i in range(start, len(plan)):
+        if len(wave) >= max(1, limit) or step_dependencies(plan[i]) & numbers:
+            break
+        wave.append(i)
+        numbers.add(step_number(plan[i], i))
+    return wave
+
+
+def parse_tool_call(step: str) -> tuple[str, str] | None:
+    """``(tool, query)`` of a step like ``2. [web_search] kubernetes autoscaling``.
+
+    Returns None when the step needs the LLM to work out the call: it is not
+    in that format, depends on earlier results, is a ``python_sandbox`` step
+    (the code still has to be written) or a ``fetch_url`` step without a URL.
+    The tool name is not checked against the registry.
+    """
+    if step_dependencies(step):
+        return None
+    match = _CALL.match(step)
+    if not match:
+        return None
+    tool, query = match.group(1).lower(), match.group(2).strip("\"'` ")
+    if not query or len(query) > _MAX_QUERY_CHARS or tool == "python_sandbox":
+        return None
+    if tool == "fetch_url" and not _URL.match(query):
+        return None
+    return tool, query
@@ -2,12 +2,28 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import replace
+from typing import Any, TypeVar
 
-from research_agent.llm.client import LLMResponse, OllamaClient
+from pydantic import BaseModel, ValidationError
+
+from research_agent.config import settings
+from research_agent.llm.cache import LLMCache, cache_key
+from research_agent.llm.client import LLMResponse, LLMStreamChunk, OllamaClient
+from research_agent.llm.profiles import profile_for
+from research_agent.llm.scheduler import LLMScheduler, get_scheduler
+from research_agent.llm.session import SessionRegistry
+from research_agent.util.deadline import Deadline
+from research_agent.util.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T", bound=BaseModel)
+R = TypeVar("R")
+
 # Module-level singleton; import and call get_llm() everywhere.
 _instance: LLMAdapter | None = None
 
@@ -15,8 +31,55 @@ _instance: LLMAdapter | None = None
 class LLMAdapter:
     """High-level interface that the rest of the codebase calls."""
 
-    def __init__(self, client: OllamaClient | None = None) -> None:
+    def __init__(
+        self,
+        client: OllamaClient | None = None,
+        cache: LLMCache | None = None,
+        scheduler: LLMScheduler | None = None,
+    ) -> None:
         self.client = client or OllamaClient()
+        if cache is None and settings.llm_cache_enabled:
+            cache = LLMCache()
+        self.cache = cache
+        self.scheduler = scheduler or get_scheduler()
+        self.sessions = SessionRegistry()
+        self.flight = SingleFlight()
+
+    async def open(self) -> None:
+        """Open the underlying connection pool ahead of the first query."""
+        await self.client.open()
+
+    async def aclose(self) -> None:
+        """Release the underlying connection pool."""
+        await self.client.aclose()
+
+    def configured_models(self) -> list[str]:
+        """The default model plus every per-node override, without duplicates."""
+        return list(dict.fromkeys([self.client.model, *settings.ollama_node_models.values()]))
+
+    async def preload_models(self) -> dict[str, float | None]:
+        """Load every configured model on every host.
+
+        Returns the load time in ms per ``model@host`` (None when it failed).
+        """
+        targets = [(m, h) for m in self.configured_models() for h in self.client.hosts]
+        results = await asyncio.gather(
+            *(self.client.preload(m, host=h) for m, h in targets), return_exceptions=True
+        )
+        loads: dict[str, float | None] = {}
+        for (model, host), result in zip(targets, results):
+            if isinstance(result, BaseException):
+                logger.warning("Could not preload %s on %s: %s", model, host, result)
+                loads[f"{model}@{host}"] = None
+            else:
+                loads[f"{model}@{host}"] = result
+        return loads
+
+    def model_for(self, node: str | None) -> str | None:
+        """Return the model routed to ``node``, or None to use the client default."""
+        if node is None:
+            return None
+        return settings.ollama_node_models.get(node)
 
     async def query(
         self,
@@ -24,15 +87,294 @@ class LLMAdapter:
         *,
         system: str | None = None,
         temperature: float = 0.3,
-        max_tokens: int = 4096,
+        max_tokens: int | None = None,
+        stop: list[str] | None = None,
+        cache: bool = False,
+        node: str | None = None,
+        run_id: str | None = None,
+        session: bool = False,
+        format: dict[str, Any] | str | None = None,
+        until: Callable[[str], bool] | None = None,
+        deadline: Deadline | None = None,
+    ) -> LLMResponse:
+        """Generate a completion.
+
+        The model is chosen per ``node`` from ``settings.ollama_node_models``,
+        and ``max_tokens``/``stop`` default to the node's generation profile.
+        Every call that reaches Ollama is admitted by the process-wide
+        scheduler, which orders waiting calls by the priority of ``node`` and
+        shares slots fairly between runs.
+
+        Identical requests that are in flight at the same time are coalesced
+        onto a single Ollama call.  Pass ``cache=True`` to also let them be
+        answered from the response cache (when one is configured).  Pass
+        ``session=True`` with a ``run_id`` to append the call to that run's
+        chat session when chat-session mode is enabled; session calls are never
+        cached because their output depends on the history.
+
+        With ``until``, the reply is streamed and generation is cancelled as
+        soon as ``until(text_so_far)`` is True (not in session mode, where the
+        call goes through the non-streaming chat endpoint).
+
+        With a ``deadline``, a call still queued or generating when it arrives
+        is cancelled and :class:`~research_agent.util.deadline.DeadlineExceededError`
+        is raised (a coalesced call keeps running for its other callers).
+        """
+        model = self.model_for(node)
+        profile = profile_for(node)
+        max_tokens = max_tokens or profile.max_tokens
+        stop = list(profile.stop) if stop is None else stop
+        if session and run_id and settings.llm_session_mode:
+            return await _within(
+                deadline,
+                self._query_session(
+                    run_id,
+                    prompt,
+                    system=system,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stop=stop,
+                    node=node,
+                    model=model,
+                    format=format,
+                ),
+            )
+
+        request = {
+            "system": system,
+            "prompt": prompt,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stop": stop,
+            "format": format,
+        }
+        # In-flight calls share one client, so the node's model (None = the
+        # client default) identifies them; the persistent cache needs the
+        # resolved name.
+        flight_key = cache_key(model=model, **request)
+        key = ""
+        use_cache = cache and self.cache is not None
+        if use_cache and self.cache is not None:
+            key = cache_key(model=model or self.client.model, **request)
+            hit = self.cache.get(key)
+            if hit is not None:
+                logger.debug("LLM cache hit key=%s", key[:12])
+                return _unbilled(hit, cache_status="hit")
+
+        async def _generate() -> LLMResponse:
+            options: dict[str, Any] = {
+                "system": system,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "affinity": run_id,
+                "model": model,
+                "format": format,
+                "stop": stop,
+            }
+            async with self.scheduler.slot(node=node, run_id=run_id) as wait_ms:
+                if until is None:
+                    response = await self.client.generate(prompt, **options)
+                else:
+                    response = await self._generate_until(prompt, until, options)
+            response = replace(response, queue_wait_ms=wait_ms)
+            if use_cache and self.cache is not None:
+                self.cache.put(key, response)
+                response = replace(response, cache_status="miss")
+            return response
+
+        response, shared = await _within(deadline, self.flight.do(flight_key, _generate))
+        if shared:
+            logger.debug("LLM call coalesced key=%s", flight_key[:12])
+            return _unbilled(response, coalesced=True)
+        return response
+
+    async def _generate_until(
+        self, prompt: str, until: Callable[[str], bool], options: dict[str, Any]
+    ) -> LLMResponse:
+        """Stream a generation and stop it once ``until`` accepts the text."""
+        response: LLMResponse | None = None
+        text = ""
+        async for chunk in self.client.generate_stream(prompt, until=until, **options):
+            text += chunk.text
+            if chunk.response is not None:
+                response = chunk.response
+        if response is None:
+            return LLMResponse(text=text)
+        if response.stopped_early:
+            logger.debug("Stopped generation early, %d tokens saved", response.output_tokens_saved)
+        return response
+
+    async def _query_session(
+        self,
+        run_id: str,
+        prompt: str,
+        *,
+        system: str | None,
+        temperature: float,
+        max_tokens: int,
+        stop: list[str],
+        node: str | None,
+        model: str | None,
+        format: dict[str, Any] | str | None,
     ) -> LLMResponse:
-        return await self.client.generate(
-            prompt, system=system, temperature=temperature, max_tokens=max_tokens
+        sess = self.sessions.get(run_id, model or "")
+        # Node-specific instructions travel in the user turn so the shared
+        # history prefix stays byte-identical between calls.
+        content = f"{system}\n\n{prompt}" if system else prompt
+        async with sess.lock:
+            if sess.needs_reset():
+                logger.debug("Resetting chat session for run %s", run_id)
+                sess.reset()
+            messages = sess.messages + [{"role": "user", "content": content}]
+            async with self.scheduler.slot(node=node, run_id=run_id) as wait_ms:
+                response = await self.client.chat(
+                    messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    affinity=run_id,
+                    model=model,
+                    format=format,
+                    stop=stop,
+                )
+            reused = sess.reused_tokens(content, response.prompt_eval_count)
+            sess.append_turn(
+                content,
+                response.text,
+                prompt_tokens=reused + response.prompt_eval_count,
+                eval_count=response.eval_count,
+            )
+
+        saved_ms = 0.0
+        if reused and response.prompt_eval_count:
+            per_token_ns = response.prompt_eval_duration_ns / response.prompt_eval_count
+            saved_ms = reused * per_token_ns / 1_000_000
+        return replace(
+            response,
+            cached_prompt_tokens=reused,
+            prompt_eval_saved_ms=saved_ms,
+            queue_wait_ms=wait_ms,
         )
 
+    async def query_structured(
+        self, prompt: str, schema: type[T], **kwargs: Any
+    ) -> tuple[T | None, LLMResponse]:
+        """Query with output constrained to ``schema`` and parse the result.
+
+        When ``settings.llm_structured_output`` is on, the schema's JSON schema
+        is sent as Ollama's ``format`` so the model can only emit matching
+        JSON.  Returns ``(parsed, response)``; ``parsed`` is None when the
+        output still failed to validate, leaving the caller to fall back to
+        free-text parsing of ``response.text``.
+        """
+        if settings.llm_structured_output:
+            kwargs.setdefault("format", schema.model_json_schema())
+        response = await self.query(prompt, **kwargs)
+        return parse_structured(response.text, schema), response
+
+    def end_session(self, run_id: str) -> None:
+        """Drop the chat session of a finished run."""
+        self.sessions.end(run_id)
+
+    async def query_stream(
+        self,
+        prompt: str,
+        *,
+        system: str | None = None,
+        temperature: float = 0.3,
+        max_tokens: int | None = None,
+        node: str | None = None,
+        run_id: str | None = None,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        """Like :meth:`query`, but yield tokens as Ollama emits them.
+
+        The last chunk has ``done=True`` and carries the full ``LLMResponse``.
+        The scheduler slot is held until the stream finishes or is closed.
+        """
+        profile = profile_for(node)
+        async with self.scheduler.slot(node=node, run_id=run_id) as wait_ms:
+            async for chunk in self.client.generate_stream(
+                prompt,
+                system=system,
+                temperature=temperature,
+                max_tokens=max_tokens or profile.max_tokens,
+                affinity=run_id,
+                model=self.model_for(node),
+                stop=list(profile.stop) or None,
+            ):
+                if chunk.response is not None:
+                    chunk = replace(chunk, response=replace(chunk.response, queue_wait_ms=wait_ms))
+                yield chunk
+
+
+async def _within(deadline: Deadline | None, aw: Awaitable[R]) -> R:
+    """Await ``aw``, cancelled at ``deadline`` if there is one."""
+    return await aw if deadline is None else await deadline.run(aw)
+
+
+def _unbilled(response: LLMResponse, **changes: Any) -> LLMResponse:
+    """Copy of a response served without evaluating anything on the model.
+
+    The cost and per-call fields of the original call are zeroed, so its
+    retries, hedge, model load and savings are only counted once in a run's
+    metrics.
+    """
+    return replace(
+        response,
+        prompt_eval_count=0,
+        eval_count=0,
+        total_duration_ns=0,
+        prompt_eval_duration_ns=0,
+        eval_duration_ns=0,
+        load_duration_ns=0,
+        cached_prompt_tokens=0,
+        prompt_eval_saved_ms=0.0,
+        queue_wait_ms=0.0,
+        retries=0,
+        hedged=False,
+        stopped_early=False,
+        output_tokens_saved=0,
+        **changes,
+    )
+
+
+def json_object_complete(text: str) -> bool:
+    """True once ``text`` contains a balanced top-level JSON object."""
+    depth = 0
+    in_string = escaped = False
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = depth > 0
+        elif ch == "{":
+            depth += 1
+        elif ch == "}" and depth:
+            depth -= 1
+            if depth == 0:
+                return True
+    return False
+
+
+def parse_structured(text: str, schema: type[T]) -> T | None:
+    """Validate the JSON object in ``text`` against ``schema`` (None if it doesn't)."""
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end < start:
+        return None
+    try:
+        return schema.model_validate_json(text[start : end + 1])
+    except ValidationError:
+        return None
+
 
 def get_llm(client: OllamaClient | None = None) -> LLMAdapter:
     global _instance
     if _instance is None:
-        _instance = LLMAdapter(client)
+        client = client or OllamaClient()
+        # Size the shared scheduler for the hosts this client actually routes to.
+        _instance = LLMAdapter(client, scheduler=get_scheduler(backends=len(client.hosts)))
     return _instance
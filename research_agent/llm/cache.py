@@ -0,0 +1,141 @@
+"""Content-addressed cache for LLM responses.
+
+Two tiers sit in front of Ollama:
+
+* an in-memory LRU holding the most recently used responses, and
+* a bounded SQLite table (``llm_cache.db`` next to ``settings.db_path``) that
+  survives restarts, so re-running a question or replaying a benchmark does
+  not pay for identical generations twice.
+
+Entries are keyed on a SHA-256 of the request fields and expire after a TTL.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+from research_agent.config import settings
+from research_agent.llm.client import LLMResponse
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(**fields: Any) -> str:
+    """Return a stable content hash for the given request fields."""
+    blob = json.dumps(fields, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def default_cache_path() -> str:
+    if settings.llm_cache_path:
+        return settings.llm_cache_path
+    return str(Path(settings.db_path).with_name("llm_cache.db"))
+
+
+class LLMCache:
+    """Two-tier (memory LRU + SQLite) response cache with TTL expiry."""
+
+    def __init__(
+        self,
+        db_path: str | None = None,
+        *,
+        ttl_seconds: float | None = None,
+        max_memory_entries: int | None = None,
+        max_disk_entries: int | None = None,
+    ) -> None:
+        self.db_path = db_path or default_cache_path()
+        if ttl_seconds is None:
+            ttl_seconds = settings.llm_cache_ttl_seconds
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries or settings.llm_cache_max_memory_entries
+        self.max_disk_entries = max_disk_entries or settings.llm_cache_max_disk_entries
+        self._memory: OrderedDict[str, tuple[float, LLMResponse]] = OrderedDict()
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    def _init_db(self) -> None:
+        with self._conn() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    response_json TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path)
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> LLMResponse | None:
+        """Return the cached response for ``key``, or None on a miss."""
+        now = time.time()
+
+        entry = self._memory.get(key)
+        if entry is not None:
+            created_at, response = entry
+            if not self._expired(created_at, now):
+                self._memory.move_to_end(key)
+                return response
+            del self._memory[key]
+
+        with self._conn() as conn:
+            row = conn.execute(
+                "SELECT response_json, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self._expired(row[1], now):
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+
+        response = LLMResponse(**json.loads(row[0]))
+        self._remember(key, row[1], response)
+        return response
+
+    def put(self, key: str, response: LLMResponse) -> None:
+        """Store the content of ``response`` under ``key`` in both tiers.
+
+        Only the text and model are kept; how the original call went (host,
+        retries, timings, token counts) belongs to that call alone.
+        """
+        now = time.time()
+        response = LLMResponse(text=response.text, model=response.model)
+        self._remember(key, now, response)
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response_json, created_at, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(asdict(response)), now, now),
+            )
+            # Evict least-recently-used rows beyond the disk bound.
+            conn.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,),
+            )
+
+    def clear(self) -> None:
+        self._memory.clear()
+        with self._conn() as conn:
+            conn.execute("DELETE FROM llm_cache")
+
+    def _remember(self, key: str, created_at: float, response: LLMResponse) -> None:
+        self._memory[key] = (created_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
@@ -1,17 +1,28 @@
-"""Low-level Ollama HTTP client using /api/generate."""
+"""Low-level Ollama HTTP client using /api/generate and /api/chat."""
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
-from dataclasses import dataclass
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from typing import Any
 
 import httpx
 
 from research_agent.config import settings
+from research_agent.llm.pool import HostPool
+from research_agent.llm.retry import RetryPolicy
+from research_agent.util.tokens import estimate_tokens
 
 logger = logging.getLogger(__name__)
 
+# Errors raised before a request reached Ollama; safe to retry on another host.
+FAILOVER_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
 
 @dataclass(frozen=True)
 class LLMResponse:
@@ -23,34 +34,283 @@ class LLMResponse:
     total_duration_ns: int = 0
     prompt_eval_duration_ns: int = 0
     eval_duration_ns: int = 0
+    ttft_ms: float = 0.0  # time to first token; only measured for streamed calls
+    cache_status: str = ""  # "hit" / "miss" when the call was cacheable, else ""
+    cached_prompt_tokens: int = 0  # prompt tokens served from Ollama's KV cache
+    prompt_eval_saved_ms: float = 0.0  # estimated prefill time saved by KV reuse
+    host: str = ""  # Ollama host that served the call
+    model: str = ""  # model that produced the response
+    queue_wait_ms: float = 0.0  # time spent waiting for a scheduler slot
+    coalesced: bool = False  # shared the result of an identical in-flight call
+    retries: int = 0  # transient failures retried before this response arrived
+    hedged: bool = False  # a duplicate request was sent to a second host
+    stopped_early: bool = False  # we closed the stream once the reply was complete
+    load_duration_ns: int = 0  # time Ollama spent loading the model (cold start)
+    output_tokens_saved: int = 0  # unused max_tokens budget when stopped early (upper bound)
+
+
+@dataclass(frozen=True)
+class LLMStreamChunk:
+    """One incremental piece of a streamed generate call.
+
+    The final chunk has ``done=True`` and carries the aggregated ``response``.
+    """
+
+    text: str = ""
+    done: bool = False
+    response: LLMResponse | None = None
+
+
+@dataclass
+class _Outcome:
+    """Result of a (possibly retried and hedged) POST to Ollama."""
+
+    host: str = ""
+    data: dict[str, Any] = field(default_factory=dict)
+    retries: int = 0
+    hedged: bool = False
 
 
 class OllamaClient:
-    """Thin wrapper around Ollama's /api/generate endpoint."""
+    """Thin wrapper around Ollama's /api/generate and /api/chat endpoints.
+
+    A single pooled ``httpx.AsyncClient`` is shared by every call so that
+    connections to Ollama are kept alive and reused.  It is created lazily on
+    first use (or eagerly via :meth:`open`) and must be released with
+    :meth:`aclose` when the owning process shuts down.
+
+    Several hosts may be configured (``settings.ollama_hosts``); requests are
+    then routed by a :class:`HostPool`, stick to one host per ``affinity`` key
+    where possible, and fail over to another host on connection errors.
+
+    Transient failures are retried according to a :class:`RetryPolicy`, and
+    with several hosts a request that is slower than the recent latency
+    percentile is hedged: a duplicate goes to another host and whichever
+    answers last is cancelled.
+    """
 
     def __init__(
         self,
         host: str | None = None,
         model: str | None = None,
         timeout: int | None = None,
+        limits: httpx.Limits | None = None,
+        hosts: list[str] | None = None,
+        retry: RetryPolicy | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
     ) -> None:
-        self.host = (host or settings.ollama_host).rstrip("/")
+        if hosts is None:
+            hosts = [host] if host else list(settings.ollama_hosts) or [settings.ollama_host]
+        self.hosts = [h.rstrip("/") for h in hosts]
+        self.host = self.hosts[0]
         self.model = model or settings.ollama_model
         self.timeout = timeout or settings.ollama_timeout_seconds
+        self.limits = limits or httpx.Limits(
+            max_connections=settings.ollama_max_connections,
+            max_keepalive_connections=settings.ollama_max_keepalive_connections,
+            keepalive_expiry=settings.ollama_keepalive_expiry_seconds,
+        )
+        self.pool = HostPool(self.hosts)
+        self.retry = retry or RetryPolicy.from_settings()
+        # Custom transport, e.g. an ASGITransport onto the stand-in server in llm.stub
+        self.transport = transport
+        self._http: httpx.AsyncClient | None = None
+        self._health_task: asyncio.Task[None] | None = None
 
-    async def generate(
+    @property
+    def is_open(self) -> bool:
+        return self._http is not None and not self._http.is_closed
+
+    async def open(self) -> None:
+        """Create the shared connection pool (idempotent).
+
+        With more than one host this also starts the periodic health probe.
+        """
+        self._client()
+        if len(self.hosts) > 1 and self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def aclose(self) -> None:
+        """Stop the health probe and close the shared connection pool."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def _client(self) -> httpx.AsyncClient:
+        if not self.is_open:
+            self._http = httpx.AsyncClient(
+                timeout=self.timeout, limits=self.limits, transport=self.transport
+            )
+            logger.debug("Opened Ollama connection pool limits=%s", self.limits)
+        assert self._http is not None
+        return self._http
+
+    async def _health_loop(self) -> None:
+        while True:
+            await self.pool.probe(self._client())
+            await asyncio.sleep(settings.ollama_health_interval_seconds)
+
+    def host_stats(self) -> list[dict[str, Any]]:
+        """Per-host in-flight, request, failure and latency statistics."""
+        return self.pool.stats()
+
+    def _avoid(self, tried: set[str], busy: set[str]) -> set[str]:
+        """Hosts to skip: those already tried, plus those serving a sibling hedge if possible."""
+        avoid = tried | busy
+        return tried if avoid.issuperset(self.hosts) else avoid
+
+    async def _post_once(
+        self, path: str, payload: dict[str, Any], *, affinity: str | None, busy: set[str]
+    ) -> tuple[str, dict[str, Any]]:
+        """POST ``payload`` to the best host, failing over on connection errors."""
+        tried: set[str] = set()
+        while True:
+            host = self.pool.pick(affinity, exclude=self._avoid(tried, busy))
+            busy.add(host)
+            try:
+                async with self.pool.lease(host):
+                    resp = await self._client().post(f"{host}{path}", json=payload)
+                    resp.raise_for_status()
+                    return host, resp.json()
+            except FAILOVER_ERRORS as exc:
+                self.pool.mark_failure(host, exc)
+                tried.add(host)
+                if len(tried) >= len(self.hosts):
+                    raise
+                logger.warning("Failing over from %s after %s", host, type(exc).__name__)
+            finally:
+                busy.discard(host)
+
+    def _hedge_delay_s(self) -> float | None:
+        """Seconds to wait before hedging, or None when hedging is off or uncalibrated."""
+        if len(self.hosts) < 2 or settings.llm_hedge_percentile <= 0:
+            return None
+        threshold = self.pool.latency_percentile(
+            settings.llm_hedge_percentile, min_samples=settings.llm_hedge_min_samples
+        )
+        if threshold is None:
+            return None
+        return max(threshold, settings.llm_hedge_min_delay_ms) / 1000
+
+    async def _post_hedged(
+        self, path: str, payload: dict[str, Any], *, affinity: str | None
+    ) -> tuple[str, dict[str, Any], bool]:
+        """Like :meth:`_post_once`, racing a second host once the first is slow."""
+        busy: set[str] = set()
+        delay = self._hedge_delay_s()
+        if delay is None:
+            return (*await self._post_once(path, payload, affinity=affinity, busy=busy), False)
+
+        primary = asyncio.create_task(self._post_once(path, payload, affinity=affinity, busy=busy))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return (*primary.result(), False)
+
+        logger.info("Hedging %s after %.0f ms", path, delay * 1000)
+        hedge = asyncio.create_task(self._post_once(path, payload, affinity=None, busy=busy))
+        pending = {primary, hedge}
+        try:
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return (*task.result(), True)
+                if not pending:
+                    # Both sides failed; surface the last failure.
+                    return (*done.pop().result(), True)
+                # One side failed; keep waiting for the other.
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _post(self, path: str, payload: dict[str, Any], *, affinity: str | None) -> _Outcome:
+        """POST with failover, hedging and retries on transient errors."""
+        retries = 0
+        while True:
+            try:
+                host, data, hedged = await self._post_hedged(path, payload, affinity=affinity)
+                return _Outcome(host=host, data=data, retries=retries, hedged=hedged)
+            except Exception as exc:
+                if not self.retry.is_retryable(exc) or retries + 1 >= self.retry.max_attempts:
+                    raise
+                retries += 1
+                delay = self.retry.backoff(retries)
+                logger.warning(
+                    "Retrying %s in %.2fs (retry %d) after %s",
+                    path,
+                    delay,
+                    retries,
+                    type(exc).__name__,
+                )
+                await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def _stream(
+        self, path: str, payload: dict[str, Any], *, affinity: str | None
+    ) -> AsyncIterator[tuple[str, httpx.Response, int]]:
+        """Open a streaming POST on the best host.
+
+        Fails over and retries only until the first byte arrives; yields
+        ``(host, response, retries)``.
+        """
+        tried: set[str] = set()
+        retries = 0
+        while True:
+            host = self.pool.pick(affinity, exclude=tried)
+            yielded = False
+            try:
+                async with self.pool.lease(host):
+                    async with self._client().stream("POST", f"{host}{path}", json=payload) as resp:
+                        resp.raise_for_status()
+                        yielded = True
+                        yield host, resp, retries
+                        return
+            except Exception as exc:
+                if yielded or not self.retry.is_retryable(exc):
+                    raise
+                if isinstance(exc, FAILOVER_ERRORS):
+                    self.pool.mark_failure(host, exc)
+                    tried.add(host)
+                    if len(tried) < len(self.hosts):
+                        logger.warning("Failing over from %s after %s", host, type(exc).__name__)
+                        continue
+                if retries + 1 >= self.retry.max_attempts:
+                    raise
+                retries += 1
+                tried.clear()
+                delay = self.retry.backoff(retries)
+                logger.warning(
+                    "Retrying %s stream in %.2fs (retry %d) after %s",
+                    path,
+                    delay,
+                    retries,
+                    type(exc).__name__,
+                )
+                await asyncio.sleep(delay)
+
+    def _payload(
         self,
         prompt: str,
         *,
-        system: str | None = None,
-        temperature: float = 0.3,
-        max_tokens: int = 4096,
-    ) -> LLMResponse:
-        """Send a prompt to Ollama and return a structured LLMResponse."""
+        model: str | None,
+        system: str | None,
+        temperature: float,
+        max_tokens: int,
+        stream: bool,
+        format: dict[str, Any] | str | None = None,
+        stop: list[str] | None = None,
+    ) -> dict[str, Any]:
         payload: dict[str, Any] = {
-            "model": self.model,
+            "model": model or self.model,
             "prompt": prompt,
-            "stream": False,
+            "stream": stream,
             "options": {
                 "temperature": temperature,
                 "num_predict": max_tokens,
@@ -58,17 +318,24 @@ class OllamaClient:
         }
         if system:
             payload["system"] = system
+        if format is not None:
+            payload["format"] = format
+        if stop:
+            payload["options"]["stop"] = stop
+        if settings.ollama_keep_alive:
+            payload["keep_alive"] = settings.ollama_keep_alive
+        return payload
 
-        url = f"{self.host}/api/generate"
-        logger.debug("POST %s model=%s prompt_len=%d", url, self.model, len(prompt))
-
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            resp = await client.post(url, json=payload)
-            resp.raise_for_status()
-            data = resp.json()
-
-        text: str = data.get("response", "")
-        logger.debug("Ollama response len=%d", len(text))
+    @staticmethod
+    def _to_response(
+        text: str,
+        data: dict[str, Any],
+        *,
+        host: str = "",
+        ttft_ms: float = 0.0,
+        retries: int = 0,
+        hedged: bool = False,
+    ) -> LLMResponse:
         return LLMResponse(
             text=text,
             prompt_eval_count=data.get("prompt_eval_count", 0),
@@ -76,4 +343,228 @@ class OllamaClient:
             total_duration_ns=data.get("total_duration", 0),
             prompt_eval_duration_ns=data.get("prompt_eval_duration", 0),
             eval_duration_ns=data.get("eval_duration", 0),
+            load_duration_ns=data.get("load_duration", 0),
+            ttft_ms=ttft_ms,
+            host=host,
+            model=data.get("model", ""),
+            retries=retries,
+            hedged=hedged,
+        )
+
+    async def preload(self, model: str | None = None, *, host: str | None = None) -> float:
+        """Load ``model`` into memory on ``host`` (default: the first host).
+
+        Sends Ollama's empty-prompt load request with ``settings.ollama_keep_alive``
+        so the model stays resident between runs.  Returns the load time in ms.
+        """
+        host = host or self.host
+        payload: dict[str, Any] = {"model": model or self.model}
+        if settings.ollama_keep_alive:
+            payload["keep_alive"] = settings.ollama_keep_alive
+        start = time.perf_counter()
+        resp = await self._client().post(f"{host}/api/generate", json=payload)
+        resp.raise_for_status()
+        load_ms = (time.perf_counter() - start) * 1000
+        logger.info("Preloaded %s on %s in %.0f ms", payload["model"], host, load_ms)
+        return load_ms
+
+    @staticmethod
+    def _stopped_response(
+        text: str,
+        *,
+        prompt: str,
+        start: float,
+        ttft_ms: float,
+        host: str,
+        model: str,
+        retries: int,
+        max_tokens: int,
+        generated: int,
+    ) -> LLMResponse:
+        """Response for a stream we closed ourselves (Ollama sends no final stats)."""
+        elapsed_ns = int((time.perf_counter() - start) * 1_000_000_000)
+        return LLMResponse(
+            text=text,
+            # Ollama emits about one token per stream line; the prompt is estimated.
+            prompt_eval_count=estimate_tokens(prompt),
+            eval_count=generated,
+            total_duration_ns=elapsed_ns,
+            eval_duration_ns=max(0, elapsed_ns - int(ttft_ms * 1_000_000)),
+            ttft_ms=ttft_ms,
+            host=host,
+            model=model,
+            retries=retries,
+            stopped_early=True,
+            output_tokens_saved=max(0, max_tokens - generated),
+        )
+
+    async def generate(
+        self,
+        prompt: str,
+        *,
+        system: str | None = None,
+        temperature: float = 0.3,
+        max_tokens: int = 4096,
+        affinity: str | None = None,
+        model: str | None = None,
+        format: dict[str, Any] | str | None = None,
+        stop: list[str] | None = None,
+    ) -> LLMResponse:
+        """Send a prompt to Ollama and return a structured LLMResponse.
+
+        ``model`` overrides the client's default model for this call.
+        ``format`` is passed through to Ollama: ``"json"`` or a JSON schema
+        that constrains the output.
+        """
+        payload = self._payload(
+            prompt,
+            model=model,
+            system=system,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=False,
+            format=format,
+            stop=stop,
+        )
+        logger.debug("POST /api/generate model=%s prompt_len=%d", payload["model"], len(prompt))
+
+        out = await self._post("/api/generate", payload, affinity=affinity)
+        out.data.setdefault("model", payload["model"])
+
+        text: str = out.data.get("response", "")
+        logger.debug("Ollama response len=%d host=%s", len(text), out.host)
+        return self._to_response(
+            text, out.data, host=out.host, retries=out.retries, hedged=out.hedged
+        )
+
+    async def chat(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        temperature: float = 0.3,
+        max_tokens: int = 4096,
+        affinity: str | None = None,
+        model: str | None = None,
+        format: dict[str, Any] | str | None = None,
+        stop: list[str] | None = None,
+    ) -> LLMResponse:
+        """Send a message history to /api/chat and return the assistant reply.
+
+        Ollama keeps the KV cache of the previous request, so an append-only
+        history only has to evaluate the newly added messages.
+        """
+        payload: dict[str, Any] = {
+            "model": model or self.model,
+            "messages": messages,
+            "stream": False,
+            "options": {
+                "temperature": temperature,
+                "num_predict": max_tokens,
+            },
+        }
+        if format is not None:
+            payload["format"] = format
+        if stop:
+            payload["options"]["stop"] = stop
+        if settings.ollama_keep_alive:
+            payload["keep_alive"] = settings.ollama_keep_alive
+        logger.debug("POST /api/chat model=%s messages=%d", payload["model"], len(messages))
+
+        out = await self._post("/api/chat", payload, affinity=affinity)
+        out.data.setdefault("model", payload["model"])
+
+        text: str = out.data.get("message", {}).get("content", "")
+        return self._to_response(
+            text, out.data, host=out.host, retries=out.retries, hedged=out.hedged
+        )
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        *,
+        system: str | None = None,
+        temperature: float = 0.3,
+        max_tokens: int = 4096,
+        affinity: str | None = None,
+        model: str | None = None,
+        format: dict[str, Any] | str | None = None,
+        stop: list[str] | None = None,
+        until: Callable[[str], bool] | None = None,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        """Stream tokens from Ollama as they are generated.
+
+        Yields one chunk per token batch emitted by Ollama, followed by a final
+        chunk whose ``response`` holds the full text and timing statistics.
+        Closing the iterator early closes the HTTP stream, which makes Ollama
+        abandon the generation.
+
+        ``until`` is called with the text received so far after every token;
+        once it returns True the stream is closed and the final chunk carries
+        the partial response with ``stopped_early=True``.
+        """
+        payload = self._payload(
+            prompt,
+            model=model,
+            system=system,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            format=format,
+            stop=stop,
+        )
+        logger.debug(
+            "POST /api/generate (stream) model=%s prompt_len=%d", payload["model"], len(prompt)
+        )
+
+        start = time.perf_counter()
+        ttft_ms = 0.0
+        parts: list[str] = []
+        stream = self._stream("/api/generate", payload, affinity=affinity)
+        async with stream as (host, resp, retries):
+            async for line in resp.aiter_lines():
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                token: str = data.get("response", "")
+                if token:
+                    if not parts:
+                        ttft_ms = (time.perf_counter() - start) * 1000
+                    parts.append(token)
+                    yield LLMStreamChunk(text=token)
+                    if until is not None and until("".join(parts)):
+                        yield LLMStreamChunk(
+                            done=True,
+                            response=self._stopped_response(
+                                "".join(parts),
+                                prompt=(system or "") + prompt,
+                                start=start,
+                                ttft_ms=ttft_ms,
+                                host=host,
+                                model=payload["model"],
+                                retries=retries,
+                                max_tokens=max_tokens,
+                                generated=len(parts),
+                            ),
+                        )
+                        return
+                if data.get("done"):
+                    data.setdefault("model", payload["model"])
+                    text = "".join(parts)
+                    logger.debug("Ollama stream done len=%d ttft_ms=%.1f", len(text), ttft_ms)
+                    response = self._to_response(
+                        text, data, host=host, ttft_ms=ttft_ms, retries=retries
+                    )
+                    yield LLMStreamChunk(done=True, response=response)
+                    return
+
+        # Stream ended without a done marker; still hand back what we received.
+        yield LLMStreamChunk(
+            done=True,
+            response=LLMResponse(
+                text="".join(parts),
+                ttft_ms=ttft_ms,
+                host=host,
+                model=payload["model"],
+                retries=retries,
+            ),
         )
@@ -0,0 +1,185 @@
+"""Routing across several Ollama hosts.
+
+:class:`HostPool` picks the host with the fewest outstanding requests, keeps a
+run on the same host while that host is not noticeably busier than the rest
+(so the run keeps hitting a warm KV cache), and takes hosts out of rotation
+when they fail a connection or a ``/api/tags`` health probe.  Each host serves
+at most ``llm_max_concurrency_per_host`` requests at a time, hedged duplicates
+included; further requests routed to it wait in :meth:`HostPool.lease`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from research_agent.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Smoothing factor for the exponentially weighted latency average.
+EWMA_ALPHA = 0.2
+MAX_AFFINITY_KEYS = 4096
+
+
+class NoHealthyHostError(RuntimeError):
+    """Raised when every configured Ollama host has been excluded."""
+
+
+@dataclass
+class HostStats:
+    """Live routing statistics for one Ollama host."""
+
+    host: str
+    healthy: bool = True
+    in_flight: int = 0
+    requests: int = 0
+    failures: int = 0
+    ewma_latency_ms: float = 0.0
+    last_error: str = ""
+    latencies_ms: deque[float] = field(default_factory=lambda: deque(maxlen=256))
+
+    def record_latency(self, latency_ms: float) -> None:
+        self.latencies_ms.append(latency_ms)
+        if self.ewma_latency_ms == 0.0:
+            self.ewma_latency_ms = latency_ms
+        else:
+            self.ewma_latency_ms += EWMA_ALPHA * (latency_ms - self.ewma_latency_ms)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "host": self.host,
+            "healthy": self.healthy,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "failures": self.failures,
+            "ewma_latency_ms": round(self.ewma_latency_ms, 1),
+            "last_error": self.last_error,
+        }
+
+
+class HostPool:
+    """Least-outstanding-requests router with sticky affinity and health state."""
+
+    def __init__(
+        self,
+        hosts: list[str],
+        *,
+        affinity_slack: int | None = None,
+        max_in_flight: int | None = None,
+    ) -> None:
+        if not hosts:
+            raise ValueError("HostPool needs at least one host")
+        self.hosts = hosts
+        self.affinity_slack = (
+            affinity_slack if affinity_slack is not None else settings.ollama_affinity_slack
+        )
+        self.max_in_flight = max(
+            1, max_in_flight if max_in_flight is not None else settings.llm_max_concurrency_per_host
+        )
+        self._stats = {h: HostStats(host=h) for h in hosts}
+        self._affinity: OrderedDict[str, str] = OrderedDict()
+        self._slots: dict[str, tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+
+    def __getitem__(self, host: str) -> HostStats:
+        return self._stats[host]
+
+    def pick(self, affinity: str | None = None, exclude: set[str] | None = None) -> str:
+        """Choose a host for the next request."""
+        exclude = exclude or set()
+        available = [s for s in self._stats.values() if s.host not in exclude]
+        if not available:
+            raise NoHealthyHostError("All Ollama hosts failed")
+        # Unhealthy hosts are only used when nothing else is left, full ones
+        # only when every candidate is full (the request then waits in lease).
+        candidates = [s for s in available if s.healthy] or available
+        candidates = [s for s in candidates if s.in_flight < self.max_in_flight] or candidates
+        least = min(candidates, key=lambda s: (s.in_flight, s.ewma_latency_ms))
+
+        if affinity is not None:
+            sticky = self._affinity.get(affinity)
+            for s in candidates:
+                if s.host == sticky and s.in_flight <= least.in_flight + self.affinity_slack:
+                    self._affinity.move_to_end(affinity)
+                    return s.host
+            self._affinity[affinity] = least.host
+            self._affinity.move_to_end(affinity)
+            while len(self._affinity) > MAX_AFFINITY_KEYS:
+                self._affinity.popitem(last=False)
+        return least.host
+
+    def _slot(self, host: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        slot = self._slots.get(host)
+        if slot is None or slot[0] is not loop:
+            slot = self._slots[host] = (loop, asyncio.Semaphore(self.max_in_flight))
+        return slot[1]
+
+    @asynccontextmanager
+    async def lease(self, host: str) -> AsyncIterator[HostStats]:
+        """Hold one of ``host``'s request slots for as long as the request is in flight.
+
+        ``in_flight`` counts a request from the moment it is routed to the
+        host, including any wait for a slot, so routing sees queued work too.
+        """
+        stats = self._stats[host]
+        stats.in_flight += 1
+        try:
+            async with self._slot(host):
+                stats.requests += 1
+                start = time.perf_counter()
+                ok = False
+                try:
+                    yield stats
+                    ok = True
+                finally:
+                    if ok:
+                        stats.record_latency((time.perf_counter() - start) * 1000)
+        finally:
+            stats.in_flight -= 1
+
+    def mark_failure(self, host: str, exc: BaseException) -> None:
+        stats = self._stats[host]
+        stats.failures += 1
+        stats.healthy = False
+        stats.last_error = f"{type(exc).__name__}: {exc}"
+        logger.warning("Ollama host %s marked unhealthy: %s", host, stats.last_error)
+
+    def mark_healthy(self, host: str) -> None:
+        stats = self._stats[host]
+        if not stats.healthy:
+            logger.info("Ollama host %s is healthy again", host)
+        stats.healthy = True
+
+    async def probe(self, http: httpx.AsyncClient, *, timeout: float = 5.0) -> None:
+        """Check every host's ``/api/tags`` endpoint and update its health."""
+        for host in self.hosts:
+            try:
+                resp = await http.get(f"{host}/api/tags", timeout=timeout)
+                resp.raise_for_status()
+            except Exception as exc:
+                self.mark_failure(host, exc)
+            else:
+                self.mark_healthy(host)
+
+    def latency_percentile(self, percentile: float, *, min_samples: int = 1) -> float | None:
+        """Recent request latency (ms) at ``percentile`` across all hosts.
+
+        Returns None until at least ``min_samples`` requests have completed.
+        """
+        samples = sorted(x for s in self._stats.values() for x in s.latencies_ms)
+        if not samples or len(samples) < min_samples:
+            return None
+        rank = min(len(samples) - 1, int(len(samples) * percentile / 100))
+        return samples[rank]
+
+    def stats(self) -> list[dict[str, Any]]:
+        return [s.as_dict() for s in self._stats.values()]
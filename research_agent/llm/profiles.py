@@ -0,0 +1,56 @@
+"""Per-node generation limits.
+
+Every node used to allow 4096 output tokens, so chatty models kept producing
+text that was thrown away.  A :class:`GenerationProfile` caps each node's
+output at what its prompt actually asks for and adds stop sequences that end
+generation at the natural end of the reply.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from research_agent.config import settings
+
+
+@dataclass(frozen=True)
+class GenerationProfile:
+    max_tokens: int = 4096
+    stop: tuple[str, ...] = ()
+
+
+DEFAULT_PROFILE = GenerationProfile()
+
+NODE_PROFILES: dict[str, GenerationProfile] = {
+    # 3–7 one-line steps.
+    "plan": GenerationProfile(max_tokens=512, stop=("\n\n\n",)),
+    # One short JSON object (or two lines); a blank line means the model is rambling.
+    "act": GenerationProfile(max_tokens=160, stop=("\n\n",)),
+    # 2–4 sentences.
+    "observe": GenerationProfile(max_tokens=320, stop=("\n\n\n",)),
+    # Decision, one-sentence reason and at most three new steps.
+    "reflect": GenerationProfile(max_tokens=384, stop=("\n\n\n",)),
+    # Running digest of older notes; its cap bounds the digest in every later prompt.
+    "compact": GenerationProfile(max_tokens=600, stop=("\n\n\n",)),
+    "write_report": GenerationProfile(max_tokens=8192),
+}
+
+
+# Output caps of the calls in ``report_mode="sections"``: one per drafted section, plus
+# the stitching call that writes the title and lead paragraph.
+REPORT_SECTION_MAX_TOKENS: dict[str, int] = {
+    "Summary": 256,
+    "Key Findings": 1536,
+    "Recommendations": 1536,
+    "Architecture Diagram": 512,
+    "stitch": 200,
+}
+
+
+def profile_for(node: str | None) -> GenerationProfile:
+    """Return the generation profile for ``node``, honouring ``llm_node_max_tokens``."""
+    profile = NODE_PROFILES.get(node or "", DEFAULT_PROFILE)
+    override = settings.llm_node_max_tokens.get(node or "")
+    if override:
+        profile = GenerationProfile(max_tokens=override, stop=profile.stop)
+    return profile
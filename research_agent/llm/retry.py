@@ -0,0 +1,52 @@
+"""Retry policy for Ollama requests.
+
+Transient failures (connection problems, dropped connections, 5xx responses)
+are retried with capped exponential backoff and full jitter, so that many runs
+hitting the same overloaded host do not retry in lock-step.  Read timeouts are
+not retried: a generation that stalled for ``ollama_timeout_seconds`` would
+most likely stall again, and each retry would wait that long once more.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+
+import httpx
+
+from research_agent.config import settings
+
+RETRYABLE_ERRORS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.ReadError,
+    httpx.RemoteProtocolError,
+)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and how patiently to retry a failed Ollama request."""
+
+    max_attempts: int = 3
+    base_delay_s: float = 0.5
+    max_delay_s: float = 8.0
+
+    @classmethod
+    def from_settings(cls) -> RetryPolicy:
+        return cls(
+            max_attempts=max(1, settings.llm_retry_max_attempts),
+            base_delay_s=settings.llm_retry_base_delay_seconds,
+            max_delay_s=settings.llm_retry_max_delay_seconds,
+        )
+
+    @staticmethod
+    def is_retryable(exc: BaseException) -> bool:
+        if isinstance(exc, httpx.HTTPStatusError):
+            return exc.response.status_code >= 500
+        return isinstance(exc, RETRYABLE_ERRORS)
+
+    def backoff(self, retry: int) -> float:
+        """Seconds to sleep before the ``retry``-th retry (1-based)."""
+        ceiling = min(self.max_delay_s, self.base_delay_s * 2 ** (retry - 1))
+        return random.uniform(0, ceiling)
@@ -0,0 +1,155 @@
+"""Process-wide admission control for LLM calls.
+
+Without coordination, every concurrent run fires requests at Ollama as fast as
+it can and all of them slow down together.  :class:`LLMScheduler` caps the
+number of in-flight generations and decides who goes next when a slot frees:
+
+1. lower priority class first (``write_report``/``plan`` before ``observe``),
+2. then the run with the fewest calls currently in flight (fair share),
+3. then arrival order.
+
+Waiters age so that low-priority work cannot starve under sustained load.
+
+The cap is ``llm_max_concurrency_per_host`` times the number of hosts the
+client routes to.  It bounds the total; the per-host limit itself is
+enforced where the host is chosen (:meth:`~research_agent.llm.pool.HostPool.lease`),
+which also counts hedged duplicates that never pass through the scheduler.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from research_agent.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Lower value = admitted first.
+NODE_PRIORITIES: dict[str, int] = {
+    "write_report": 0,
+    "plan": 0,
+    "reflect": 1,
+    "act": 1,
+    "observe": 2,
+    "compact": 2,  # background work: act never waits for the digest
+}
+DEFAULT_PRIORITY = 1
+
+_instance: LLMScheduler | None = None
+
+
+@dataclass
+class _Waiter:
+    priority: int
+    run_id: str
+    seq: int
+    enqueued_at: float
+    future: asyncio.Future[None] = field(repr=False)
+
+
+class LLMScheduler:
+    """Priority- and fairness-aware semaphore in front of the LLM backends."""
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        aging_seconds: float | None = None,
+        *,
+        backends: int = 1,
+    ) -> None:
+        if max_concurrency is None:
+            max_concurrency = settings.llm_max_concurrency_per_host * max(1, backends)
+        self.max_concurrency = max_concurrency
+        self.aging_seconds = (
+            aging_seconds if aging_seconds is not None else settings.llm_scheduler_aging_seconds
+        )
+        self._active = 0
+        self._run_active: defaultdict[str, int] = defaultdict(int)
+        self._waiters: list[_Waiter] = []
+        self._seq = itertools.count()
+
+    @asynccontextmanager
+    async def slot(
+        self, *, node: str | None = None, run_id: str | None = None
+    ) -> AsyncIterator[float]:
+        """Hold an LLM slot for the duration of the block; yields the queue wait in ms."""
+        run_key = run_id or ""
+        wait_ms = await self._acquire(NODE_PRIORITIES.get(node or "", DEFAULT_PRIORITY), run_key)
+        try:
+            yield wait_ms
+        finally:
+            self._release(run_key)
+
+    async def _acquire(self, priority: int, run_key: str) -> float:
+        if self._active < self.max_concurrency and not self._waiters:
+            self._grant(run_key)
+            return 0.0
+
+        start = time.perf_counter()
+        waiter = _Waiter(
+            priority=priority,
+            run_id=run_key,
+            seq=next(self._seq),
+            enqueued_at=time.monotonic(),
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._waiters.append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted just before being cancelled: hand the slot back.
+                self._release(run_key)
+            else:
+                self._waiters.remove(waiter)
+            raise
+        return (time.perf_counter() - start) * 1000
+
+    def _grant(self, run_key: str) -> None:
+        self._active += 1
+        self._run_active[run_key] += 1
+
+    def _release(self, run_key: str) -> None:
+        self._active -= 1
+        self._run_active[run_key] -= 1
+        if self._run_active[run_key] <= 0:
+            del self._run_active[run_key]
+        self._wake()
+
+    def _rank(self, waiter: _Waiter, now: float) -> tuple[float, int, int]:
+        priority: float = waiter.priority
+        if self.aging_seconds > 0:
+            priority -= (now - waiter.enqueued_at) / self.aging_seconds
+        return (priority, self._run_active.get(waiter.run_id, 0), waiter.seq)
+
+    def _wake(self) -> None:
+        now = time.monotonic()
+        while self._active < self.max_concurrency and self._waiters:
+            best = min(self._waiters, key=lambda w: self._rank(w, now))
+            self._waiters.remove(best)
+            self._grant(best.run_id)
+            best.future.set_result(None)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "active": self._active,
+            "waiting": len(self._waiters),
+            "active_runs": len(self._run_active),
+        }
+
+
+def get_scheduler(backends: int = 1) -> LLMScheduler:
+    """The process-wide scheduler, sized for ``backends`` hosts on first use."""
+    global _instance
+    if _instance is None:
+        _instance = LLMScheduler(backends=backends)
+    return _instance
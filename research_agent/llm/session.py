@@ -0,0 +1,97 @@
+"""Per-run chat sessions that let Ollama reuse its KV cache between calls.
+
+Every node normally sends a freshly built prompt, so Ollama re-evaluates the
+whole prefix on each call.  A :class:`ChatSession` instead keeps an
+append-only ``/api/chat`` message history for one run: the previous turns form
+a stable prefix that is already in the model's KV cache, and only the new
+message has to be evaluated.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from research_agent.config import settings
+from research_agent.util.tokens import estimate_tokens
+
+SESSION_SYSTEM = (
+    "You are an autonomous technical research agent. Each message gives you the "
+    "instructions for the current step; follow them exactly and reply only in the "
+    "requested format."
+)
+
+
+@dataclass
+class ChatSession:
+    """Append-only message history for a single run."""
+
+    run_id: str
+    messages: list[dict[str, str]] = field(default_factory=list)
+    kv_tokens: int = 0  # tokens believed to be in Ollama's KV cache after the last turn
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)  # turns must not interleave
+
+    def __post_init__(self) -> None:
+        if not self.messages:
+            self.reset()
+
+    def reset(self) -> None:
+        self.messages = [{"role": "system", "content": SESSION_SYSTEM}]
+        self.kv_tokens = 0
+
+    def needs_reset(self) -> bool:
+        return (
+            len(self.messages) >= settings.llm_session_max_messages
+            or self.kv_tokens >= settings.llm_session_max_tokens
+        )
+
+    def reused_tokens(self, new_content: str, prompt_eval_count: int) -> int:
+        """Estimate how many prompt tokens Ollama took from its KV cache.
+
+        Ollama only reports the tokens it actually evaluated, so the reused
+        share is the expected prompt size minus that count.
+        """
+        expected = self.kv_tokens + estimate_tokens(new_content)
+        return max(0, min(self.kv_tokens, expected - prompt_eval_count))
+
+    def append_turn(
+        self, user: str, assistant: str, *, prompt_tokens: int, eval_count: int
+    ) -> None:
+        self.messages.append({"role": "user", "content": user})
+        self.messages.append({"role": "assistant", "content": assistant})
+        self.kv_tokens = prompt_tokens + eval_count
+
+
+class SessionRegistry:
+    """Bounded LRU of chat sessions keyed by run id and model.
+
+    Each model keeps its own KV cache in Ollama, so a run that routes nodes to
+    different models gets one session per model.
+    """
+
+    def __init__(self, max_sessions: int | None = None) -> None:
+        self.max_sessions = max_sessions or settings.llm_session_max_runs
+        self._sessions: OrderedDict[tuple[str, str], ChatSession] = OrderedDict()
+
+    def get(self, run_id: str, model: str = "") -> ChatSession:
+        key = (run_id, model)
+        session = self._sessions.get(key)
+        if session is None:
+            session = ChatSession(run_id=run_id)
+            self._sessions[key] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        self._sessions.move_to_end(key)
+        return session
+
+    def end(self, run_id: str) -> None:
+        """Drop every session belonging to ``run_id``."""
+        for key in [k for k in self._sessions if k[0] == run_id]:
+            del self._sessions[key]
+
+    def __contains__(self, run_id: object) -> bool:
+        return any(k[0] == run_id for k in self._sessions)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
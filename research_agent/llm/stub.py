@@ -0,0 +1,334 @@
+"""Local stand-in for an Ollama server, for benchmarking without a GPU.
+
+:func:`create_stub_app` builds a FastAPI app implementing ``/api/generate``,
+``/api/chat``, ``/api/embed`` and ``/api/tags`` in one of two modes:
+
+``record``
+    Proxy every request to a real Ollama (``upstream``) and append the request
+    and response to a JSONL recordings file.
+
+``replay``
+    Answer from the recordings file, or with a deterministic synthetic reply
+    when a request was never recorded.  Replies are paced by a simple latency
+    model — a fixed time to first token plus ``tokens_per_second`` — so the
+    graph and :class:`~research_agent.llm.client.OllamaClient` can be
+    load-tested reproducibly on a CPU-only box.
+
+Run it with ``research-agent stub-ollama`` or mount it in-process through
+``OllamaClient(transport=httpx.ASGITransport(app=create_stub_app(...)))``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Literal
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from research_agent.llm.cache import cache_key
+from research_agent.util.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"\S+\s*|\s+")
+_WORDS = (
+    "the model reports that inference latency depends on batch size memory bandwidth and "
+    "quantisation while deployment guides recommend containers gpu scheduling caching and "
+    "careful monitoring of throughput errors and cost across environments"
+).split()
+
+
+@dataclass
+class StubConfig:
+    """Behaviour of the stand-in server."""
+
+    mode: Literal["record", "replay"] = "replay"
+    recordings_path: str = "ollama_recordings.jsonl"
+    upstream: str = "http://localhost:11434"
+    latency_ms: float = 50.0  # time to first token in replay mode
+    tokens_per_second: float = 50.0  # 0 = emit instantly
+    synthetic_tokens: int = 48  # length of synthetic replies
+    embed_dim: int = 384
+    model: str = "stub"
+
+
+def request_key(endpoint: str, body: dict[str, Any]) -> str:
+    """Key identifying a request independently of transport details like ``stream``."""
+    options = body.get("options") or {}
+    return cache_key(
+        endpoint=endpoint,
+        model=body.get("model"),
+        system=body.get("system"),
+        prompt=body.get("prompt"),
+        messages=body.get("messages"),
+        input=body.get("input"),
+        format=body.get("format"),
+        temperature=options.get("temperature"),
+        num_predict=options.get("num_predict"),
+        stop=options.get("stop"),
+    )
+
+
+class Recordings:
+    """Append-only JSONL store of recorded Ollama exchanges."""
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self._entries: dict[str, dict[str, Any]] = {}
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as fh:
+                for line in fh:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]] = entry["response"]
+        logger.info("Loaded %d recorded Ollama responses from %s", len(self), self.path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        return self._entries.get(key)
+
+    def add(
+        self, key: str, endpoint: str, request: dict[str, Any], response: dict[str, Any]
+    ) -> None:
+        self._entries[key] = response
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {"key": key, "endpoint": endpoint, "request": request, "response": response}
+        with self.path.open("a", encoding="utf-8") as fh:
+            fh.write(json.dumps(entry) + "\n")
+
+    def models(self) -> set[str]:
+        return {r["model"] for r in self._entries.values() if r.get("model")}
+
+
+def _schema_instance(schema: dict[str, Any], defs: dict[str, Any]) -> Any:
+    """Smallest plausible value satisfying a (simple) JSON schema."""
+    if "$ref" in schema:
+        return _schema_instance(defs.get(schema["$ref"].rsplit("/", 1)[-1], {}), defs)
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "const" in schema:
+        return schema["const"]
+    if "anyOf" in schema:
+        return _schema_instance(schema["anyOf"][0], defs)
+    kind = schema.get("type")
+    if kind == "object":
+        props = schema.get("properties", {})
+        return {name: _schema_instance(sub, defs) for name, sub in props.items()}
+    if kind == "array":
+        return [_schema_instance(schema.get("items", {}), defs)] * schema.get("minItems", 0)
+    if kind in ("number", "integer"):
+        value = schema.get("maximum", schema.get("minimum", 1))
+        return int(value) if kind == "integer" else float(value)
+    if kind == "boolean":
+        return True
+    return "synthetic"[: schema.get("maxLength", 9)] or "s"
+
+
+def synthetic_text(body: dict[str, Any], key: str, n_tokens: int) -> str:
+    """Deterministic stand-in reply for a request that was never recorded."""
+    fmt = body.get("format")
+    if isinstance(fmt, dict):
+        return json.dumps(_schema_instance(fmt, fmt.get("$defs", {})))
+    if fmt == "json":
+        return "{}"
+    rng = random.Random(key)
+    return " ".join(rng.choice(_WORDS) for _ in range(n_tokens)).capitalize() + "."
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN.findall(text)
+
+
+def _apply_limits(text: str, body: dict[str, Any]) -> str:
+    options = body.get("options") or {}
+    for stop in options.get("stop") or []:
+        if stop and stop in text:
+            text = text[: text.index(stop)]
+    limit = options.get("num_predict")
+    if limit and limit > 0:
+        text = "".join(_tokens(text)[:limit])
+    return text
+
+
+def _prompt_text(body: dict[str, Any]) -> str:
+    if body.get("messages"):
+        return "".join(m.get("content", "") for m in body["messages"])
+    return (body.get("system") or "") + (body.get("prompt") or "")
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+def create_stub_app(config: StubConfig | None = None) -> FastAPI:
+    """Build the stand-in Ollama app."""
+    cfg = config or StubConfig()
+    recordings = Recordings(cfg.recordings_path)
+    app = FastAPI(title="Ollama stub", version="0.1.0")
+    app.state.config = cfg
+    app.state.recordings = recordings
+
+    async def _upstream(endpoint: str, body: dict[str, Any]) -> dict[str, Any]:
+        async with httpx.AsyncClient(timeout=None) as http:
+            resp = await http.post(f"{cfg.upstream}{endpoint}", json={**body, "stream": False})
+            resp.raise_for_status()
+            data: dict[str, Any] = resp.json()
+            return data
+
+    async def _completion(endpoint: str, body: dict[str, Any]) -> tuple[str, dict[str, Any], bool]:
+        """Return ``(text, recorded_stats, paced)`` for a generate/chat request."""
+        key = request_key(endpoint, body)
+        if cfg.mode == "record":
+            data = await _upstream(endpoint, body)
+            recordings.add(key, endpoint, body, data)
+            text = data["message"]["content"] if endpoint == "/api/chat" else data["response"]
+            return text, data, False
+        recorded = recordings.get(key)
+        if recorded is not None:
+            text = (
+                recorded.get("message", {}).get("content", "")
+                if endpoint == "/api/chat"
+                else recorded.get("response", "")
+            )
+            # Keep the recorded token counts; timings come from the latency model.
+            counts = {k: recorded[k] for k in ("prompt_eval_count", "eval_count") if k in recorded}
+            return text, counts, True
+        text = synthetic_text(body, key, cfg.synthetic_tokens)
+        return _apply_limits(text, body), {}, True
+
+    def _final(
+        endpoint: str,
+        body: dict[str, Any],
+        text: str,
+        stats: dict[str, Any],
+        elapsed_ns: int,
+        *,
+        streamed: bool = False,
+    ) -> dict[str, Any]:
+        prompt_tokens = stats.get("prompt_eval_count") or estimate_tokens(_prompt_text(body))
+        eval_count = stats.get("eval_count") or len(_tokens(text))
+        prefill_ns = int(cfg.latency_ms * 1_000_000)
+        final: dict[str, Any] = {
+            "model": body.get("model") or stats.get("model") or cfg.model,
+            "created_at": _now(),
+            "done": True,
+            "done_reason": stats.get("done_reason", "stop"),
+            "total_duration": stats.get("total_duration", elapsed_ns),
+            "load_duration": stats.get("load_duration", 0),
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": stats.get("prompt_eval_duration", prefill_ns),
+            "eval_count": eval_count,
+            "eval_duration": stats.get("eval_duration", max(0, elapsed_ns - prefill_ns)),
+        }
+        # A streamed reply has already been sent token by token.
+        content = "" if streamed else text
+        if endpoint == "/api/chat":
+            final["message"] = {"role": "assistant", "content": content}
+        else:
+            final["response"] = content
+        return final
+
+    def _delta(endpoint: str, body: dict[str, Any], token: str) -> dict[str, Any]:
+        chunk: dict[str, Any] = {"model": body.get("model") or cfg.model, "done": False}
+        if endpoint == "/api/chat":
+            chunk["message"] = {"role": "assistant", "content": token}
+        else:
+            chunk["response"] = token
+        return chunk
+
+    async def _answer(endpoint: str, request: Request) -> Any:
+        body: dict[str, Any] = await request.json()
+        if endpoint == "/api/generate" and not body.get("prompt") and not body.get("messages"):
+            # Model preload / unload request.
+            return JSONResponse(
+                {"model": body.get("model") or cfg.model, "done": True, "done_reason": "load"}
+            )
+        start = time.perf_counter()
+        text, stats, paced = await _completion(endpoint, body)
+        tokens = _tokens(text)
+        per_token = 1 / cfg.tokens_per_second if paced and cfg.tokens_per_second > 0 else 0.0
+        first_token = cfg.latency_ms / 1000 if paced else 0.0
+
+        if not body.get("stream", True):
+            await asyncio.sleep(first_token + per_token * len(tokens))
+            elapsed_ns = int((time.perf_counter() - start) * 1_000_000_000)
+            return JSONResponse(_final(endpoint, body, text, stats, elapsed_ns))
+
+        async def _ndjson() -> AsyncIterator[bytes]:
+            await asyncio.sleep(first_token)
+            for token in tokens:
+                yield (json.dumps(_delta(endpoint, body, token)) + "\n").encode()
+                if per_token:
+                    await asyncio.sleep(per_token)
+            elapsed_ns = int((time.perf_counter() - start) * 1_000_000_000)
+            final = _final(endpoint, body, text, stats, elapsed_ns, streamed=True)
+            yield (json.dumps(final) + "\n").encode()
+
+        return StreamingResponse(_ndjson(), media_type="application/x-ndjson")
+
+    @app.post("/api/generate")
+    async def generate(request: Request) -> Any:
+        return await _answer("/api/generate", request)
+
+    @app.post("/api/chat")
+    async def chat(request: Request) -> Any:
+        return await _answer("/api/chat", request)
+
+    @app.post("/api/embed")
+    async def embed(request: Request) -> dict[str, Any]:
+        body: dict[str, Any] = await request.json()
+        key = request_key("/api/embed", body)
+        if cfg.mode == "record":
+            data = await _upstream("/api/embed", body)
+            recordings.add(key, "/api/embed", body, data)
+            return data
+        recorded = recordings.get(key)
+        if recorded is not None:
+            await asyncio.sleep(cfg.latency_ms / 1000)
+            return recorded
+        inputs = body.get("input") or ""
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        await asyncio.sleep(cfg.latency_ms / 1000)
+        return {
+            "model": body.get("model") or cfg.model,
+            "embeddings": [_pseudo_embedding(t, cfg.embed_dim) for t in texts],
+            "prompt_eval_count": sum(estimate_tokens(t) for t in texts),
+        }
+
+    @app.get("/api/tags")
+    async def tags() -> dict[str, Any]:
+        if cfg.mode == "record":
+            async with httpx.AsyncClient() as http:
+                resp = await http.get(f"{cfg.upstream}/api/tags")
+                resp.raise_for_status()
+                data: dict[str, Any] = resp.json()
+                return data
+        names = sorted(recordings.models() | {cfg.model})
+        return {
+            "models": [{"name": n, "model": n, "modified_at": _now(), "size": 0} for n in names]
+        }
+
+    return app
+
+
+def _pseudo_embedding(text: str, dim: int) -> list[float]:
+    """Deterministic unit vector derived from ``text``."""
+    rng = random.Random(hashlib.sha256(text.encode()).digest())
+    vec = [rng.gauss(0.0, 1.0) for _ in range(dim)]
+    norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+    return [x / norm for x in vec]
@@ -0,0 +1,54 @@
+"""Graph checkpointing in the run database.
+
+The compiled graph persists its state after every node through LangGraph's
+SQLite checkpointer, in the same database file as :class:`RunStore` (its own
+tables).  A run interrupted by a restart or a failing node can then be
+resumed from the last completed node; the thread id is the run id.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any
+
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from research_agent.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def open_checkpointer(db_path: str | None = None) -> AsyncIterator[AsyncSqliteSaver | None]:
+    """Yield a SQLite checkpointer, or None when ``settings.checkpoint_enabled`` is off."""
+    if not settings.checkpoint_enabled:
+        yield None
+        return
+    path = db_path or settings.db_path
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    async with AsyncSqliteSaver.from_conn_string(path) as saver:
+        await saver.setup()
+        yield saver
+
+
+def run_config(run_id: str) -> dict[str, Any]:
+    """Graph config that checkpoints the run under its id."""
+    return {"configurable": {"thread_id": run_id}}
+
+
+async def resumable_state(graph: Any, run_id: str) -> dict[str, Any] | None:
+    """State of an unfinished, checkpointed run, or None if there is nothing to resume."""
+    snapshot = await graph.aget_state(run_config(run_id))
+    if not snapshot.values or not snapshot.next:
+        return None
+    logger.info("Run %s can resume at %s", run_id, ", ".join(snapshot.next))
+    return dict(snapshot.values)
+
+
+async def discard_checkpoints(checkpointer: AsyncSqliteSaver | None, run_id: str) -> None:
+    """Drop the checkpoints of a finished run; its final state lives in RunStore."""
+    if checkpointer is not None:
+        await checkpointer.adelete_thread(run_id)
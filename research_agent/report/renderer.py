@@ -13,7 +13,7 @@ def render_report(state: AgentState) -> str:
     if "## sources" not in report.lower() and "## citations" not in report.lower():
         if state.bibliography:
             report += "\n\n## Sources\n\n"
-            for idx, (_, ev) in enumerate(state.bibliography.items(), 1):
+            for idx, ev in state.sources():
                 if ev.url:
                     report += f"{idx}. [{ev.title}]({ev.url})\n"
                 else:
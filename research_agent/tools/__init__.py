@@ -4,6 +4,7 @@ from research_agent.tools.fetch_url import FetchUrlTool
 from research_agent.tools.python_sandbox import PythonSandboxTool
 from research_agent.tools.local_docs import LocalDocsTool
 from research_agent.tools.elastic_rag import ElasticRagTool
+from research_agent.util.singleflight import SingleFlight
 
 TOOL_REGISTRY: dict[str, type[BaseTool]] = {
     "web_search": WebSearchTool,
@@ -13,6 +14,9 @@ TOOL_REGISTRY: dict[str, type[BaseTool]] = {
     "elastic_rag": ElasticRagTool,
 }
 
+# Coalesces identical tool calls that are in flight at the same time.
+TOOL_FLIGHT = SingleFlight()
+
 __all__ = [
     "BaseTool",
     "ToolResult",
@@ -22,4 +26,5 @@ __all__ = [
     "LocalDocsTool",
     "ElasticRagTool",
     "TOOL_REGISTRY",
+    "TOOL_FLIGHT",
 ]
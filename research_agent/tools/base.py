@@ -43,5 +43,7 @@ class BaseTool(ABC):
     description: str = ""
 
     @abstractmethod
-    async def run(self, *, query: str, **kwargs: Any) -> ToolResult:
-        ...
+    async def run(self, *, query: str, **kwargs: Any) -> ToolResult: ...
+
+    async def warm_up(self) -> None:
+        """Load slow dependencies ahead of the first run (called at API startup)."""
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
@@ -13,6 +14,7 @@ from research_agent.tools.base import BaseTool, EvidenceItem, ToolResult
 logger = logging.getLogger(__name__)
 
 MAX_CONTENT_CHARS = 12_000
+_WARMUP_HTML = "<html><body><article><p>" + "Warm-up text. " * 20 + "</p></article></body></html>"
 
 
 class FetchUrlTool(BaseTool):
@@ -30,7 +32,9 @@ class FetchUrlTool(BaseTool):
             logger.warning("FetchUrl failed for %s: %s", url, exc)
             return ToolResult(tool=self.name, success=False, data=str(exc))
 
-        text = trafilatura.extract(resp.text) or resp.text[:MAX_CONTENT_CHARS]
+        # Extraction is CPU-bound; keep it off the event loop.
+        extracted = await asyncio.to_thread(trafilatura.extract, resp.text)
+        text = extracted or resp.text[:MAX_CONTENT_CHARS]
         text = text[:MAX_CONTENT_CHARS]
 
         title = url.split("/")[2] if "/" in url else url
@@ -42,3 +46,7 @@ class FetchUrlTool(BaseTool):
             data=text,
             evidence=evidence,
         )
+
+    async def warm_up(self) -> None:
+        # trafilatura builds its lxml parsers and lookup tables on first use.
+        await asyncio.to_thread(trafilatura.extract, _WARMUP_HTML)
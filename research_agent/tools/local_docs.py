@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from pathlib import Path
 from typing import Any
@@ -18,10 +19,7 @@ class LocalDocsTool(BaseTool):
     name = "local_docs"
     description = "Search local docs/ and data/ directories for relevant files."
 
-    async def run(self, *, query: str, **kwargs: Any) -> ToolResult:
-        query_lower = query.lower()
-        logger.info("LocalDocs: searching for '%s'", query)
-
+    def _search(self, query_lower: str) -> tuple[list[str], list[EvidenceItem]]:
         matches: list[str] = []
         evidence: list[EvidenceItem] = []
 
@@ -48,6 +46,12 @@ class LocalDocsTool(BaseTool):
                             snippet=snippet[:300],
                         )
                     )
+        return matches, evidence
+
+    async def run(self, *, query: str, **kwargs: Any) -> ToolResult:
+        logger.info("LocalDocs: searching for '%s'", query)
+        # Walking and reading the directories is blocking file I/O; keep it off the loop.
+        matches, evidence = await asyncio.to_thread(self._search, query.lower())
 
         if not matches:
             return ToolResult(
@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import shutil
-import subprocess
 import sys
 import tempfile
 from pathlib import Path
@@ -30,25 +30,34 @@ class PythonSandboxTool(BaseTool):
             script = Path(tmpdir) / "script.py"
             script.write_text(code)
 
+            proc: asyncio.subprocess.Process | None = None
             try:
                 python = shutil.which("python3") or shutil.which("python") or sys.executable
-                proc = subprocess.run(
-                    [python, str(script)],
-                    capture_output=True,
-                    text=True,
-                    timeout=TIMEOUT_SECONDS,
+                proc = await asyncio.create_subprocess_exec(
+                    python,
+                    str(script),
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
                     cwd=tmpdir,
                     env={"PATH": "/usr/bin:/usr/local/bin", "HOME": tmpdir},
                 )
-                output = proc.stdout[:MAX_OUTPUT_CHARS]
-                if proc.stderr:
-                    output += f"\n--- stderr ---\n{proc.stderr[:MAX_OUTPUT_CHARS]}"
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), TIMEOUT_SECONDS)
+                output = stdout.decode(errors="replace")[:MAX_OUTPUT_CHARS]
+                errors = stderr.decode(errors="replace")
+                if errors:
+                    output += f"\n--- stderr ---\n{errors[:MAX_OUTPUT_CHARS]}"
                 success = proc.returncode == 0
-            except subprocess.TimeoutExpired:
+            except TimeoutError:
                 output = f"Execution timed out after {TIMEOUT_SECONDS}s"
                 success = False
             except Exception as exc:
                 output = str(exc)
                 success = False
+            finally:
+                # Also reached when the caller cancels us (e.g. at the run deadline):
+                # don't leave the script running behind the cancelled step.
+                if proc is not None and proc.returncode is None:
+                    proc.kill()
+                    await proc.wait()
 
         return ToolResult(tool=self.name, success=success, data=output)
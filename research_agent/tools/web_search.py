@@ -24,12 +24,17 @@ class WebSearchTool(BaseTool):
     def __init__(self, max_results: int = 5) -> None:
         self.max_results = max_results
 
+    def _search(self, query: str) -> list[dict[str, str]]:
+        return DDGS().text(query, max_results=self.max_results)
+
     async def run(self, *, query: str, **kwargs: Any) -> ToolResult:
         logger.info("WebSearch: %s", query)
         results: list[dict[str, str]] = []
         for attempt in range(MAX_RETRIES):
             try:
-                results = DDGS().text(query, max_results=self.max_results)
+                # DDGS is synchronous; run it in a thread so concurrent steps and
+                # the run deadline are not stuck behind it.
+                results = await asyncio.to_thread(self._search, query)
                 break
             except RatelimitException:
                 delay = RETRY_BACKOFF_SECONDS[attempt]
@@ -0,0 +1,108 @@
+"""Token-budgeted packing of prompt context.
+
+Nodes used to bound their prompts with fixed character slices, which both
+overflowed the model's context on large runs and wasted it on small ones.
+:func:`pack_context` instead fills a prompt up to a token budget, section by
+section in priority order (e.g. question, then evidence, notes, PDF pages),
+taking the most relevant items of each section first and reporting how many
+tokens of every section had to be dropped.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+
+from research_agent.util.tokens import estimate_tokens, truncate_to_tokens
+
+# Don't bother squeezing in a truncated item when less than this is left.
+MIN_TRUNCATED_TOKENS = 32
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+@dataclass
+class Section:
+    """One block of prompt context.
+
+    ``items`` are packed whole where possible; the first item that no longer
+    fits is truncated to the remaining budget.  With a ``query`` the items are
+    considered most-relevant first, and ``keep_order`` puts the kept items back
+    in their original order (useful for notes and document pages).  ``scores``
+    gives a precomputed relevance per item (e.g. BM25) and takes precedence
+    over ``query``.
+    """
+
+    name: str
+    items: list[str]
+    query: str | None = None
+    keep_order: bool = False
+    scores: list[float] | None = None
+
+
+@dataclass
+class PackedContext:
+    """Result of :func:`pack_context`."""
+
+    budget_tokens: int
+    used_tokens: int = 0
+    items: dict[str, list[str]] = field(default_factory=dict)
+    dropped_tokens: dict[str, int] = field(default_factory=dict)
+
+    def text(self, name: str, sep: str = "\n") -> str:
+        return sep.join(self.items.get(name, []))
+
+    @property
+    def total_dropped_tokens(self) -> int:
+        return sum(self.dropped_tokens.values())
+
+
+def _words(text: str) -> set[str]:
+    return set(_WORD.findall(text.lower()))
+
+
+def relevance(text: str, query: str) -> float:
+    """Fraction of the query's words that occur in ``text``."""
+    terms = _words(query)
+    if not terms:
+        return 0.0
+    return len(terms & _words(text)) / len(terms)
+
+
+def pack_context(sections: list[Section], budget_tokens: int) -> PackedContext:
+    """Fill ``budget_tokens`` with the given sections in priority order."""
+    packed = PackedContext(budget_tokens=budget_tokens)
+    remaining = max(0, budget_tokens)
+
+    for section in sections:
+        order = list(range(len(section.items)))
+        if section.scores is not None:
+            scores = section.scores
+            order.sort(key=lambda i: -scores[i])
+        elif section.query:
+            # Stable sort: equally relevant items keep their original order.
+            order.sort(key=lambda i: -relevance(section.items[i], section.query or ""))
+
+        kept: list[tuple[int, str]] = []
+        dropped = 0
+        for i in order:
+            item = section.items[i]
+            cost = estimate_tokens(item)
+            if cost <= remaining:
+                kept.append((i, item))
+                remaining -= cost
+            elif remaining >= MIN_TRUNCATED_TOKENS:
+                cut = truncate_to_tokens(item, remaining)
+                kept.append((i, cut))
+                remaining -= estimate_tokens(cut)
+                dropped += cost - estimate_tokens(cut)
+            else:
+                dropped += cost
+
+        if section.keep_order:
+            kept.sort()
+        packed.items[section.name] = [item for _, item in kept]
+        packed.dropped_tokens[section.name] = dropped
+
+    packed.used_tokens = max(0, budget_tokens) - remaining
+    return packed
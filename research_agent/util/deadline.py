@@ -0,0 +1,60 @@
+"""Wall-clock deadlines that cancel in-flight work.
+
+A run's timebox used to be checked only between graph nodes, so a node that
+started just before it ran out could still block for a full LLM or HTTP
+timeout.  A :class:`Deadline` is passed down to the calls themselves and
+cancels whatever is still running when it arrives.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Awaitable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class DeadlineExceededError(TimeoutError):
+    """The deadline passed before the work finished; the work was cancelled."""
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """A point in time (epoch seconds) by which work has to be done."""
+
+    at: float
+
+    def remaining(self) -> float:
+        """Seconds left, never negative."""
+        return max(0.0, self.at - time.time())
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.at
+
+    @asynccontextmanager
+    async def limit(self) -> AsyncIterator[None]:
+        """Cancel the body when the deadline arrives and raise :class:`DeadlineExceededError`.
+
+        A timeout raised by the body itself (e.g. an HTTP client timeout)
+        propagates unchanged.
+        """
+        scope = asyncio.timeout(self.remaining())
+        try:
+            async with scope:
+                yield
+        except TimeoutError:
+            if scope.expired():
+                raise DeadlineExceededError(
+                    f"deadline passed {time.time() - self.at:.1f} s ago"
+                ) from None
+            raise
+
+    async def run(self, aw: Awaitable[T]) -> T:
+        """Await ``aw``, cancelling it when the deadline arrives."""
+        async with self.limit():
+            return await aw
@@ -0,0 +1,157 @@
+"""Duplicate detection for evidence: canonical URLs and MinHash fingerprints.
+
+The same page reaches a run under many URLs (tracking parameters, ``http``
+vs ``https``, ``www.``, trailing slashes) and as mirrored copies under
+unrelated ones.  :func:`canonical_url` folds the first kind onto one key;
+:func:`fingerprint` reduces the text's MinHash signature to a few band
+hashes, so :class:`FingerprintIndex` can find the second kind by estimated
+shingle overlap.  MinHash rather than SimHash, because much of the evidence
+is 300-character search snippets, where a single changed word moves a
+SimHash by more bits than the page-length texts it is tuned for.  Only the
+band hashes (16 small ints per page) are kept in the graph state, not the
+64-value signatures.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from research_agent.tools.base import EvidenceItem
+
+NUM_HASHES = 64
+BAND_ROWS = 4
+NUM_BANDS = NUM_HASHES // BAND_ROWS
+# Texts with fewer shingles than this give unstable fingerprints and are not compared.
+MIN_SHINGLES = 8
+SHINGLE_WORDS = 3
+
+_MERSENNE = (1 << 61) - 1
+_rng = random.Random(0x5EED)  # fixed, so fingerprints survive checkpoints and restarts
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE), _rng.randrange(_MERSENNE)) for _ in range(NUM_HASHES)
+]
+
+_WORD = re.compile(r"\w+")
+_TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "msclkid",
+    "yclid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "ref_src",
+    "spm",
+    "_ga",
+    "_hsenc",
+    "_hsmi",
+}
+_DEFAULT_PORTS = {":80", ":443"}
+
+
+def canonical_url(url: str) -> str:
+    """Fold the spellings of an ``http(s)`` URL onto one key.
+
+    Drops the scheme difference, ``www.``, default ports, the fragment,
+    tracking parameters (``utm_*`` and friends) and trailing slashes, and
+    sorts the remaining query parameters.  Other URLs (``upload://``, file
+    paths) are returned stripped but otherwise unchanged.
+    """
+    url = url.strip()
+    parts = urlsplit(url)
+    if parts.scheme.lower() not in ("http", "https") or not parts.netloc:
+        return url
+    host = parts.netloc.lower()
+    for port in _DEFAULT_PORTS:
+        host = host.removesuffix(port)
+    host = host.removeprefix("www.")
+    path = re.sub(r"/{2,}", "/", parts.path).rstrip("/")
+    params = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    )
+    query = f"?{urlencode(params)}" if params else ""
+    return f"https://{host}{path}{query}"
+
+
+def evidence_key(ev: EvidenceItem) -> str:
+    """Bibliography key of an evidence item: its canonical URL, else its title."""
+    return canonical_url(ev.url) if ev.url else ev.title
+
+
+def _shingle_hash(shingle: str) -> int:
+    # Stable across processes (unlike hash()), so fingerprints survive checkpoints.
+    return int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+
+
+def minhash(text: str) -> list[int] | None:
+    """MinHash signature of the word shingles of ``text``, or None if it is too short."""
+    words = _WORD.findall(text.lower())
+    hashes = {
+        _shingle_hash(" ".join(words[i : i + SHINGLE_WORDS]))
+        for i in range(len(words) - SHINGLE_WORDS + 1)
+    }
+    if len(hashes) < MIN_SHINGLES:
+        return None
+    return [min((a * h + b) % _MERSENNE for h in hashes) & 0xFFFFFFFF for a, b in _PERMUTATIONS]
+
+
+def similarity(a: list[int], b: list[int]) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def band_hashes(signature: list[int]) -> list[int]:
+    """One 32-bit hash per band of ``BAND_ROWS`` signature values."""
+    return [
+        int.from_bytes(
+            hashlib.blake2b(
+                b"".join(v.to_bytes(4, "big") for v in signature[i : i + BAND_ROWS]),
+                digest_size=4,
+            ).digest(),
+            "big",
+        )
+        for i in range(0, len(signature), BAND_ROWS)
+    ]
+
+
+def fingerprint(text: str) -> list[int] | None:
+    """Band hashes of the MinHash signature of ``text``, or None if it is too short."""
+    signature = minhash(text)
+    return band_hashes(signature) if signature is not None else None
+
+
+class FingerprintIndex:
+    """Near-duplicate lookup over :func:`fingerprint` band hashes.
+
+    Two texts with shingle similarity ``s`` agree on a band with probability
+    ``s ** BAND_ROWS``, so the share of matching bands estimates that power;
+    an entry is a near-duplicate when enough bands match for ``threshold``.
+    """
+
+    def __init__(self, threshold: float = 0.8) -> None:
+        self.min_bands = max(1, round(NUM_BANDS * threshold**BAND_ROWS))
+        self._buckets: dict[tuple[int, int], list[str]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, key: str, bands: list[int]) -> None:
+        self._size += 1
+        for band in enumerate(bands):
+            self._buckets.setdefault(band, []).append(key)
+
+    def find(self, bands: list[int]) -> str | None:
+        """Key of the indexed entry matching the most bands, if it matches enough."""
+        matches: dict[str, int] = {}
+        for band in enumerate(bands):
+            for key in self._buckets.get(band, ()):
+                matches[key] = matches.get(key, 0) + 1
+        best = max(matches, key=matches.__getitem__, default=None)
+        return best if best is not None and matches[best] >= self.min_bands else None
@@ -0,0 +1,53 @@
+"""Cheap estimate of how much new evidence adds to what was already collected.
+
+An evidence item is new when its URL has not been seen and its snippet
+shares few word shingles with earlier snippets.  ``reflect_node`` uses the
+score to stop a run whose latest steps only turned up known material, without
+asking the LLM.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+
+from research_agent.tools.base import EvidenceItem
+from research_agent.util.dedup import canonical_url
+
+SHINGLE_WORDS = 3
+
+_WORD = re.compile(r"\w+")
+
+
+def shingles(text: str, size: int = SHINGLE_WORDS) -> set[int]:
+    """Hashes of the ``size``-word windows of ``text`` (lower-cased words)."""
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return {hash(" ".join(words))} if words else set()
+    return {hash(" ".join(words[i : i + size])) for i in range(len(words) - size + 1)}
+
+
+def marginal_novelty(new: Iterable[EvidenceItem], seen: Iterable[EvidenceItem]) -> float:
+    """Average share of each new item that is not already covered by ``seen``.
+
+    An item whose URL was seen counts as 0; otherwise it scores the fraction
+    of its snippet shingles that occur in no earlier snippet (1.0 for an item
+    without a snippet).  Items are compared against each other too, so the same
+    page returned by two steps counts once.  No new items score 0.0.
+    """
+    urls = {canonical_url(item.url) for item in seen if item.url}
+    known: set[int] = set()
+    for item in seen:
+        known |= shingles(item.snippet)
+
+    scores: list[float] = []
+    for item in new:
+        key = canonical_url(item.url)
+        if key and key in urls:
+            scores.append(0.0)
+            continue
+        grams = shingles(item.snippet)
+        scores.append(len(grams - known) / len(grams) if grams else 1.0)
+        urls.add(key)
+        known |= grams
+    return sum(scores) / len(scores) if scores else 0.0
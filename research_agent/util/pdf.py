@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import re
+
 import fitz  # PyMuPDF
 
 
@@ -50,3 +52,21 @@ def extract_text_from_pdf(data: bytes, *, max_chars: int = 40_000) -> str:
         result += f"\n\n[...truncated, {remaining} more page(s)...]"
 
     return result
+
+
+_PAGE_MARKER = re.compile(r"^--- Page \d+ ---$", re.MULTILINE)
+
+
+def split_pages(text: str) -> list[str]:
+    """Split text produced by :func:`extract_text_from_pdf` back into pages.
+
+    Each returned chunk keeps its ``--- Page N ---`` marker; text without
+    markers comes back as a single chunk.
+    """
+    starts = [m.start() for m in _PAGE_MARKER.finditer(text)]
+    if not starts:
+        return [text] if text.strip() else []
+    if starts[0] > 0 and text[: starts[0]].strip():
+        starts.insert(0, 0)
+    bounds = starts + [len(text)]
+    return [text[a:b].strip() for a, b in zip(bounds, bounds[1:]) if text[a:b].strip()]
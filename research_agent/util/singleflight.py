@@ -0,0 +1,73 @@
+"""Coalescing of identical concurrent calls ("single flight").
+
+When several runs issue the same request at the same time, only the first one
+(the leader) actually executes it; the others await the leader's in-flight
+task and receive the same result or exception.  The key is forgotten as soon
+as the call finishes, so this only deduplicates *concurrent* work and is no
+substitute for a cache.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Call(Generic[T]):
+    task: asyncio.Future[T]
+    waiters: int = 0
+
+
+class SingleFlight:
+    """Share one in-flight execution between concurrent callers with the same key."""
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, _Call[Any]] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Run ``fn`` unless a call with ``key`` is already in flight.
+
+        Returns ``(result, shared)`` where ``shared`` is True when the result
+        came from another caller's execution.  The underlying call is only
+        cancelled once every caller waiting on it has been cancelled.
+        """
+        call = self._calls.get(key)
+        shared = call is not None
+        if call is None:
+            call = _Call(task=asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(functools.partial(self._forget, key, call))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+            logger.debug("Coalesced call onto in-flight key %r", key)
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task), shared
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+
+    def _forget(self, key: Hashable, call: _Call[Any], _task: asyncio.Future[Any]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }
@@ -0,0 +1,29 @@
+"""Cheap token-count approximations (no tokenizer dependency)."""
+
+from __future__ import annotations
+
+# Rough average for English prose with SentencePiece/BPE tokenizers.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the number of model tokens in ``text``."""
+    if not text:
+        return 0
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, *, marker: str = " […]") -> str:
+    """Cut ``text`` so that it fits in roughly ``max_tokens`` tokens.
+
+    Prefers to cut at a whitespace boundary and appends ``marker`` when
+    anything was removed (the marker counts against the budget).
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    limit = max(0, max_tokens * CHARS_PER_TOKEN - len(marker))
+    cut = text[:limit]
+    space = cut.rfind(" ")
+    if space > limit // 2:
+        cut = cut[:space]
+    return cut.rstrip() + marker
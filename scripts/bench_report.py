@@ -0,0 +1,92 @@
+"""Compare the wall-clock time of single-shot and sectioned report writing.
+
+Runs ``write_report_node`` on the same synthetic research state once per
+``report_mode`` (``single``: one streamed call; ``sections``: the sections
+drafted in parallel plus a short stitching call) against the configured
+Ollama, and prints wall time, LLM calls and completion tokens per mode.
+Sections only overlap when Ollama serves them concurrently
+(``OLLAMA_NUM_PARALLEL`` of 4 or more, or several ``OLLAMA_HOSTS``); on a
+server that handles one request at a time the sectioned mode is slower.
+
+    python scripts/bench_report.py --runs 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from research_agent.config import settings
+from research_agent.graph.nodes import write_report_node
+from research_agent.graph.state import AgentState
+from research_agent.llm.adapter import get_llm
+from research_agent.tools.base import EvidenceItem
+
+QUESTION = "What are the best practices for deploying LLMs in production?"
+TOPICS = [
+    "GPU scheduling",
+    "quantisation",
+    "continuous batching",
+    "KV-cache reuse",
+    "autoscaling",
+    "observability",
+    "canary releases",
+    "cost controls",
+]
+
+
+def _state(run_id: str) -> AgentState:
+    evidence = [
+        EvidenceItem(
+            title=f"{topic.title()} for LLM serving",
+            url=f"https://example.com/{i}",
+            snippet=f"How production teams approach {topic} when serving large language models.",
+        )
+        for i, topic in enumerate(TOPICS, 1)
+    ]
+    return AgentState(
+        question=QUESTION,
+        run_id=run_id,
+        start_time=time.time(),
+        timebox_minutes=60,  # never cut off
+        evidence=evidence,
+        bibliography={ev.url: ev for ev in evidence},
+        notes=[
+            f"{topic.capitalize()} matters for latency and cost [{i}]."
+            for i, topic in enumerate(TOPICS, 1)
+        ],
+    )
+
+
+async def main(modes: list[str], runs: int) -> None:
+    rows: list[tuple[str, list[float], float, float]] = []
+    for mode in modes:
+        settings.report_mode = mode
+        times: list[float] = []
+        calls = tokens = 0
+        for i in range(runs):
+            start = time.perf_counter()
+            result = await write_report_node(_state(f"bench-report-{mode}-{i}"))
+            times.append(time.perf_counter() - start)
+            calls += result["metrics"].total_llm_calls
+            tokens += result["metrics"].total_completion_tokens
+            print(f"{mode} run {i + 1}: {times[-1]:.1f} s, {len(result['report'])} chars")
+        rows.append((mode, times, calls / runs, tokens / runs))
+    await get_llm().aclose()
+
+    print(f"\n{'mode':>10}{'mean':>10}{'min':>10}{'LLM calls':>12}{'tokens out':>12}")
+    for mode, times, calls, tokens in rows:
+        print(
+            f"{mode:>10}{statistics.mean(times):>9.1f}s{min(times):>9.1f}s"
+            f"{calls:>12.0f}{tokens:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--modes", nargs="+", default=["single", "sections"])
+    args = parser.parse_args()
+    asyncio.run(main(args.modes, args.runs))
@@ -0,0 +1,120 @@
+"""Benchmark the per-node state overhead of the research graph as evidence grows.
+
+Runs a one-node loop that adds one evidence item, bibliography entry and
+tool-call metric per step, once on ``AgentState`` (reducer-backed channels,
+nodes return deltas) and once on the same fields without reducers, where
+every node has to return the full lists (how the graph nodes used to work).
+Prints the mean time per node around each size; no LLM or tools are involved.
+The difference between the columns is the copying; what both share is
+LangGraph validating the whole state into the node's pydantic model.
+
+    python scripts/bench_state.py --sizes 100 1000 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any
+
+from langgraph.graph import END, StateGraph
+from pydantic import BaseModel, create_model
+from pydantic.fields import FieldInfo
+
+from research_agent.graph.state import AgentState, RunMetrics, ToolCallMetric
+from research_agent.tools.base import EvidenceItem
+
+WINDOW = 50  # nodes averaged around each size
+
+
+def _without_reducers(model: type[BaseModel]) -> type[BaseModel]:
+    """``model`` with the reducer annotations stripped (plain last-value channels)."""
+    fields: dict[str, Any] = {}
+    for name, field in model.model_fields.items():
+        plain = FieldInfo.merge_field_infos(field)
+        plain.metadata = []
+        fields[name] = (field.annotation, plain)
+    return create_model(f"{model.__name__}WithoutReducers", **fields)
+
+
+CopyState = _without_reducers(AgentState)
+
+
+def _item(i: int) -> EvidenceItem:
+    return EvidenceItem(title=f"Result {i}", url=f"https://example.com/{i}", snippet="x" * 200)
+
+
+def _delta_node(stamps: list[float]):  # type: ignore[no-untyped-def]
+    async def grow(state: AgentState) -> dict[str, Any]:
+        stamps.append(time.perf_counter())
+        item = _item(state.iteration)
+        return {
+            "iteration": state.iteration + 1,
+            "evidence": [item],
+            "bibliography": {item.url: item},
+            "metrics": RunMetrics(tool_calls=[ToolCallMetric(tool_name="web_search")]),
+        }
+
+    return grow
+
+
+def _copy_node(stamps: list[float]):  # type: ignore[no-untyped-def]
+    async def grow(state: Any) -> dict[str, Any]:
+        stamps.append(time.perf_counter())
+        item = _item(state.iteration)
+        bib = dict(state.bibliography)
+        bib[item.url] = item
+        return {
+            "iteration": state.iteration + 1,
+            "evidence": list(state.evidence) + [item],
+            "bibliography": bib,
+            "metrics": RunMetrics(
+                llm_calls=list(state.metrics.llm_calls),
+                tool_calls=[*state.metrics.tool_calls, ToolCallMetric(tool_name="web_search")],
+                node_timings=list(state.metrics.node_timings),
+            ),
+        }
+
+    return grow
+
+
+async def _run(schema: type[BaseModel], node: Any, steps: int, stamps: list[float]) -> None:
+    graph = StateGraph(schema)
+    graph.add_node("grow", node(stamps))
+    graph.set_entry_point("grow")
+    graph.add_conditional_edges(
+        "grow", lambda s: END if s.iteration >= steps else "grow", {"grow": "grow", END: END}
+    )
+    await graph.compile().ainvoke(schema().model_dump(), {"recursion_limit": steps + 10})
+
+
+def _per_node_us(stamps: list[float], size: int) -> float:
+    lo = max(1, size - WINDOW // 2)
+    hi = min(len(stamps) - 1, lo + WINDOW)
+    return (stamps[hi] - stamps[lo]) / (hi - lo) * 1e6
+
+
+async def main(sizes: list[int]) -> None:
+    steps = max(sizes) + WINDOW
+    results: dict[str, list[float]] = {}
+    for name, schema, node in (
+        ("copy (full lists)", CopyState, _copy_node),
+        ("delta (reducers)", AgentState, _delta_node),
+    ):
+        stamps: list[float] = []
+        start = time.perf_counter()
+        await _run(schema, node, steps, stamps)
+        print(f"{name}: {steps} nodes in {time.perf_counter() - start:.2f} s")
+        results[name] = [_per_node_us(stamps, size) for size in sizes]
+
+    print(f"\n{'evidence items':>15}" + "".join(f"{name:>20}" for name in results))
+    for i, size in enumerate(sizes):
+        row = "".join(f"{times[i]:>17.0f} us" for times in results.values())
+        print(f"{size:>15}{row}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 2500, 5000])
+    asyncio.run(main(sorted(parser.parse_args().sizes)))
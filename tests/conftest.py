@@ -2,13 +2,27 @@
 
 from __future__ import annotations
 
+import json
 from unittest.mock import AsyncMock
 
 import pytest
 
 import research_agent.llm.adapter as adapter_mod
+from research_agent.config import settings
 from research_agent.llm.adapter import LLMAdapter
-from research_agent.llm.client import LLMResponse, OllamaClient
+from research_agent.llm.client import LLMResponse, LLMStreamChunk, OllamaClient
+
+
+@pytest.fixture(autouse=True)
+def _tmp_db_path(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:  # type: ignore[no-untyped-def]
+    """Keep run and checkpoint databases out of the working tree."""
+    monkeypatch.setattr(settings, "db_path", str(tmp_path / "research_agent.db"))
+
+
+@pytest.fixture(autouse=True)
+def _no_retry_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep retried requests from sleeping between attempts."""
+    monkeypatch.setattr(settings, "llm_retry_base_delay_seconds", 0.0)
 
 
 def _make_llm_response(text: str) -> LLMResponse:
@@ -35,6 +49,13 @@ def mock_ollama(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
         nonlocal call_count
         call_count += 1
 
+        # Batched observe: one note per numbered result
+        if "### Result" in prompt:
+            notes = [
+                {"id": i, "note": f"Key finding {i}: containerized deployments are recommended."}
+                for i in range(1, prompt.count("### Result ") + 1)
+            ]
+            return _make_llm_response(json.dumps({"notes": notes}))
         # First call → plan
         if call_count == 1:
             return _make_llm_response(
@@ -44,6 +65,10 @@ def mock_ollama(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
             )
         # Act calls
         if "TOOL:" in prompt or "Extract the tool" in prompt:
+            if kwargs.get("format"):
+                return _make_llm_response(
+                    '{"tool": "web_search", "query": "LLM deployment best practices"}'
+                )
             return _make_llm_response("TOOL: web_search\nQUERY: LLM deployment best practices")
         # Observe
         if "Summarise" in prompt:
@@ -52,6 +77,10 @@ def mock_ollama(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
             )
         # Reflect
         if "continue researching or write" in prompt:
+            if kwargs.get("format"):
+                return _make_llm_response(
+                    '{"decision": "STOP", "confidence": 0.8, "reason": "Sufficient evidence."}'
+                )
             return _make_llm_response(
                 "DECISION: STOP\nCONFIDENCE: 0.8\nREASON: Sufficient evidence gathered."
             )
@@ -64,7 +93,15 @@ def mock_ollama(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
             "## Sources\n1. Example source\n"
         )
 
+    async def _generate_stream(prompt: str, **kwargs):  # type: ignore[no-untyped-def]
+        # Delegate to whatever ``generate`` currently is so per-test overrides apply.
+        response = await mock_client.generate(prompt, **kwargs)
+        for token in response.text.splitlines(keepends=True):
+            yield LLMStreamChunk(text=token)
+        yield LLMStreamChunk(done=True, response=response)
+
     mock_client.generate = _generate
+    mock_client.generate_stream = _generate_stream
 
     mock_adapter = LLMAdapter(client=mock_client)
     monkeypatch.setattr(adapter_mod, "_instance", mock_adapter)
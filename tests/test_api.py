@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -20,3 +24,45 @@ def test_index_returns_json() -> None:
     resp = client.get("/")
     assert resp.status_code == 200
     assert "Research Agent" in resp.json()["message"]
+
+
+def _wait_until_ready(client: TestClient) -> dict:
+    for _ in range(200):
+        resp = client.get("/health")
+        if resp.status_code == 200:
+            return resp.json()
+        assert resp.json()["status"] == "warming"
+        time.sleep(0.01)
+    raise AssertionError("warm-up did not finish")
+
+
+def test_lifespan_opens_and_closes_llm_pool() -> None:
+    mock_llm = AsyncMock()
+    mock_llm.preload_models.return_value = {"m@http://a": 12.5}
+    with patch("research_agent.api.app.get_llm", return_value=mock_llm):
+        with TestClient(app) as client:
+            mock_llm.open.assert_awaited_once()
+            body = _wait_until_ready(client)
+        mock_llm.aclose.assert_awaited_once()
+    assert body["warmup"]["model_load_ms"] == {"m@http://a": 12.5}
+
+
+def test_health_reports_warming_until_warmup_finishes() -> None:
+    release = asyncio.Event()
+
+    async def _slow_preload() -> dict:
+        await release.wait()
+        return {"m@http://a": None}
+
+    mock_llm = AsyncMock()
+    mock_llm.preload_models.side_effect = _slow_preload
+    with patch("research_agent.api.app.get_llm", return_value=mock_llm):
+        with TestClient(app) as client:
+            resp = client.get("/health")
+            assert resp.status_code == 503
+            assert resp.json()["status"] == "warming"
+            client.portal.call(release.set)
+            body = _wait_until_ready(client)
+            assert client.app.state.graph is not None
+    assert body["warmup"]["errors"] == ["model m@http://a: not loaded"]
+    assert "fetch_url" in body["warmup"]["tool_warmup_ms"]
@@ -0,0 +1,33 @@
+"""Tests for BM25 ranking."""
+
+from __future__ import annotations
+
+from research_agent.util.bm25 import BM25, terms
+
+DOCS = [
+    "Cooking pasta: salt the water and stir.",
+    "GPU scheduling in Kubernetes with the device plugin.",
+    "Kubernetes autoscaling of GPU nodes for inference.",
+    "Kubernetes kubernetes kubernetes kubernetes release notes.",
+]
+
+
+def test_terms_ignore_case_and_punctuation():
+    assert terms("GPU-scheduling, K8s!") == ["gpu", "scheduling", "k8s"]
+
+
+def test_documents_matching_more_query_terms_rank_higher():
+    scores = BM25(DOCS).scores("gpu scheduling kubernetes")
+    assert scores[1] > scores[2] > scores[3] > scores[0] == 0.0
+
+
+def test_term_frequency_saturates():
+    index = BM25(DOCS)
+    # Repeating "kubernetes" four times doesn't beat a rarer term matched once.
+    assert index.scores("kubernetes scheduling")[1] > index.scores("kubernetes scheduling")[3]
+    assert index.idf("pasta") > index.idf("kubernetes") > 0
+
+
+def test_empty_index_and_unknown_terms():
+    assert BM25([]).scores("gpu") == []
+    assert BM25(DOCS).scores("zebra") == [0.0] * len(DOCS)
@@ -105,3 +105,15 @@ def test_runs_command_empty():
         result = runner.invoke(app, ["runs"])
 
     assert result.exit_code == 0
+
+
+# ---------------------------------------------------------------------------
+# CLI: resume command
+# ---------------------------------------------------------------------------
+
+
+def test_resume_command_without_checkpoint(mock_ollama):
+    result = runner.invoke(app, ["resume", "unknown-run"])
+
+    assert result.exit_code == 1
+    assert "No interrupted run unknown-run" in result.stdout
@@ -0,0 +1,75 @@
+"""Tests for token-budgeted context packing."""
+
+from __future__ import annotations
+
+import pytest
+
+from research_agent.graph.nodes import observe_node
+from research_agent.graph.state import AgentState
+from research_agent.util.context import Section, pack_context
+from research_agent.util.pdf import split_pages
+from research_agent.util.tokens import estimate_tokens, truncate_to_tokens
+
+
+def test_truncate_to_tokens_fits_budget():
+    text = "word " * 200
+    cut = truncate_to_tokens(text, 20)
+    assert estimate_tokens(cut) <= 20
+    assert cut.endswith("[…]")
+    assert truncate_to_tokens("short", 20) == "short"
+
+
+def test_pack_fills_by_priority_and_reports_drops():
+    sections = [
+        Section("question", ["q" * 40]),  # 10 tokens
+        Section("evidence", ["e" * 400, "f" * 400]),  # 100 tokens each
+        Section("notes", ["n" * 400]),
+    ]
+    packed = pack_context(sections, 150)
+
+    assert packed.items["question"] == ["q" * 40]
+    assert packed.items["evidence"][0] == "e" * 400
+    # 40 tokens left: the second evidence item is truncated, notes get nothing.
+    assert len(packed.items["evidence"]) == 2
+    assert packed.items["notes"] == []
+    assert packed.dropped_tokens["notes"] == 100
+    assert packed.dropped_tokens["evidence"] > 0
+    assert packed.used_tokens <= 150
+
+
+def test_pack_prefers_relevant_items_and_can_keep_order():
+    items = ["about cats and dogs", "kubernetes gpu scheduling", "gpu drivers"]
+    ranked = pack_context([Section("ev", items, query="gpu scheduling")], 8)
+    assert ranked.items["ev"] == ["kubernetes gpu scheduling"]
+
+    ordered = pack_context([Section("ev", items, query="gpu", keep_order=True)], 100)
+    assert ordered.items["ev"] == items
+
+
+def test_pack_uses_precomputed_scores():
+    items = ["aaaa", "bbbb", "cccc"]
+    packed = pack_context([Section("ev", items, query="aaaa", scores=[0.1, 1.0, 2.0])], 2)
+    assert packed.items["ev"] == ["cccc", "bbbb"]
+
+    ordered = pack_context([Section("ev", items, keep_order=True, scores=[0.1, 1.0, 2.0])], 2)
+    assert ordered.items["ev"] == ["bbbb", "cccc"]
+    assert ordered.dropped_tokens["ev"] == 1
+
+
+def test_split_pages_keeps_markers():
+    text = "--- Page 1 ---\none\n\n--- Page 3 ---\nthree"
+    assert split_pages(text) == ["--- Page 1 ---\none", "--- Page 3 ---\nthree"]
+    assert split_pages("plain") == ["plain"]
+    assert split_pages("") == []
+
+
+@pytest.mark.asyncio
+async def test_observe_node_records_dropped_tokens(mock_ollama, monkeypatch):
+    monkeypatch.setattr("research_agent.graph.nodes.settings.llm_context_budgets", {"observe": 300})
+    state = AgentState(
+        question="q", plan=["1. step"], pending_tool="web_search", last_tool_result="x " * 4000
+    )
+    result = await observe_node(state)
+    dropped = result["metrics"].llm_calls[0].context_dropped_tokens["tool_output"]
+    assert dropped > 1000
+    assert result["metrics"].summary()["context_dropped_tokens"]["observe.tool_output"] == dropped
@@ -0,0 +1,59 @@
+"""Tests for wall-clock deadlines."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from research_agent.util.deadline import Deadline, DeadlineExceededError
+
+
+@pytest.mark.asyncio
+async def test_run_returns_result_before_deadline():
+    async def work() -> str:
+        return "done"
+
+    deadline = Deadline(time.time() + 5)
+    assert await deadline.run(work()) == "done"
+    assert not deadline.expired
+    assert 4 < deadline.remaining() <= 5
+
+
+@pytest.mark.asyncio
+async def test_run_cancels_work_at_deadline():
+    cancelled = False
+
+    async def slow() -> None:
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    start = time.perf_counter()
+    with pytest.raises(DeadlineExceededError):
+        await Deadline(time.time() + 0.05).run(slow())
+    assert cancelled
+    assert time.perf_counter() - start < 1
+
+
+@pytest.mark.asyncio
+async def test_expired_deadline_cancels_at_first_suspension():
+    deadline = Deadline(time.time() - 1)
+    assert deadline.expired
+    assert deadline.remaining() == 0.0
+    with pytest.raises(DeadlineExceededError):
+        await deadline.run(asyncio.sleep(1))
+
+
+@pytest.mark.asyncio
+async def test_timeouts_raised_by_the_work_itself_propagate_unchanged():
+    async def times_out() -> None:
+        raise TimeoutError("http timeout")
+
+    with pytest.raises(TimeoutError, match="http timeout") as info:
+        await Deadline(time.time() + 5).run(times_out())
+    assert not isinstance(info.value, DeadlineExceededError)
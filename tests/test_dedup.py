@@ -0,0 +1,84 @@
+"""Tests for URL canonicalization and MinHash near-duplicate detection."""
+
+from __future__ import annotations
+
+import pytest
+
+from research_agent.util.dedup import (
+    NUM_BANDS,
+    FingerprintIndex,
+    canonical_url,
+    fingerprint,
+    minhash,
+    similarity,
+)
+
+ARTICLE = (
+    "Kubernetes horizontal pod autoscaling adjusts the number of replicas based on observed "
+    "CPU utilisation or custom metrics. Teams serving language models usually scale on queue "
+    "depth instead, because GPU utilisation reacts too late to bursts of long prompts. A "
+    "replica that loads a large model can take minutes to become ready, so most operators keep "
+    "a warm pool and scale the pool ahead of predicted demand rather than in response to it. "
+    "Requests are routed to the least loaded replica that already holds the model in memory, "
+    "and prompts that share a long prefix are sent to the same replica so its key-value cache "
+    "can be reused. Batching several requests into one forward pass raises throughput sharply "
+    "but adds queueing delay, which is why interactive traffic and offline jobs are usually "
+    "split into separate pools with different batch limits. Quantised weights cut memory use "
+    "and let a single card hold a bigger model or more concurrent sequences, at a small cost in "
+    "accuracy that has to be measured on the workload itself. Finally, every deployment needs "
+    "dashboards for time to first token, tokens per second, error rates and cost per request, "
+    "with alerts on regressions after each rollout."
+)
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://example.com/post",
+        "http://example.com/post",
+        "https://www.Example.com/post/",
+        "https://example.com:443/post#comments",
+        "https://example.com/post?utm_source=x&utm_medium=y",
+        "https://example.com//post?fbclid=abc",
+    ],
+)
+def test_canonical_url_folds_spellings(url):
+    assert canonical_url(url) == "https://example.com/post"
+
+
+def test_canonical_url_keeps_meaningful_parts():
+    assert canonical_url("https://example.com/search?q=b&page=2&utm_campaign=z") == (
+        "https://example.com/search?page=2&q=b"
+    )
+    assert canonical_url("https://example.com/a") != canonical_url("https://example.com/b")
+    assert canonical_url(" upload://report.pdf ") == "upload://report.pdf"
+    assert canonical_url("/docs/notes.md") == "/docs/notes.md"
+
+
+def test_minhash_estimates_overlap():
+    mirror = f"Republished from the platform blog. {ARTICLE} Subscribe for more posts."
+    snippet = ARTICLE[:300]
+    edited = snippet.replace("usually", "typically")
+    half = ARTICLE[: len(ARTICLE) // 2]  # a different page that shares half the text
+
+    assert minhash(ARTICLE) == minhash(ARTICLE)
+    assert similarity(minhash(ARTICLE), minhash(mirror)) >= 0.8
+    assert similarity(minhash(snippet), minhash(edited)) >= 0.8
+    assert similarity(minhash(ARTICLE), minhash(half)) < 0.8
+
+
+def test_minhash_skips_short_texts():
+    assert minhash("too short to fingerprint") is None
+
+
+def test_fingerprint_index_finds_near_duplicates():
+    index = FingerprintIndex(threshold=0.8)
+    index.add("https://a.com", fingerprint(ARTICLE))
+    snippet = ARTICLE[:300]
+    index.add("https://b.com", fingerprint(snippet))
+
+    assert len(fingerprint(ARTICLE)) == NUM_BANDS  # all that is kept in the state
+    assert len(index) == 2
+    assert index.find(fingerprint(f"Mirror: {ARTICLE}")) == "https://a.com"
+    assert index.find(fingerprint(snippet.replace("usually", "typically"))) == "https://b.com"
+    assert index.find(fingerprint(ARTICLE[: len(ARTICLE) // 2])) is None
@@ -51,6 +51,11 @@ async def test_full_graph_with_mock_ollama(mock_ollama: AsyncMock) -> None:
     assert state.metrics.total_llm_calls > 0
     assert len(state.metrics.node_timings) > 0
     assert state.metrics.total_prompt_tokens > 0
+    # The three planned steps are summarised by a single observe call.
+    assert state.metrics.observe_calls_saved == 2
+    # The plan lines name tool and query, so act never needs the LLM.
+    assert state.metrics.act_llm_calls_avoided == 3
+    assert len(state.notes) == 3
 
 
 def _make_mock_tool_cls(result: ToolResult):  # type: ignore[no-untyped-def]
@@ -64,3 +69,31 @@ def _make_mock_tool_cls(result: ToolResult):  # type: ignore[no-untyped-def]
             return result
 
     return MockTool
+
+
+@pytest.mark.asyncio
+async def test_graph_streams_report_deltas(mock_ollama: AsyncMock) -> None:
+    """write_report tokens are surfaced through LangGraph's custom stream mode."""
+    mock_tool_result = ToolResult(tool="web_search", success=True, data="data", evidence=[])
+
+    with patch(
+        "research_agent.graph.nodes.TOOL_REGISTRY",
+        {
+            "web_search": _make_mock_tool_cls(mock_tool_result),
+            "fetch_url": _make_mock_tool_cls(mock_tool_result),
+        },
+    ):
+        graph = build_graph()
+        initial = AgentState(question="q?", max_iters=3, timebox_minutes=1, run_id="t-2")
+        deltas: list[str] = []
+        report = ""
+        async for mode, chunk in graph.astream(
+            initial.model_dump(), stream_mode=["updates", "custom"]
+        ):
+            if mode == "custom" and chunk["type"] == "report_delta":
+                deltas.append(chunk["text"])
+            elif mode == "updates" and "write_report" in chunk:
+                report = chunk["write_report"]["report"]
+
+    assert len(deltas) > 1
+    assert "".join(deltas).strip() == report
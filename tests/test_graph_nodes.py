@@ -2,20 +2,35 @@
 
 from __future__ import annotations
 
+import asyncio
 import time
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from research_agent.graph.builder import _route_after_act
 from research_agent.graph.nodes import (
+    _compactions,
     act_node,
+    end_run,
+    observe_node,
     plan_node,
     reflect_node,
+    report_deadline,
+    research_deadline,
     write_report_node,
 )
-from research_agent.graph.state import AgentState
-from research_agent.llm.client import LLMResponse
+from research_agent.graph.state import (
+    AgentState,
+    PendingResult,
+    RunMetrics,
+    ToolCallMetric,
+    apply_update,
+)
+from research_agent.llm.client import LLMResponse, LLMStreamChunk
+from research_agent.report import render_report
 from research_agent.tools.base import EvidenceItem, ToolResult
+from research_agent.util.dedup import fingerprint
 
 
 def _make_llm_response(text: str) -> LLMResponse:
@@ -127,10 +142,239 @@ async def test_act_node_unknown_tool(mock_ollama):
     assert "fallback result" in result["last_tool_result"]
 
 
+def _parallel_tools(started: list[str], gate: asyncio.Event, expected: int):
+    class ParallelTool:
+        async def run(self, *, query, **kwargs):
+            started.append(query)
+            if len(started) == expected:
+                gate.set()
+            await asyncio.wait_for(gate.wait(), timeout=1)  # only passes if all run at once
+            await asyncio.sleep(0.01 if query == "q1" else 0)  # finish out of plan order
+            return ToolResult(
+                tool="web_search",
+                success=True,
+                data=f"data {query}",
+                evidence=[EvidenceItem.now(title=query, url=f"http://{query}")],
+            )
+
+    return ParallelTool
+
+
+@pytest.mark.asyncio
+async def test_act_node_runs_independent_steps_concurrently(mock_ollama):
+    started: list[str] = []
+    tool = _parallel_tools(started, asyncio.Event(), expected=2)
+    plan = ["1. [web_search] q1", "2. [web_search] q2", "3. [web_search] q3 (after 1)"]
+    with patch("research_agent.graph.nodes.TOOL_REGISTRY", {"web_search": tool}):
+        result = await act_node(_make_state(plan=plan))
+
+    assert sorted(started) == ["q1", "q2"]
+    assert result["current_step_index"] == 2
+    assert result["tool_calls_made"] == 2
+    # Merged in plan order although q2 finished first.
+    assert [p.query for p in result["pending_results"]] == ["q1", "q2"]
+    assert [e.title for e in result["evidence"]] == ["q1", "q2"]
+    assert list(result["bibliography"]) == ["https://q1", "https://q2"]  # canonical URLs
+    assert result["metrics"].summary()["parallel_tool_calls"] == 2
+
+
+@pytest.mark.asyncio
+async def test_act_node_runs_blocking_searches_concurrently(mock_ollama):
+    def _blocking_search(*args, **kwargs):
+        time.sleep(0.3)  # DDGS is synchronous
+        return []
+
+    plan = [f"{i}. [web_search] topic {i}" for i in range(1, 5)]
+    with patch("research_agent.tools.web_search.DDGS") as ddgs:
+        ddgs.return_value.text.side_effect = _blocking_search
+        start = time.perf_counter()
+        result = await act_node(_make_state(plan=plan, max_parallel_steps=4))
+
+    assert result["tool_calls_made"] == 4
+    assert time.perf_counter() - start < 0.9  # 1.2 s if the searches ran one by one
+
+
+@pytest.mark.asyncio
+async def test_act_node_wave_capped_by_tool_call_limit(mock_ollama):
+    plan = ["1. [web_search] a", "2. [web_search] b", "3. [web_search] c"]
+
+    class MockTool:
+        async def run(self, *, query, **kwargs):
+            return ToolResult(tool="web_search", success=True, data=query)
+
+    with patch("research_agent.graph.nodes.TOOL_REGISTRY", {"web_search": MockTool}):
+        result = await act_node(_make_state(plan=plan, tool_calls_made=29, tool_call_limit=30))
+        assert result["current_step_index"] == 1
+        result = await act_node(_make_state(plan=plan, max_parallel_steps=2))
+        assert result["current_step_index"] == 2
+
+
+@pytest.mark.asyncio
+async def test_act_node_cancels_steps_past_the_timebox(mock_ollama):
+    class SlowTool:
+        async def run(self, *, query, **kwargs):
+            await asyncio.sleep(10)
+
+    plan = ["1. [web_search] a", "2. [web_search] b"]
+    state = _make_state(plan=plan, start_time=time.time() - 60, timebox_minutes=1)
+    with patch("research_agent.graph.nodes.TOOL_REGISTRY", {"web_search": SlowTool}):
+        result = await act_node(state)
+
+    assert result["status"] == "reflecting"
+    assert result["pending_results"] == []
+    assert result["tool_calls_made"] == 0
+    assert result["current_step_index"] == 2
+
+
+@pytest.mark.asyncio
+async def test_act_node_deadline_cuts_off_a_blocking_search(mock_ollama):
+    def _blocking_search(*args, **kwargs):
+        time.sleep(1)  # DDGS is synchronous
+        return []
+
+    state = _make_state(
+        plan=["1. [web_search] slow"],
+        start_time=time.time() - 45 + 0.2,  # research share of a 1-minute timebox ends in 0.2 s
+        timebox_minutes=1,
+    )
+    with patch("research_agent.tools.web_search.DDGS") as ddgs:
+        ddgs.return_value.text.side_effect = _blocking_search
+        start = time.perf_counter()
+        result = await act_node(state)
+
+    assert time.perf_counter() - start < 0.6
+    assert result["tool_calls_made"] == 0
+    assert result["metrics"].node_timings[0].deadline_exceeded is True
+
+
+@pytest.mark.asyncio
+async def test_act_node_dispatches_well_formed_steps_without_llm(mock_ollama):
+    mock_ollama.generate = AsyncMock(
+        return_value=_make_llm_response('{"tool": "fetch_url", "query": "http://found"}')
+    )
+    queries: list[str] = []
+
+    class MockTool:
+        async def run(self, *, query, **kwargs):
+            queries.append(query)
+            return ToolResult(tool="t", success=True, data=query)
+
+    plan = [
+        "1. [web_search] kubernetes autoscaling",
+        "2. [fetch_url] the best page from step 1 (after 1)",
+    ]
+    registry = {"web_search": MockTool, "fetch_url": MockTool}
+    with patch("research_agent.graph.nodes.TOOL_REGISTRY", registry):
+        state = _make_state(plan=plan)
+        result = await act_node(state)
+        assert queries == ["kubernetes autoscaling"]
+        assert result["metrics"].total_llm_calls == 0
+
+        values = state.model_dump()
+        apply_update(values, {**result, "pending_results": []})
+        result = await act_node(AgentState.model_validate(values))
+        apply_update(values, result)
+
+    assert queries[-1] == "http://found"
+    metrics = values["metrics"]
+    assert [c.resolved_by for c in metrics.tool_calls] == ["plan", "llm"]
+    assert metrics.total_llm_calls == 1
+    assert metrics.summary()["act_llm_calls_avoided"] == 1
+
+
+def test_act_reply_complete_detects_both_formats():
+    from research_agent.graph.nodes import _act_reply_complete
+
+    assert not _act_reply_complete("TOOL: web_search\nQUERY: partial")
+    assert _act_reply_complete("TOOL: web_search\nQUERY: done\n")
+    assert not _act_reply_complete('{"tool": "web_search", "query": "q')
+    assert _act_reply_complete('{"tool": "web_search", "query": "q"}')
+
+
+def test_route_after_act_defers_observe_until_batch_is_full():
+    plan = ["1. a", "2. b", "3. c"]
+    one = [PendingResult(tool="web_search", output="x")]
+    state = _make_state(plan=plan, current_step_index=1, pending_results=one)
+    assert _route_after_act(state) == "act"
+    with patch("research_agent.graph.builder.settings.observe_batch_size", 1):
+        assert _route_after_act(state) == "observe"
+    assert _route_after_act(state.model_copy(update={"current_step_index": 3})) == "observe"
+    assert _route_after_act(state.model_copy(update={"tool_calls_made": 30})) == "observe"
+
+
+@pytest.mark.asyncio
+async def test_route_after_act_observes_before_a_dependent_step(mock_ollama):
+    class MockTool:
+        async def run(self, *, query, **kwargs):
+            return ToolResult(tool="web_search", success=True, data=query)
+
+    plan = ["1. [web_search] a", "2. [fetch_url] the best page from step 1 (after 1)"]
+    state = _make_state(plan=plan)
+    with patch("research_agent.graph.nodes.TOOL_REGISTRY", {"web_search": MockTool}):
+        result = await act_node(state)
+    values = state.model_dump()
+    apply_update(values, result)
+
+    after_act = AgentState.model_validate(values)
+    assert after_act.pending_results[0].number == 1
+    assert _route_after_act(after_act) == "observe"  # step 2 needs step 1's notes
+    independent = after_act.model_copy(update={"plan": [plan[0], "2. [web_search] b"]})
+    assert _route_after_act(independent) == "act"
+
+
+# ---------------------------------------------------------------------------
+# observe_node
+# ---------------------------------------------------------------------------
+
+
+def _pending(n: int) -> list[PendingResult]:
+    return [
+        PendingResult(step=f"{i}. [web_search] q{i}", tool="web_search", output=f"output {i}")
+        for i in range(1, n + 1)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_observe_node_batches_pending_results(mock_ollama):
+    state = _make_state(plan=["1. a", "2. b", "3. c"], notes=["old"], pending_results=_pending(3))
+    result = await observe_node(state)
+
+    # Only the new notes; the graph appends them to the existing ones.
+    assert [n.split(":")[0] for n in result["notes"]] == [
+        "Key finding 1",
+        "Key finding 2",
+        "Key finding 3",
+    ]
+    assert result["pending_results"] == []
+    metrics = result["metrics"]
+    assert metrics.total_llm_calls == 1
+    assert metrics.llm_calls[0].batch_size == 3
+    assert metrics.summary()["observe_calls_saved"] == 2
+
+
+@pytest.mark.asyncio
+async def test_observe_node_observes_uncovered_results_individually(mock_ollama):
+    async def _generate(prompt, **kwargs):
+        if "### Result" in prompt:
+            return _make_llm_response('{"notes": [{"id": 2, "note": "second"}]}')
+        return _make_llm_response("single note")
+
+    mock_ollama.generate = _generate
+    result = await observe_node(_make_state(pending_results=_pending(3)))
+
+    assert result["notes"] == ["single note", "second", "single note"]
+    calls = result["metrics"].llm_calls
+    assert [c.batch_size for c in calls] == [1, 1, 1]
+    assert calls[0].parse_fallback is True
+    assert result["metrics"].observe_calls_saved == 0
+
+
 # ---------------------------------------------------------------------------
 # reflect_node
 # ---------------------------------------------------------------------------
 
+_REFLECT_STOP = '{"decision": "STOP", "confidence": 0.8, "reason": "Sufficient evidence."}'
+
 
 @pytest.mark.asyncio
 async def test_reflect_node_timebox_exceeded(mock_ollama):
@@ -205,7 +449,7 @@ async def test_reflect_node_continue_with_new_steps(mock_ollama):
         result = await reflect_node(state)
 
     assert result["status"] == "acting"
-    assert len(result["plan"]) == 4  # 2 original + 2 new
+    assert len(result["plan"]) == 2  # new steps, appended by the graph
 
 
 @pytest.mark.asyncio
@@ -229,6 +473,133 @@ async def test_reflect_node_stop_with_bad_confidence(mock_ollama):
     assert result["confidence"] == 0.7  # fallback default
 
 
+@pytest.mark.asyncio
+async def test_reflect_node_structured_continue(mock_ollama):
+    mock_ollama.generate = AsyncMock(
+        return_value=_make_llm_response(
+            '{"decision": "CONTINUE", "reason": "gaps", "new_steps": ["3. [web_search] more"]}'
+        )
+    )
+    import research_agent.llm.adapter as adapter_mod
+    from research_agent.llm.adapter import LLMAdapter
+
+    adapter = LLMAdapter(client=mock_ollama)
+    with patch.object(adapter_mod, "_instance", adapter):
+        state = _make_state(plan=["1. a", "2. b"], current_step_index=2, iteration=1)
+        result = await reflect_node(state)
+
+    assert "format" in mock_ollama.generate.await_args.kwargs
+    assert result["plan"][-1] == "3. [web_search] more"
+    assert result["metrics"].llm_calls[0].parse_fallback is False
+
+
+@pytest.mark.asyncio
+async def test_reflect_node_first_reflection_asks_llm(mock_ollama):
+    mock_ollama.generate = AsyncMock(return_value=_make_llm_response(_REFLECT_STOP))
+    state = _make_state(
+        plan=["1. a"],
+        current_step_index=1,
+        iteration=1,
+        evidence=[EvidenceItem(title="A", url="https://a.com", snippet="known facts here")],
+    )
+    result = await reflect_node(state)
+
+    assert mock_ollama.generate.await_count == 1
+    assert result["should_stop"] is True
+    assert result["stop_reason"] == "Sufficient evidence."
+    assert result["evidence_reflected"] == 1
+    assert result["metrics"].reflections[0].used_llm is True
+
+
+@pytest.mark.asyncio
+async def test_reflect_node_low_novelty_stops_without_llm(mock_ollama):
+    mock_ollama.generate = AsyncMock(return_value=_make_llm_response(_REFLECT_STOP))
+    known = EvidenceItem(title="A", url="https://a.com", snippet="autoscaling scales pods on cpu")
+    mirror = EvidenceItem(title="B", url="https://b.com", snippet="Autoscaling scales pods on CPU.")
+    state = _make_state(
+        plan=["1. a", "2. b"],
+        current_step_index=2,
+        iteration=2,
+        evidence=[known, known, mirror],
+        evidence_reflected=1,
+    )
+    result = await reflect_node(state)
+
+    mock_ollama.generate.assert_not_awaited()
+    assert result["should_stop"] is True
+    assert result["stop_reason"].startswith("evidence novelty 0.00")
+    assert result["evidence_reflected"] == 3
+    reflection = result["metrics"].reflections[0]
+    assert (reflection.decision, reflection.used_llm) == ("STOP", False)
+    assert result["metrics"].reflect_llm_calls_skipped == 1
+    assert result["metrics"].summary()["reflect_llm_calls_skipped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_reflect_node_novel_evidence_asks_llm(mock_ollama):
+    mock_ollama.generate = AsyncMock(return_value=_make_llm_response(_REFLECT_STOP))
+    state = _make_state(
+        plan=["1. a", "2. b"],
+        current_step_index=2,
+        iteration=2,
+        evidence=[
+            EvidenceItem(title="A", url="https://a.com", snippet="autoscaling scales pods"),
+            EvidenceItem(title="B", url="https://b.com", snippet="karpenter provisions nodes"),
+        ],
+        evidence_reflected=1,
+    )
+    with patch("research_agent.graph.nodes.settings.reflect_novelty_threshold", 0.2):
+        result = await reflect_node(state)
+
+    assert mock_ollama.generate.await_count == 1
+    assert result["metrics"].reflections[0].novelty == 1.0
+
+
+@pytest.mark.asyncio
+async def test_reflect_node_novelty_gate_disabled(mock_ollama):
+    mock_ollama.generate = AsyncMock(return_value=_make_llm_response(_REFLECT_STOP))
+    state = _make_state(
+        plan=["1. a"], current_step_index=1, iteration=2, evidence_reflected=0
+    )  # nothing new since the last reflection
+    with patch("research_agent.graph.nodes.settings.reflect_novelty_threshold", 0.0):
+        await reflect_node(state)
+    assert mock_ollama.generate.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_reflect_node_forced_stop_records_reason(mock_ollama):
+    state = _make_state(iteration=6, max_iters=6, plan=["1. a"], current_step_index=1)
+    result = await reflect_node(state)
+    assert result["stop_reason"] == "max iterations reached"
+
+
+@pytest.mark.asyncio
+async def test_act_node_structured_output_and_fallback_metric(mock_ollama):
+    class MockTool:
+        async def run(self, *, query, **kwargs):
+            return ToolResult(tool="fetch_url", success=True, data=query)
+
+    with (
+        patch("research_agent.graph.nodes.TOOL_REGISTRY", {"fetch_url": MockTool}),
+        patch("research_agent.graph.nodes.settings.act_fast_path", False),
+    ):
+        mock_ollama.generate = AsyncMock(
+            return_value=_make_llm_response('{"tool": "fetch_url", "query": "http://x"}')
+        )
+        result = await act_node(_make_state(plan=["1. [fetch_url] http://x"]))
+        assert result["pending_tool"] == "fetch_url"
+        assert result["metrics"].llm_calls[0].parse_fallback is False
+
+        mock_ollama.generate = AsyncMock(
+            return_value=_make_llm_response("TOOL: fetch_url\nQUERY: http://y")
+        )
+        result = await act_node(_make_state(plan=["1. [fetch_url] http://y"]))
+
+    assert result["pending_tool_query"] == "http://y"
+    assert result["metrics"].parse_fallbacks == 1
+    assert result["metrics"].summary()["parse_fallbacks"] == 1
+
+
 # ---------------------------------------------------------------------------
 # write_report_node
 # ---------------------------------------------------------------------------
@@ -263,3 +634,414 @@ async def test_write_report_node_dedup_bibliography(mock_ollama):
     )
     result = await write_report_node(state)
     assert result["status"] == "done"
+
+
+@pytest.mark.asyncio
+async def test_write_report_node_records_ttft(mock_ollama):
+    mock_ollama.generate = AsyncMock(
+        return_value=LLMResponse(text="## Summary\nStreamed.\n", eval_count=5, ttft_ms=12.5)
+    )
+    state = _make_state(notes=["note"])
+    result = await write_report_node(state)
+
+    assert result["report"] == "## Summary\nStreamed."
+    metric = result["metrics"].llm_calls[-1]
+    assert metric.node == "write_report"
+    assert metric.ttft_ms == 12.5
+
+
+# ---------------------------------------------------------------------------
+# Deadlines
+# ---------------------------------------------------------------------------
+
+
+def test_research_deadline_holds_back_the_report_share():
+    state = _make_state(start_time=1_000.0, timebox_minutes=4)
+    with patch("research_agent.graph.nodes.settings.report_reserve_fraction", 0.25):
+        assert research_deadline(state).at == 1_000.0 + 180
+        assert report_deadline(state).at >= 1_000.0 + 240
+
+
+def test_report_deadline_keeps_its_share_after_an_overrun():
+    state = _make_state(start_time=time.time() - 3600, timebox_minutes=4)
+    with patch("research_agent.graph.nodes.settings.report_reserve_fraction", 0.25):
+        assert 59 < report_deadline(state).remaining() <= 60
+
+
+@pytest.mark.asyncio
+async def test_reflect_node_stops_once_the_research_share_is_used(mock_ollama):
+    state = _make_state(
+        start_time=time.time() - 4 * 60, timebox_minutes=5, plan=["1. a", "2. b"]
+    )  # 80% of the timebox gone, steps left
+    with patch("research_agent.graph.nodes.settings.report_reserve_fraction", 0.25):
+        result = await reflect_node(state)
+
+    assert result["should_stop"] is True
+    assert result["stop_reason"] == "timebox exceeded"
+    assert result["metrics"].node_timings[0].budget_ms == 0.0
+
+
+@pytest.mark.asyncio
+async def test_observe_node_cancels_summaries_at_the_deadline(mock_ollama):
+    async def _slow(prompt, **kwargs):
+        await asyncio.sleep(10)
+
+    mock_ollama.generate = _slow
+    state = _make_state(
+        start_time=time.time() - 45 + 0.1,  # research share of a 1-minute timebox ends in 0.1 s
+        timebox_minutes=1,
+        pending_results=[PendingResult(step="1. a", tool="web_search", output="out")],
+    )
+    start = time.perf_counter()
+    with patch("research_agent.graph.nodes.settings.report_reserve_fraction", 0.25):
+        result = await observe_node(state)
+
+    assert time.perf_counter() - start < 2
+    assert result["notes"] == []
+    assert result["pending_results"] == []
+    timing = result["metrics"].node_timings[0]
+    assert timing.deadline_exceeded is True
+    assert 0 < timing.budget_ms <= 100
+    assert result["metrics"].summary()["deadline_exceeded_nodes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_write_report_node_keeps_partial_report_at_deadline(mock_ollama):
+    async def _stalls(prompt, **kwargs):
+        yield LLMStreamChunk(text="## Summary\nPartial")
+        await asyncio.sleep(10)
+
+    mock_ollama.generate_stream = _stalls
+    state = _make_state(start_time=time.time() - 120, timebox_minutes=1)
+    with patch("research_agent.graph.nodes.settings.report_reserve_fraction", 0.002):
+        result = await write_report_node(state)  # reserved share: 0.12 s
+
+    assert result["status"] == "done"
+    assert result["report"].startswith("## Summary\nPartial")
+    assert "truncated" in result["report"]
+    assert result["metrics"].node_timings[0].deadline_exceeded is True
+
+
+# ---------------------------------------------------------------------------
+# Note compaction
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_act_node_compacts_older_notes_while_tools_run(mock_ollama):
+    compact_started = asyncio.Event()
+    prompts: list[str] = []
+
+    async def _generate(prompt, **kwargs):
+        prompts.append(prompt)
+        compact_started.set()
+        return _make_llm_response("- digest of the early findings")
+
+    class WaitsForCompaction:
+        async def run(self, *, query, **kwargs):
+            await asyncio.wait_for(compact_started.wait(), 1)  # fails if run one after the other
+            await asyncio.sleep(0.05)  # let the merge finish first
+            return ToolResult(tool="web_search", success=True, data="out")
+
+    mock_ollama.generate = _generate
+    notes = [f"note {i} " + "word " * 100 for i in range(10)]  # ~130 tokens each
+    state = _make_state(plan=["1. [web_search] a"], notes=notes)
+    with (
+        patch("research_agent.graph.nodes.TOOL_REGISTRY", {"web_search": WaitsForCompaction}),
+        patch("research_agent.graph.nodes.settings.notes_compaction_tokens", 1000),
+    ):
+        result = await act_node(state)
+
+    assert result["tool_calls_made"] == 1
+    assert result["notes_digest"] == "- digest of the early findings"
+    assert result["notes_compacted"] == 6  # the newest four are kept
+    assert "note 5 " in prompts[0] and "note 6 " not in prompts[0]
+    assert [c.node for c in result["metrics"].llm_calls] == ["compact"]
+
+
+@pytest.mark.asyncio
+async def test_act_node_does_not_wait_for_a_slow_compaction(mock_ollama):
+    release = asyncio.Event()
+
+    async def _generate(prompt, **kwargs):
+        await release.wait()
+        return _make_llm_response("- digest")
+
+    class MockTool:
+        async def run(self, *, query, **kwargs):
+            return ToolResult(tool="web_search", success=True, data="out")
+
+    mock_ollama.generate = _generate
+    notes = [f"note {i} " + "word " * 100 for i in range(10)]
+    plan = ["1. [web_search] a", "2. [web_search] b", "3. [web_search] c"]
+    state = _make_state(plan=plan, notes=notes, run_id="slow-compaction", max_parallel_steps=1)
+    with (
+        patch("research_agent.graph.nodes.TOOL_REGISTRY", {"web_search": MockTool}),
+        patch("research_agent.graph.nodes.settings.notes_compaction_tokens", 1000),
+    ):
+        result = await asyncio.wait_for(act_node(state), 0.5)
+        assert "notes_digest" not in result  # still merging
+        assert result["metrics"].llm_calls == []
+
+        release.set()
+        await asyncio.sleep(0.05)
+        result = await act_node(state.model_copy(update={"current_step_index": 1}))
+
+    assert result["notes_digest"] == "- digest"
+    assert result["notes_compacted"] == 6
+    assert [c.node for c in result["metrics"].llm_calls] == ["compact"]
+
+
+@pytest.mark.asyncio
+async def test_end_run_cancels_a_pending_compaction(mock_ollama):
+    started, cancelled = asyncio.Event(), asyncio.Event()
+
+    async def _generate(prompt, **kwargs):
+        started.set()
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    class MockTool:
+        async def run(self, *, query, **kwargs):
+            return ToolResult(tool="web_search", success=True, data="out")
+
+    mock_ollama.generate = _generate
+    notes = [f"note {i} " + "word " * 100 for i in range(10)]
+    state = _make_state(plan=["1. [web_search] a"], notes=notes, run_id="ended-run")
+    with (
+        patch("research_agent.graph.nodes.TOOL_REGISTRY", {"web_search": MockTool}),
+        patch("research_agent.graph.nodes.settings.notes_compaction_tokens", 1000),
+    ):
+        await act_node(state)
+        await asyncio.wait_for(started.wait(), 0.5)
+    assert "ended-run" in _compactions
+
+    end_run("ended-run")
+    await asyncio.sleep(0.05)
+
+    assert "ended-run" not in _compactions
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_act_node_skips_compaction_below_threshold(mock_ollama):
+    class MockTool:
+        async def run(self, *, query, **kwargs):
+            return ToolResult(tool="web_search", success=True, data="out")
+
+    state = _make_state(plan=["1. [web_search] a"], notes=["short"] * 10)
+    with patch("research_agent.graph.nodes.TOOL_REGISTRY", {"web_search": MockTool}):
+        result = await act_node(state)
+
+    assert "notes_digest" not in result
+    assert result["metrics"].llm_calls == []
+
+
+@pytest.mark.asyncio
+async def test_write_report_node_uses_digest_for_compacted_notes(mock_ollama):
+    prompts: list[str] = []
+
+    async def _generate(prompt, **kwargs):
+        prompts.append(prompt)
+        return _make_llm_response("## Summary\nDone.")
+
+    mock_ollama.generate = _generate
+    state = _make_state(
+        notes=["old finding A", "old finding B", "recent finding C"],
+        notes_digest="- A and B, merged",
+        notes_compacted=2,
+    )
+    await write_report_node(state)
+
+    assert "- A and B, merged" in prompts[0]
+    assert "recent finding C" in prompts[0]
+    assert "old finding A" not in prompts[0]
+
+
+@pytest.mark.asyncio
+async def test_write_report_node_offers_top_ranked_evidence_with_stable_numbers(mock_ollama):
+    prompts: list[str] = []
+
+    async def _generate(prompt, **kwargs):
+        prompts.append(prompt)
+        return _make_llm_response("## Summary\nDone.")
+
+    mock_ollama.generate = _generate
+    filler = {
+        f"https://f.com/{i}": EvidenceItem(
+            title=f"Recipe {i}", url=f"https://f.com/{i}", snippet="pasta sauce"
+        )
+        for i in range(5)
+    }
+    state = _make_state(
+        question="How to deploy LLMs?",
+        plan=["1. [web_search] vllm paged attention throughput"],
+        notes=["Continuous batching raises GPU utilisation."],
+        bibliography={
+            **filler,
+            "https://v.com": EvidenceItem(
+                title="vLLM", url="https://v.com", snippet="Paged attention boosts throughput."
+            ),
+            "https://b.com": EvidenceItem(
+                title="Batching", url="https://b.com", snippet="Continuous batching for GPUs."
+            ),
+        },
+    )
+    with patch("research_agent.graph.nodes.settings.report_evidence_top_k", 2):
+        await write_report_node(state)
+
+    assert "[6] vLLM" in prompts[0]
+    assert "[7] Batching" in prompts[0]
+    assert "Recipe" not in prompts[0]
+    # The rendered Sources list numbers the bibliography the same way.
+    rendered = render_report(state.model_copy(update={"report": "## Summary\nDone."}))
+    assert "6. [vLLM](https://v.com)" in rendered
+
+
+# ---------------------------------------------------------------------------
+# Sectioned report
+# ---------------------------------------------------------------------------
+
+
+def _section_generator(started: list[str], diagram: str = "```mermaid\ngraph TD\n  A-->B\n```"):
+    all_started = asyncio.Event()
+
+    async def _generate(prompt, **kwargs):
+        if "Write only this section" not in prompt:
+            return _make_llm_response("# Deploying LLMs\n\nThis report covers deployment.")
+        heading = prompt.split("starting with its heading:\n## ", 1)[1].splitlines()[0]
+        started.append(heading)
+        if len(started) == 4:
+            all_started.set()
+        await asyncio.wait_for(all_started.wait(), 1)  # fails unless drafted concurrently
+        body = diagram if heading == "Architecture Diagram" else f"{heading} text [1]."
+        return _make_llm_response(f"## {heading}\n\n{body}")
+
+    return _generate
+
+
+@pytest.mark.asyncio
+async def test_write_report_node_drafts_sections_in_parallel(mock_ollama):
+    started: list[str] = []
+    mock_ollama.generate = _section_generator(started)
+    state = _make_state(notes=["note"])
+    with patch("research_agent.graph.nodes.settings.report_mode", "sections"):
+        result = await write_report_node(state)
+
+    report = result["report"]
+    assert sorted(started) == ["Architecture Diagram", "Key Findings", "Recommendations", "Summary"]
+    assert report.startswith("# Deploying LLMs\n\nThis report covers deployment.")
+    positions = [report.index(f"## {h}") for h in ("Summary", "Key Findings", "Recommendations")]
+    assert positions == sorted(positions)
+    assert "```mermaid" in report
+    assert len(result["metrics"].llm_calls) == 5
+
+
+@pytest.mark.asyncio
+async def test_sectioned_report_without_diagram_gets_rendered_placeholder(mock_ollama):
+    mock_ollama.generate = _section_generator([], diagram="No diagram, sorry.")
+    ev = EvidenceItem(title="Guide", url="https://example.com/guide")
+    state = _make_state(bibliography={ev.url: ev})
+    with patch("research_agent.graph.nodes.settings.report_mode", "sections"):
+        result = await write_report_node(state)
+
+    assert "Architecture Diagram" not in result["report"]
+    rendered = render_report(state.model_copy(update={"report": result["report"]}))
+    assert rendered.count("## Architecture Diagram") == 1
+    assert "```mermaid" in rendered
+    assert "1. [Guide](https://example.com/guide)" in rendered
+
+
+# ---------------------------------------------------------------------------
+# Duplicate evidence
+# ---------------------------------------------------------------------------
+
+_PAGE = (
+    "Serving language models in production means planning capacity around GPU memory, "
+    "batching requests to keep the accelerators busy, caching shared prompt prefixes, and "
+    "watching time to first token as closely as overall throughput and cost per request."
+)
+
+
+def _search_tool(evidence: list[EvidenceItem]):
+    class SearchTool:
+        async def run(self, *, query, **kwargs):
+            return ToolResult(tool="web_search", success=True, data=query, evidence=evidence)
+
+    return SearchTool
+
+
+@pytest.mark.asyncio
+async def test_act_node_drops_url_variants_and_mirrored_copies(mock_ollama):
+    known = EvidenceItem(title="Guide", url="https://example.com/guide", snippet=_PAGE)
+    evidence = [
+        EvidenceItem(title="Guide", url="http://www.example.com/guide/?utm_source=feed"),
+        EvidenceItem(title="Mirror", url="https://mirror.net/copy", snippet=f"Copy: {_PAGE}"),
+        EvidenceItem(title="Other", url="https://other.org/post", snippet="A different page."),
+    ]
+    state = _make_state(
+        plan=["1. [web_search] serving"],
+        evidence=[known],
+        bibliography={"https://example.com/guide": known},
+        fingerprints={"https://example.com/guide": fingerprint(_PAGE)},
+    )
+    with patch("research_agent.graph.nodes.TOOL_REGISTRY", {"web_search": _search_tool(evidence)}):
+        result = await act_node(state)
+
+    assert [e.title for e in result["evidence"]] == ["Other"]
+    assert list(result["bibliography"]) == ["https://other.org/post"]
+    assert result["fingerprints"] == {}  # too short to fingerprint
+    assert result["metrics"].summary()["duplicate_evidence_dropped"] == 2
+
+
+@pytest.mark.asyncio
+async def test_act_node_near_duplicate_detection_can_be_disabled(mock_ollama):
+    known = EvidenceItem(title="Guide", url="https://example.com/guide", snippet=_PAGE)
+    mirror = EvidenceItem(title="Mirror", url="https://mirror.net/copy", snippet=_PAGE)
+    state = _make_state(
+        plan=["1. [web_search] serving"],
+        bibliography={"https://example.com/guide": known},
+        fingerprints={"https://example.com/guide": fingerprint(_PAGE)},
+    )
+    with (
+        patch("research_agent.graph.nodes.TOOL_REGISTRY", {"web_search": _search_tool([mirror])}),
+        patch("research_agent.graph.nodes.settings.evidence_near_duplicates", False),
+    ):
+        result = await act_node(state)
+
+    assert list(result["bibliography"]) == ["https://mirror.net/copy"]
+
+
+@pytest.mark.asyncio
+async def test_act_node_skips_fetching_a_page_twice(mock_ollama):
+    fetched: list[str] = []
+
+    class FetchTool:
+        async def run(self, *, query, **kwargs):
+            fetched.append(query)
+            return ToolResult(tool="fetch_url", success=True, data="page")
+
+    earlier = RunMetrics(
+        tool_calls=[ToolCallMetric(tool_name="fetch_url", query="http://a.com/x/")]
+    )
+    state = _make_state(
+        plan=["1. [fetch_url] https://a.com/x?utm_source=feed", "2. [fetch_url] https://b.com"],
+        metrics=earlier,
+        tool_calls_made=1,
+    )
+    with patch("research_agent.graph.nodes.TOOL_REGISTRY", {"fetch_url": FetchTool}):
+        result = await act_node(state)
+
+    assert fetched == ["https://b.com"]
+    assert result["tool_calls_made"] == 2  # the skipped fetch doesn't count
+    # Nothing is queued for observe, so no LLM call or note is spent on the duplicate.
+    assert [p.query for p in result["pending_results"]] == ["https://b.com"]
+    assert result["metrics"].summary()["duplicate_fetches_skipped"] == 1
+
+    with patch("research_agent.graph.nodes.TOOL_REGISTRY", {"fetch_url": FetchTool}):
+        result = await act_node(state.model_copy(update={"plan": state.plan[:1]}))
+    assert result["pending_results"] == []
+    assert result["status"] == "reflecting"  # straight past observe
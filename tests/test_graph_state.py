@@ -0,0 +1,55 @@
+"""Tests for the reducer-backed AgentState channels."""
+
+from __future__ import annotations
+
+from research_agent.graph.state import (
+    AgentState,
+    LLMCallMetric,
+    RunMetrics,
+    apply_update,
+    merge_bibliography,
+    merge_metrics,
+)
+from research_agent.tools.base import EvidenceItem
+
+
+def _ev(url: str, title: str = "t") -> EvidenceItem:
+    return EvidenceItem(title=title, url=url)
+
+
+def test_merge_bibliography_keeps_existing_entries():
+    left = {"a": _ev("a", "first")}
+    merged = merge_bibliography(left, {"a": _ev("a", "second"), "b": _ev("b")})
+    assert merged["a"].title == "first"
+    assert list(merged) == ["a", "b"]
+    assert left == {"a": _ev("a", "first")}  # not mutated
+    assert merge_bibliography(merged, {"a": _ev("a", "third")}) is merged  # nothing new
+
+
+def test_merge_metrics_appends_and_accepts_dicts():
+    left = RunMetrics(llm_calls=[LLMCallMetric(node="plan")]).model_dump()
+    merged = merge_metrics(left, RunMetrics(llm_calls=[LLMCallMetric(node="act")]))
+    assert [c.node for c in merged.llm_calls] == ["plan", "act"]
+    assert merge_metrics(merged, None) is merged
+    # Lists the update doesn't extend are shared, not copied.
+    again = merge_metrics(merged, RunMetrics(llm_calls=[LLMCallMetric(node="observe")]))
+    assert again.tool_calls is merged.tool_calls
+    assert len(merged.llm_calls) == 2  # not mutated
+
+
+def test_apply_update_appends_list_fields_and_replaces_the_rest():
+    state = AgentState(plan=["1. a"], notes=["n1"], iteration=1).model_dump()
+    apply_update(
+        state,
+        {
+            "plan": ["2. b"],
+            "notes": ["n2"],
+            "iteration": 2,
+            "metrics": RunMetrics(llm_calls=[LLMCallMetric(node="reflect")]),
+        },
+    )
+    result = AgentState.model_validate(state)
+    assert result.plan == ["1. a", "2. b"]
+    assert result.notes == ["n1", "n2"]
+    assert result.iteration == 2
+    assert result.metrics.total_llm_calls == 1
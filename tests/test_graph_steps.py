@@ -0,0 +1,63 @@
+"""Tests for plan-step dependency parsing and wave selection."""
+
+from __future__ import annotations
+
+from research_agent.graph.steps import (
+    next_wave,
+    parse_tool_call,
+    step_dependencies,
+    step_number,
+    strip_dependencies,
+)
+
+PLAN = [
+    "1. [web_search] a",
+    "2. [web_search] b",
+    "3. [fetch_url] top result of step 1 (after 1)",
+    "4. [web_search] c",
+    "5. [python_sandbox] compare (after 3, 4)",
+]
+
+
+def test_step_dependencies_and_number():
+    assert step_dependencies(PLAN[0]) == set()
+    assert step_dependencies(PLAN[4]) == {3, 4}
+    assert step_dependencies("6. [web_search] x (After steps 2 and 5)") == {2, 5}
+    assert step_number(PLAN[2], 0) == 3
+    assert step_number("[web_search] unnumbered", 6) == 7
+
+
+def test_strip_dependencies():
+    assert strip_dependencies(PLAN[2]) == "3. [fetch_url] top result of step 1"
+    assert strip_dependencies(PLAN[0]) == PLAN[0]
+
+
+def test_next_wave_stops_at_dependency_within_wave():
+    assert next_wave(PLAN, 0, 10) == [0, 1]
+    # Step 1 has finished, so step 3 can run with step 4; step 5 needs both.
+    assert next_wave(PLAN, 2, 10) == [2, 3]
+    assert next_wave(PLAN, 4, 10) == [4]
+
+
+def test_next_wave_respects_limit():
+    assert next_wave(PLAN, 0, 1) == [0]
+    assert next_wave(PLAN, 0, 0) == [0]
+    assert next_wave(PLAN, 5, 4) == []
+
+
+def test_parse_tool_call_accepts_only_unambiguous_lines():
+    assert parse_tool_call("2. [web_search] kubernetes autoscaling") == (
+        "web_search",
+        "kubernetes autoscaling",
+    )
+    assert parse_tool_call('1) [Local_Docs] "gpu sizing"') == ("local_docs", "gpu sizing")
+    assert parse_tool_call("3. [fetch_url] https://example.com/a") == (
+        "fetch_url",
+        "https://example.com/a",
+    )
+    assert parse_tool_call("3. [fetch_url] the vendor docs") is None
+    assert parse_tool_call("4. [python_sandbox] compute the ratio") is None
+    assert parse_tool_call(PLAN[2]) is None
+    assert parse_tool_call("Search the web for autoscaling") is None
+    assert parse_tool_call("5. [web_search] ") is None
+    assert parse_tool_call("6. [web_search] " + "x" * 401) is None
@@ -0,0 +1,202 @@
+"""Tests for LLMAdapter per-node model routing and structured output."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from research_agent.graph.schemas import ActDecision
+from research_agent.graph.state import LLMCallMetric, RunMetrics
+from research_agent.llm.adapter import LLMAdapter, json_object_complete, parse_structured
+from research_agent.llm.client import LLMResponse, LLMStreamChunk, OllamaClient
+from research_agent.llm.profiles import NODE_PROFILES
+from research_agent.util.deadline import Deadline, DeadlineExceededError
+
+ROUTES = {"act": "gemma3:4b", "observe": "gemma3:4b"}
+
+
+@pytest.mark.asyncio
+async def test_query_routes_model_by_node():
+    client = AsyncMock(spec=OllamaClient)
+    client.generate = AsyncMock(return_value=LLMResponse(text="ok"))
+    adapter = LLMAdapter(client=client)
+
+    with patch("research_agent.llm.adapter.settings.ollama_node_models", ROUTES):
+        await adapter.query("p", node="act")
+        await adapter.query("p", node="write_report")
+        await adapter.query("p")
+
+    models = [c.kwargs["model"] for c in client.generate.await_args_list]
+    assert models == ["gemma3:4b", None, None]
+
+
+@pytest.mark.asyncio
+async def test_query_stream_routes_model_by_node():
+    client = AsyncMock(spec=OllamaClient)
+    seen: list[str | None] = []
+
+    async def _stream(prompt, **kwargs):
+        seen.append(kwargs["model"])
+        yield LLMStreamChunk(done=True, response=LLMResponse(text="r"))
+
+    client.generate_stream = _stream
+    adapter = LLMAdapter(client=client)
+    with patch("research_agent.llm.adapter.settings.ollama_node_models", {"write_report": "big"}):
+        chunks = [c async for c in adapter.query_stream("p", node="write_report")]
+    assert chunks[-1].response.text == "r"
+    assert seen == ["big"]
+
+
+def test_summary_breaks_down_llm_time_by_model():
+    metrics = RunMetrics(
+        llm_calls=[
+            LLMCallMetric(node="act", model="gemma3:4b", duration_ms=100),
+            LLMCallMetric(node="observe", model="gemma3:4b", duration_ms=300),
+            LLMCallMetric(node="write_report", model="gemma3:12b", duration_ms=2000),
+        ]
+    )
+    by_model = metrics.summary()["llm_time_by_model"]
+    assert by_model["gemma3:4b"] == {"calls": 2, "total_ms": 400.0, "avg_ms": 200.0}
+    assert by_model["gemma3:12b"]["calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_query_structured_sends_schema_as_format():
+    client = AsyncMock(spec=OllamaClient)
+    client.generate = AsyncMock(
+        return_value=LLMResponse(text='{"tool": "web_search", "query": "q"}')
+    )
+    adapter = LLMAdapter(client=client)
+
+    parsed, response = await adapter.query_structured("p", ActDecision, node="act")
+
+    assert client.generate.await_args.kwargs["format"] == ActDecision.model_json_schema()
+    assert parsed == ActDecision(tool="web_search", query="q")
+    assert response.text.startswith("{")
+
+
+@pytest.mark.asyncio
+async def test_query_structured_disabled_sends_no_format():
+    client = AsyncMock(spec=OllamaClient)
+    client.generate = AsyncMock(return_value=LLMResponse(text="TOOL: web_search"))
+    adapter = LLMAdapter(client=client)
+
+    with patch("research_agent.llm.adapter.settings.llm_structured_output", False):
+        parsed, _ = await adapter.query_structured("p", ActDecision)
+
+    assert client.generate.await_args.kwargs["format"] is None
+    assert parsed is None
+
+
+def test_parse_structured_tolerates_fences_and_rejects_invalid():
+    fenced = '```json\n{"tool": "fetch_url", "query": "http://x"}\n```'
+    assert parse_structured(fenced, ActDecision).tool == "fetch_url"
+    assert parse_structured('{"tool": "teleport", "query": "x"}', ActDecision) is None
+    too_long = '{"tool": "web_search", "query": "' + "x" * 500 + '"}'
+    assert parse_structured(too_long, ActDecision) is None
+    assert parse_structured("no json here", ActDecision) is None
+
+
+@pytest.mark.asyncio
+async def test_query_applies_node_generation_profile():
+    client = AsyncMock(spec=OllamaClient)
+    client.generate = AsyncMock(return_value=LLMResponse(text="ok"))
+    adapter = LLMAdapter(client=client)
+
+    await adapter.query("p", node="act")
+    assert client.generate.await_args.kwargs["max_tokens"] == NODE_PROFILES["act"].max_tokens
+    assert client.generate.await_args.kwargs["stop"] == list(NODE_PROFILES["act"].stop)
+
+    with patch("research_agent.llm.profiles.settings.llm_node_max_tokens", {"act": 64}):
+        await adapter.query("p2", node="act")
+    assert client.generate.await_args.kwargs["max_tokens"] == 64
+
+    await adapter.query("p3", node="act", max_tokens=10, stop=[])
+    assert client.generate.await_args.kwargs["max_tokens"] == 10
+    assert client.generate.await_args.kwargs["stop"] == []
+
+
+@pytest.mark.asyncio
+async def test_query_until_streams_and_reports_saved_tokens():
+    client = AsyncMock(spec=OllamaClient)
+    seen: dict = {}
+
+    async def _stream(prompt, **kwargs):
+        seen.update(kwargs)
+        yield LLMStreamChunk(text="{}")
+        yield LLMStreamChunk(
+            done=True,
+            response=LLMResponse(text="{}", stopped_early=True, output_tokens_saved=150),
+        )
+
+    client.generate_stream = _stream
+    adapter = LLMAdapter(client=client)
+    response = await adapter.query("p", node="act", until=json_object_complete)
+
+    client.generate.assert_not_called()
+    assert seen["until"] is json_object_complete
+    assert response.output_tokens_saved == 150
+
+
+def test_json_object_complete_respects_strings():
+    assert not json_object_complete('{"query": "a } b"')
+    assert json_object_complete('{"query": "a } b"}')
+    assert json_object_complete('noise {"a": {"b": "\\" }"}} trailing')
+    assert not json_object_complete("TOOL: web_search")
+
+
+@pytest.mark.asyncio
+async def test_preload_models_covers_every_model_and_host():
+    client = AsyncMock(spec=OllamaClient)
+    client.model = "big"
+    client.hosts = ["http://a", "http://b"]
+
+    async def _preload(model, *, host):
+        if host == "http://b" and model == "gemma3:4b":
+            raise RuntimeError("boom")
+        return 10.0
+
+    client.preload = AsyncMock(side_effect=_preload)
+    adapter = LLMAdapter(client=client)
+    with patch("research_agent.llm.adapter.settings.ollama_node_models", ROUTES):
+        loads = await adapter.preload_models()
+
+    assert loads == {
+        "big@http://a": 10.0,
+        "big@http://b": 10.0,
+        "gemma3:4b@http://a": 10.0,
+        "gemma3:4b@http://b": None,
+    }
+
+
+def test_summary_counts_cold_starts():
+    metrics = RunMetrics(
+        llm_calls=[LLMCallMetric(load_ms=3200.0), LLMCallMetric(load_ms=4.0), LLMCallMetric()]
+    )
+    summary = metrics.summary()
+    assert summary["cold_start_llm_calls"] == 1
+    assert summary["total_model_load_ms"] == 3204.0
+
+
+@pytest.mark.asyncio
+async def test_query_cancels_generation_at_deadline():
+    cancelled = asyncio.Event()
+
+    async def _slow(prompt, **kwargs):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    client = AsyncMock(spec=OllamaClient)
+    client.generate = _slow
+    adapter = LLMAdapter(client=client)
+
+    with pytest.raises(DeadlineExceededError):
+        await adapter.query("p", node="act", deadline=Deadline(time.time() + 0.05))
+    await asyncio.wait_for(cancelled.wait(), 1)
+    assert adapter.flight.stats()["in_flight"] == 0
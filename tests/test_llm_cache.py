@@ -0,0 +1,129 @@
+"""Tests for the LLM response cache and its adapter integration."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from research_agent.graph.nodes import _llm_metric
+from research_agent.graph.state import LLMCallMetric, RunMetrics
+from research_agent.llm.adapter import LLMAdapter
+from research_agent.llm.cache import LLMCache, cache_key
+from research_agent.llm.client import LLMResponse, OllamaClient
+
+
+def _response(text: str) -> LLMResponse:
+    return LLMResponse(text=text, prompt_eval_count=10, eval_count=5, total_duration_ns=1_000)
+
+
+def test_cache_key_is_order_independent_and_field_sensitive():
+    a = cache_key(model="m", prompt="p", temperature=0.3)
+    b = cache_key(temperature=0.3, prompt="p", model="m")
+    c = cache_key(model="m", prompt="p", temperature=0.7)
+    assert a == b
+    assert a != c
+
+
+def test_put_get_memory_and_disk(tmp_path):
+    db = str(tmp_path / "cache.db")
+    cache = LLMCache(db, ttl_seconds=60, max_memory_entries=4, max_disk_entries=10)
+    cache.put("k1", _response("hello"))
+    assert cache.get("k1").text == "hello"
+
+    # A fresh instance only has the SQLite tier.
+    reopened = LLMCache(db, ttl_seconds=60, max_memory_entries=4, max_disk_entries=10)
+    loaded = reopened.get("k1")
+    assert loaded is not None
+    assert loaded.text == "hello"
+    assert loaded.eval_count == 0  # only the content is stored
+    assert reopened.get("missing") is None
+
+
+def test_ttl_expiry(tmp_path, monkeypatch):
+    import research_agent.llm.cache as cache_mod
+
+    now = 1_000.0
+    monkeypatch.setattr(cache_mod.time, "time", lambda: now)
+    cache = LLMCache(str(tmp_path / "c.db"), ttl_seconds=10)
+    cache.put("k", _response("x"))
+
+    now = 1_005.0
+    assert cache.get("k") is not None
+    now = 1_020.0
+    assert cache.get("k") is None
+
+
+def test_memory_lru_and_disk_bound(tmp_path):
+    db = str(tmp_path / "c.db")
+    cache = LLMCache(db, ttl_seconds=0, max_memory_entries=2, max_disk_entries=3)
+    for i in range(5):
+        cache.put(f"k{i}", _response(str(i)))
+
+    assert list(cache._memory) == ["k3", "k4"]
+    with cache._conn() as conn:
+        keys = {r[0] for r in conn.execute("SELECT key FROM llm_cache")}
+    assert keys == {"k2", "k3", "k4"}
+
+
+@pytest.mark.asyncio
+async def test_adapter_cache_hit_and_miss(tmp_path):
+    client = AsyncMock(spec=OllamaClient)
+    client.model = "m"
+    client.generate = AsyncMock(return_value=_response("answer"))
+    adapter = LLMAdapter(client=client, cache=LLMCache(str(tmp_path / "c.db")))
+
+    first = await adapter.query("same prompt", system="s", cache=True)
+    second = await adapter.query("same prompt", system="s", cache=True)
+    uncached = await adapter.query("same prompt", system="s")
+
+    assert client.generate.await_count == 2
+    assert first.cache_status == "miss"
+    assert second.cache_status == "hit"
+    assert second.text == "answer"
+    assert second.eval_count == 0  # nothing was generated for a hit
+    assert uncached.cache_status == ""
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_does_not_repeat_the_first_calls_metrics(tmp_path):
+    client = AsyncMock(spec=OllamaClient)
+    client.model = "m"
+    client.generate = AsyncMock(
+        return_value=LLMResponse(
+            text="answer",
+            eval_count=5,
+            host="h1",
+            retries=2,
+            hedged=True,
+            load_duration_ns=3_000_000_000,
+            stopped_early=True,
+            output_tokens_saved=100,
+        )
+    )
+    adapter = LLMAdapter(client=client, cache=LLMCache(str(tmp_path / "c.db")))
+
+    responses = [await adapter.query("same prompt", cache=True) for _ in range(3)]
+    summary = RunMetrics(llm_calls=[_llm_metric("act", r) for r in responses]).summary()
+
+    assert [r.cache_status for r in responses] == ["miss", "hit", "hit"]
+    assert summary["llm_retries"] == 2
+    assert summary["hedged_llm_calls"] == 1
+    assert summary["cold_start_llm_calls"] == 1
+    assert summary["total_model_load_ms"] == 3000.0
+    assert summary["total_output_tokens_saved"] == 100
+    assert responses[1].host == ""
+
+
+def test_run_metrics_cache_counters():
+    metrics = RunMetrics(
+        llm_calls=[
+            LLMCallMetric(node="plan", cache_status="miss"),
+            LLMCallMetric(node="act", cache_status="hit"),
+            LLMCallMetric(node="act", cache_status="hit"),
+            LLMCallMetric(node="reflect"),
+        ]
+    )
+    summary = metrics.summary()
+    assert summary["llm_cache_hits"] == 2
+    assert summary["llm_cache_misses"] == 1
@@ -123,3 +123,136 @@ async def test_generate_returns_metrics():
     assert result.total_duration_ns == 1_000_000_000
     assert result.prompt_eval_duration_ns == 400_000_000
     assert result.eval_duration_ns == 600_000_000
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_generate_reuses_pooled_client():
+    respx.post("http://test:11434/api/generate").mock(
+        return_value=httpx.Response(200, json={"response": "ok"})
+    )
+    client = OllamaClient(host="http://test:11434", model="m", timeout=10)
+    await client.generate("one")
+    pooled = client._http
+    await client.generate("two")
+
+    assert pooled is not None
+    assert client._http is pooled
+    assert client.is_open
+
+    await client.aclose()
+    assert not client.is_open
+    assert client._http is None
+
+
+@pytest.mark.asyncio
+async def test_open_is_idempotent_and_uses_limits():
+    limits = httpx.Limits(max_connections=3, max_keepalive_connections=2, keepalive_expiry=5)
+    client = OllamaClient(host="http://test:11434", model="m", timeout=10, limits=limits)
+    await client.open()
+    first = client._http
+    await client.open()
+
+    assert client._http is first
+    assert client.limits is limits
+    await client.aclose()
+    await client.aclose()  # closing twice is a no-op
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_generate_stream_yields_tokens():
+    import json
+
+    lines = [
+        {"response": "Hel", "done": False},
+        {"response": "lo", "done": False},
+        {
+            "response": "",
+            "done": True,
+            "prompt_eval_count": 5,
+            "eval_count": 2,
+            "total_duration": 1_000_000,
+        },
+    ]
+    route = respx.post("http://test:11434/api/generate").mock(
+        return_value=httpx.Response(200, text="\n".join(json.dumps(x) for x in lines) + "\n")
+    )
+    client = OllamaClient(host="http://test:11434", model="m", timeout=10)
+    chunks = [c async for c in client.generate_stream("prompt")]
+
+    assert json.loads(route.calls[0].request.content)["stream"] is True
+    assert [c.text for c in chunks[:-1]] == ["Hel", "lo"]
+    final = chunks[-1]
+    assert final.done
+    assert final.response is not None
+    assert final.response.text == "Hello"
+    assert final.response.eval_count == 2
+    assert final.response.ttft_ms > 0
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_generate_model_override():
+    import json
+
+    route = respx.post("http://test:11434/api/generate").mock(
+        return_value=httpx.Response(200, json={"response": "small", "model": "tiny:1b"})
+    )
+    client = OllamaClient(host="http://test:11434", model="big:12b", timeout=10)
+    result = await client.generate("prompt", model="tiny:1b")
+    await client.generate("prompt")
+
+    assert json.loads(route.calls[0].request.content)["model"] == "tiny:1b"
+    assert json.loads(route.calls[1].request.content)["model"] == "big:12b"
+    assert result.model == "tiny:1b"
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_generate_stream_stops_once_reply_complete():
+    import json
+
+    tokens = ['{"tool": ', '"web_search", ', '"query": "q"}', "\n\nBecause", " reasons"]
+    lines = [{"response": t, "done": False} for t in tokens] + [{"response": "", "done": True}]
+    route = respx.post("http://test:11434/api/generate").mock(
+        return_value=httpx.Response(200, text="\n".join(json.dumps(x) for x in lines) + "\n")
+    )
+    client = OllamaClient(host="http://test:11434", model="m", timeout=10)
+    chunks = [
+        c
+        async for c in client.generate_stream(
+            "prompt", max_tokens=100, stop=["\n\n"], until=lambda text: text.endswith("}")
+        )
+    ]
+
+    assert json.loads(route.calls[0].request.content)["options"]["stop"] == ["\n\n"]
+    final = chunks[-1].response
+    assert final.text == '{"tool": "web_search", "query": "q"}'
+    assert final.stopped_early is True
+    assert final.eval_count == 3
+    assert final.output_tokens_saved == 97
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_preload_sends_keep_alive_and_reads_load_duration():
+    route = respx.post("http://test:11434/api/generate").mock(
+        side_effect=[
+            httpx.Response(200, json={"done": True, "done_reason": "load"}),
+            httpx.Response(200, json={"response": "hi", "load_duration": 2_500_000_000}),
+        ]
+    )
+    client = OllamaClient(host="http://test:11434", model="m", timeout=10)
+    with patch("research_agent.llm.client.settings.ollama_keep_alive", "1h"):
+        load_ms = await client.preload()
+        result = await client.generate("hello")
+
+    import json
+
+    preload = json.loads(route.calls[0].request.content)
+    assert preload == {"model": "m", "keep_alive": "1h"}
+    assert json.loads(route.calls[1].request.content)["keep_alive"] == "1h"
+    assert load_ms >= 0
+    assert result.load_duration_ns == 2_500_000_000
@@ -0,0 +1,162 @@
+"""Tests for multi-host Ollama routing."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+import respx
+from fastapi.testclient import TestClient
+
+from research_agent.api.app import app
+from research_agent.llm.client import OllamaClient
+from research_agent.llm.pool import HostPool, NoHealthyHostError
+
+HOSTS = ["http://a:11434", "http://b:11434"]
+
+
+def test_pick_least_outstanding():
+    pool = HostPool(HOSTS, affinity_slack=0)
+    pool["http://a:11434"].in_flight = 3
+    assert pool.pick() == "http://b:11434"
+
+
+def test_affinity_sticks_within_slack_then_moves():
+    pool = HostPool(HOSTS, affinity_slack=2)
+    first = pool.pick("run-1")
+    other = next(h for h in HOSTS if h != first)
+
+    pool[first].in_flight = 2
+    assert pool.pick("run-1") == first  # 2 <= 0 + slack
+
+    pool[first].in_flight = 3
+    assert pool.pick("run-1") == other
+    assert pool.pick("run-1") == other  # the run now sticks to the new host
+
+
+def test_unhealthy_hosts_skipped_until_nothing_else():
+    pool = HostPool(HOSTS)
+    pool.mark_failure("http://a:11434", httpx.ConnectError("down"))
+    pool["http://b:11434"].in_flight = 10
+    assert pool.pick() == "http://b:11434"
+
+    pool.mark_failure("http://b:11434", httpx.ConnectError("down"))
+    assert pool.pick() in HOSTS  # still try something
+    with pytest.raises(NoHealthyHostError):
+        pool.pick(exclude=set(HOSTS))
+
+
+@pytest.mark.asyncio
+async def test_lease_tracks_in_flight_and_latency():
+    pool = HostPool(HOSTS)
+    async with pool.lease("http://a:11434") as stats:
+        assert stats.in_flight == 1
+    assert stats.in_flight == 0
+    assert stats.requests == 1
+    assert stats.ewma_latency_ms >= 0
+    assert len(stats.latencies_ms) == 1
+
+
+def test_pick_avoids_full_hosts_despite_affinity():
+    pool = HostPool(HOSTS, affinity_slack=10, max_in_flight=2)
+    first = pool.pick("run-1")
+    pool[first].in_flight = 2
+    assert pool.pick("run-1") != first  # sticky host is at its limit
+
+    for host in HOSTS:
+        pool[host].in_flight = 2
+    assert pool.pick() in HOSTS  # all full: route anyway and wait in lease
+
+
+@pytest.mark.asyncio
+async def test_lease_waits_for_a_free_slot_on_the_host():
+    pool = HostPool(HOSTS, max_in_flight=1)
+    host = HOSTS[0]
+    order: list[str] = []
+
+    async def request(name: str, hold: float) -> None:
+        async with pool.lease(host):
+            order.append(f"{name} start")
+            await asyncio.sleep(hold)
+            order.append(f"{name} end")
+
+    first = asyncio.create_task(request("first", 0.02))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(request("second", 0))
+    await asyncio.sleep(0)
+    assert pool[host].in_flight == 2  # the waiting request counts for routing
+    await asyncio.gather(first, second)
+
+    assert order == ["first start", "first end", "second start", "second end"]
+    assert pool[host].in_flight == 0
+    assert pool[host].requests == 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_fails_over_on_connection_error():
+    respx.post("http://a:11434/api/generate").mock(side_effect=httpx.ConnectError("refused"))
+    respx.post("http://b:11434/api/generate").mock(
+        return_value=httpx.Response(200, json={"response": "from b"})
+    )
+    client = OllamaClient(hosts=HOSTS, model="m", timeout=10)
+    client.pool["http://b:11434"].in_flight = 1  # make "a" the first choice
+
+    result = await client.generate("p", affinity="run-1")
+    client.pool["http://b:11434"].in_flight = 0
+
+    assert result.text == "from b"
+    assert result.host == "http://b:11434"
+    stats = {s["host"]: s for s in client.host_stats()}
+    assert stats["http://a:11434"]["healthy"] is False
+    assert stats["http://a:11434"]["failures"] == 1
+    assert stats["http://b:11434"]["requests"] == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_raises_when_all_hosts_down():
+    respx.post("http://a:11434/api/generate").mock(side_effect=httpx.ConnectError("refused"))
+    respx.post("http://b:11434/api/generate").mock(side_effect=httpx.ConnectError("refused"))
+    client = OllamaClient(hosts=HOSTS, model="m", timeout=10)
+    with pytest.raises(httpx.ConnectError):
+        await client.generate("p")
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_probe_updates_health():
+    respx.get("http://a:11434/api/tags").mock(return_value=httpx.Response(200, json={}))
+    respx.get("http://b:11434/api/tags").mock(return_value=httpx.Response(503))
+    pool = HostPool(HOSTS)
+    async with httpx.AsyncClient() as http:
+        await pool.probe(http)
+    assert pool["http://a:11434"].healthy
+    assert not pool["http://b:11434"].healthy
+
+
+def test_stats_endpoint_exposes_host_stats():
+    llm = MagicMock()
+    llm.client.host_stats.return_value = [{"host": "http://a:11434", "in_flight": 2}]
+    llm.scheduler.stats.return_value = {"active": 0, "waiting": 0}
+    llm.flight.stats.return_value = {"executed": 3, "coalesced": 1, "in_flight": 0}
+    with patch("research_agent.api.routers.stats.get_llm", return_value=llm):
+        resp = TestClient(app).get("/api/stats")
+    assert resp.status_code == 200
+    assert resp.json()["hosts"][0]["in_flight"] == 2
+    assert resp.json()["coalesced"]["llm"]["coalesced"] == 1
+
+
+@pytest.mark.asyncio
+async def test_open_starts_and_aclose_stops_health_probe():
+    client = OllamaClient(hosts=HOSTS, model="m", timeout=10)
+    with patch.object(client.pool, "probe") as probe:
+        await client.open()
+        assert client._health_task is not None
+        await client.aclose()
+    assert client._health_task is None
+    assert probe.await_count <= 1
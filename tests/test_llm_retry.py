@@ -0,0 +1,203 @@
+"""Tests for Ollama retries with backoff and hedged requests."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+import respx
+
+from research_agent.llm.client import OllamaClient
+from research_agent.llm.pool import HostPool
+from research_agent.llm.retry import RetryPolicy
+
+URL = "http://test:11434/api/generate"
+HOSTS = ["http://a:11434", "http://b:11434"]
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_retries_5xx_then_succeeds():
+    route = respx.post(URL).mock(
+        side_effect=[
+            httpx.Response(503, text="busy"),
+            httpx.ConnectError("reset"),
+            httpx.Response(200, json={"response": "ok"}),
+        ]
+    )
+    client = OllamaClient(host="http://test:11434", model="m", timeout=10)
+    result = await client.generate("p")
+    assert result.text == "ok"
+    assert result.retries == 2
+    assert route.call_count == 3
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_gives_up_after_max_attempts_and_skips_client_errors():
+    route = respx.post(URL).mock(return_value=httpx.Response(500))
+    client = OllamaClient(
+        host="http://test:11434", model="m", timeout=10, retry=RetryPolicy(max_attempts=2)
+    )
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.generate("p")
+    assert route.call_count == 2
+
+    route.mock(return_value=httpx.Response(400))
+    route.reset()
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.generate("p")
+    assert route.call_count == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_read_timeouts_are_not_retried():
+    route = respx.post(URL).mock(side_effect=httpx.ReadTimeout("stalled"))
+    client = OllamaClient(host="http://test:11434", model="m", timeout=10)
+    with pytest.raises(httpx.ReadTimeout):
+        await client.generate("p")
+    assert route.call_count == 1
+    await client.aclose()
+
+    assert RetryPolicy.is_retryable(httpx.RemoteProtocolError("dropped"))
+    assert RetryPolicy.is_retryable(httpx.ReadError("reset"))
+    assert not RetryPolicy.is_retryable(httpx.PoolTimeout("busy"))
+
+
+def test_backoff_is_capped_and_jittered():
+    policy = RetryPolicy(base_delay_s=1.0, max_delay_s=4.0)
+    for retry in range(1, 8):
+        assert 0 <= policy.backoff(retry) <= min(4.0, 2 ** (retry - 1))
+
+
+def test_latency_percentile_needs_samples():
+    pool = HostPool(HOSTS)
+    assert pool.latency_percentile(95) is None
+    for ms in range(1, 101):
+        pool["http://a:11434"].record_latency(float(ms))
+    assert pool.latency_percentile(95) == 96.0
+    assert pool.latency_percentile(95, min_samples=500) is None
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_slow_request_is_hedged_on_another_host():
+    slow_cancelled = asyncio.Event()
+
+    async def _slow(request):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            slow_cancelled.set()
+            raise
+        return httpx.Response(200, json={"response": "slow"})
+
+    respx.post("http://a:11434/api/generate").mock(side_effect=_slow)
+    respx.post("http://b:11434/api/generate").mock(
+        return_value=httpx.Response(200, json={"response": "fast"})
+    )
+    client = OllamaClient(hosts=HOSTS, model="m", timeout=10)
+    for _ in range(20):
+        client.pool["http://a:11434"].record_latency(10.0)
+    client.pool["http://b:11434"].in_flight = 1  # route the primary to "a"
+
+    with (
+        patch("research_agent.llm.client.settings.llm_hedge_min_delay_ms", 10.0),
+        patch("research_agent.llm.client.settings.llm_hedge_min_samples", 20),
+    ):
+        result = await client.generate("p")
+    client.pool["http://b:11434"].in_flight = 0
+
+    assert result.text == "fast"
+    assert result.host == "http://b:11434"
+    assert result.hedged is True
+    await asyncio.sleep(0)
+    assert slow_cancelled.is_set()
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("failing_call", [1, 2])
+async def test_success_wins_when_both_sides_finish_together(failing_call):
+    gate = asyncio.Event()
+    calls = 0
+
+    async def _post_once(path, payload, *, affinity, busy):
+        nonlocal calls
+        calls += 1
+        call = calls
+        await gate.wait()
+        if call == failing_call:
+            raise httpx.ConnectError("refused")
+        return "http://b:11434", {"response": "fast"}
+
+    client = OllamaClient(hosts=HOSTS, model="m", timeout=10)
+    for _ in range(20):
+        client.pool["http://a:11434"].record_latency(10.0)
+    asyncio.get_running_loop().call_later(0.05, gate.set)
+
+    with (
+        patch.object(client, "_post_once", _post_once),
+        patch("research_agent.llm.client.settings.llm_hedge_min_delay_ms", 10.0),
+        patch("research_agent.llm.client.settings.llm_hedge_min_samples", 20),
+    ):
+        host, data, hedged = await client._post_hedged("/api/generate", {}, affinity=None)
+
+    assert (host, data["response"], hedged) == ("http://b:11434", "fast", True)
+    assert calls == 2
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_hedge_counts_against_the_per_host_limit():
+    async def _slow(request):
+        await asyncio.sleep(5)
+
+    respx.post("http://a:11434/api/generate").mock(side_effect=_slow)
+    b = respx.post("http://b:11434/api/generate").mock(
+        return_value=httpx.Response(200, json={"response": "fast"})
+    )
+    with patch("research_agent.llm.pool.settings.llm_max_concurrency_per_host", 1):
+        client = OllamaClient(hosts=HOSTS, model="m", timeout=10)
+    for _ in range(20):
+        client.pool["http://a:11434"].record_latency(10.0)
+
+    release = asyncio.Event()
+
+    async def _busy_b():
+        async with client.pool.lease("http://b:11434"):
+            await release.wait()
+
+    busy = asyncio.create_task(_busy_b())
+    await asyncio.sleep(0)
+    with (
+        patch("research_agent.llm.client.settings.llm_hedge_min_delay_ms", 10.0),
+        patch("research_agent.llm.client.settings.llm_hedge_min_samples", 20),
+    ):
+        call = asyncio.create_task(client.generate("p"))
+        await asyncio.sleep(0.1)
+        assert b.call_count == 0  # the hedge waits for b's only slot
+        release.set()
+        result = await call
+
+    await busy
+    assert result.text == "fast" and result.hedged is True
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_no_hedge_with_single_host():
+    respx.post(URL).mock(return_value=httpx.Response(200, json={"response": "ok"}))
+    client = OllamaClient(host="http://test:11434", model="m", timeout=10)
+    for _ in range(50):
+        client.pool["http://test:11434"].record_latency(0.0)
+    result = await client.generate("p")
+    assert result.hedged is False
+    await client.aclose()
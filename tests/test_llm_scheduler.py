@@ -0,0 +1,116 @@
+"""Tests for the priority-aware LLM admission scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from research_agent.llm.adapter import LLMAdapter
+from research_agent.llm.client import LLMResponse, OllamaClient
+from research_agent.llm.scheduler import LLMScheduler
+
+
+async def _hold(scheduler: LLMScheduler, order: list[str], label: str, node: str, run: str):
+    async with scheduler.slot(node=node, run_id=run):
+        order.append(label)
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_is_respected():
+    scheduler = LLMScheduler(max_concurrency=2, aging_seconds=0)
+    peak = 0
+
+    async def work():
+        nonlocal peak
+        async with scheduler.slot(node="act", run_id="r"):
+            peak = max(peak, scheduler.stats()["active"])
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(work() for _ in range(6)))
+    assert peak == 2
+    assert scheduler.stats() == {
+        "max_concurrency": 2,
+        "active": 0,
+        "waiting": 0,
+        "active_runs": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_node_admitted_first():
+    scheduler = LLMScheduler(max_concurrency=1, aging_seconds=0)
+    order: list[str] = []
+
+    async with scheduler.slot(node="plan", run_id="r0"):
+        tasks = [
+            asyncio.create_task(_hold(scheduler, order, "observe", "observe", "r1")),
+            asyncio.create_task(_hold(scheduler, order, "act", "act", "r2")),
+            asyncio.create_task(_hold(scheduler, order, "report", "write_report", "r3")),
+        ]
+        await asyncio.sleep(0.01)
+        assert scheduler.stats()["waiting"] == 3
+
+    await asyncio.gather(*tasks)
+    assert order == ["report", "act", "observe"]
+
+
+@pytest.mark.asyncio
+async def test_runs_get_a_fair_share():
+    scheduler = LLMScheduler(max_concurrency=2, aging_seconds=0)
+    order: list[str] = []
+    release_a1 = asyncio.Event()
+
+    async def long_a():
+        async with scheduler.slot(node="act", run_id="A"):
+            await release_a1.wait()
+
+    holder = asyncio.create_task(long_a())
+    async with scheduler.slot(node="act", run_id="A"):
+        await asyncio.sleep(0)
+        tasks = [
+            asyncio.create_task(_hold(scheduler, order, "A", "act", "A")),
+            asyncio.create_task(_hold(scheduler, order, "B", "act", "B")),
+        ]
+        await asyncio.sleep(0.01)
+    # One of A's two slots is free; B has nothing in flight so it goes first.
+    await asyncio.sleep(0.01)
+    release_a1.set()
+    await asyncio.gather(holder, *tasks)
+    assert order == ["B", "A"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    scheduler = LLMScheduler(max_concurrency=1, aging_seconds=0)
+    async with scheduler.slot(node="act", run_id="r"):
+        task = asyncio.create_task(_hold(scheduler, [], "x", "act", "r2"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert scheduler.stats()["waiting"] == 0
+    assert scheduler.stats()["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_adapter_records_queue_wait_separately():
+    client = AsyncMock(spec=OllamaClient)
+
+    async def slow_generate(prompt, **kwargs):
+        await asyncio.sleep(0.05)
+        return LLMResponse(text=prompt, total_duration_ns=50_000_000)
+
+    client.generate = slow_generate
+    adapter = LLMAdapter(client=client, scheduler=LLMScheduler(max_concurrency=1))
+
+    first, second = await asyncio.gather(
+        adapter.query("one", node="act", run_id="r1"),
+        adapter.query("two", node="act", run_id="r2"),
+    )
+    waits = sorted([first.queue_wait_ms, second.queue_wait_ms])
+    assert waits[0] == 0.0
+    assert waits[1] >= 40
+    assert first.total_duration_ns == second.total_duration_ns == 50_000_000
@@ -0,0 +1,109 @@
+"""Tests for chat-session mode (KV cache reuse across calls in a run)."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+import respx
+
+from research_agent.llm.adapter import LLMAdapter
+from research_agent.llm.client import LLMResponse, OllamaClient
+from research_agent.llm.session import SESSION_SYSTEM, ChatSession, SessionRegistry
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_chat_posts_messages():
+    route = respx.post("http://test:11434/api/chat").mock(
+        return_value=httpx.Response(
+            200,
+            json={"message": {"role": "assistant", "content": "hi"}, "prompt_eval_count": 7},
+        )
+    )
+    client = OllamaClient(host="http://test:11434", model="m", timeout=10)
+    result = await client.chat([{"role": "user", "content": "hello"}], max_tokens=32)
+
+    payload = json.loads(route.calls[0].request.content)
+    assert payload["messages"] == [{"role": "user", "content": "hello"}]
+    assert payload["options"]["num_predict"] == 32
+    assert result.text == "hi"
+    assert result.prompt_eval_count == 7
+
+
+def _chat_response(text: str, prompt_eval_count: int) -> LLMResponse:
+    return LLMResponse(
+        text=text,
+        prompt_eval_count=prompt_eval_count,
+        eval_count=10,
+        prompt_eval_duration_ns=prompt_eval_count * 2_000_000,  # 2 ms per token
+    )
+
+
+@pytest.mark.asyncio
+async def test_session_mode_appends_history_and_reports_savings():
+    client = AsyncMock(spec=OllamaClient)
+    client.chat = AsyncMock(side_effect=[_chat_response("first", 200), _chat_response("second", 5)])
+    adapter = LLMAdapter(client=client)
+
+    with patch("research_agent.llm.adapter.settings.llm_session_mode", True):
+        first = await adapter.query("a" * 40, system="SYS", run_id="r1", session=True)
+        second = await adapter.query("b" * 40, system="SYS", run_id="r1", session=True)
+
+    client.generate.assert_not_called()
+    first_msgs = client.chat.await_args_list[0].args[0]
+    second_msgs = client.chat.await_args_list[1].args[0]
+    # The second call re-sends the first turn unchanged as its prefix.
+    assert second_msgs[: len(first_msgs)] == first_msgs
+    assert second_msgs[0] == {"role": "system", "content": SESSION_SYSTEM}
+    assert second_msgs[len(first_msgs)] == {"role": "assistant", "content": "first"}
+
+    assert first.cached_prompt_tokens == 0
+    assert second.cached_prompt_tokens == 210  # 200 prompt + 10 generated tokens
+    assert second.prompt_eval_saved_ms == pytest.approx(210 * 2.0)
+
+    adapter.end_session("r1")
+    assert "r1" not in adapter.sessions
+
+
+@pytest.mark.asyncio
+async def test_session_flag_ignored_when_mode_disabled():
+    client = AsyncMock(spec=OllamaClient)
+    client.generate = AsyncMock(return_value=LLMResponse(text="plain"))
+    adapter = LLMAdapter(client=client)
+
+    with patch("research_agent.llm.adapter.settings.llm_session_mode", False):
+        result = await adapter.query("p", run_id="r1", session=True)
+
+    assert result.text == "plain"
+    client.chat.assert_not_called()
+
+
+def test_session_resets_when_history_too_long():
+    sess = ChatSession(run_id="r")
+    with patch("research_agent.llm.session.settings.llm_session_max_messages", 3):
+        sess.append_turn("u", "a", prompt_tokens=10, eval_count=2)
+        assert sess.needs_reset()
+        sess.reset()
+    assert len(sess.messages) == 1
+    assert sess.kv_tokens == 0
+
+
+def test_reused_tokens_detects_evicted_cache():
+    sess = ChatSession(run_id="r")
+    sess.kv_tokens = 500
+    # Ollama had to re-evaluate everything (e.g. another run evicted the cache).
+    assert sess.reused_tokens("x" * 40, prompt_eval_count=510) == 0
+    assert sess.reused_tokens("x" * 40, prompt_eval_count=10) == 500
+
+
+def test_registry_is_bounded():
+    registry = SessionRegistry(max_sessions=2)
+    registry.get("a")
+    registry.get("b")
+    registry.get("a")
+    registry.get("c")
+    assert "b" not in registry
+    assert len(registry) == 2
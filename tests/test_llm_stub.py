@@ -0,0 +1,108 @@
+"""Tests for the record/replay Ollama stand-in server."""
+
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+import respx
+from typer.testing import CliRunner
+
+from research_agent.cli.main import app as cli_app
+from research_agent.graph.schemas import ActDecision
+from research_agent.llm.client import OllamaClient
+from research_agent.llm.stub import StubConfig, create_stub_app
+
+STUB = "http://stub"
+
+
+def _client(config: StubConfig) -> OllamaClient:
+    transport = httpx.ASGITransport(app=create_stub_app(config))
+    return OllamaClient(host=STUB, model="m", timeout=10, transport=transport)
+
+
+def _replay(tmp_path, **kwargs) -> StubConfig:
+    defaults = {"latency_ms": 0.0, "tokens_per_second": 0.0}
+    defaults.update(kwargs)
+    return StubConfig(recordings_path=str(tmp_path / "rec.jsonl"), **defaults)
+
+
+@pytest.mark.asyncio
+async def test_replay_synthetic_is_deterministic_and_honours_limits(tmp_path):
+    client = _client(_replay(tmp_path, synthetic_tokens=40))
+    first = await client.generate("what is x?", max_tokens=8)
+    second = await client.generate("what is x?", max_tokens=8)
+
+    assert first.text == second.text
+    assert first.eval_count == 8
+    assert first.prompt_eval_count > 0
+    assert first.model == "m"
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_replay_synthetic_satisfies_json_schema(tmp_path):
+    client = _client(_replay(tmp_path))
+    result = await client.generate("p", format=ActDecision.model_json_schema())
+    assert ActDecision.model_validate_json(result.text).tool == "web_search"
+
+    chat = await client.chat([{"role": "user", "content": "hi"}], format="json")
+    assert chat.text == "{}"
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_replay_stream_is_paced(tmp_path):
+    client = _client(_replay(tmp_path, latency_ms=30.0, tokens_per_second=1000.0))
+    chunks = [c async for c in client.generate_stream("p", max_tokens=5)]
+
+    final = chunks[-1].response
+    assert "".join(c.text for c in chunks[:-1]) == final.text
+    assert final.eval_count == 5
+    assert final.ttft_ms >= 25
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_record_then_replay(tmp_path):
+    respx.post("http://real:11434/api/generate").mock(
+        return_value=httpx.Response(
+            200, json={"model": "m", "response": "recorded answer", "eval_count": 2, "done": True}
+        )
+    )
+    record = _replay(tmp_path, mode="record", upstream="http://real:11434")
+    client = _client(record)
+    assert (await client.generate("q")).text == "recorded answer"
+    await client.aclose()
+
+    lines = (tmp_path / "rec.jsonl").read_text().splitlines()
+    assert json.loads(lines[0])["response"]["response"] == "recorded answer"
+
+    replay = _client(_replay(tmp_path))
+    result = await replay.generate("q")
+    assert result.text == "recorded answer"
+    assert result.eval_count == 2
+    streamed = [c async for c in replay.generate_stream("q")]
+    assert streamed[-1].response.text == "recorded answer"
+    await replay.aclose()
+
+
+@pytest.mark.asyncio
+async def test_embed_and_tags(tmp_path):
+    app = create_stub_app(_replay(tmp_path, embed_dim=8))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url=STUB) as http:
+        resp = await http.post("/api/embed", json={"model": "e", "input": ["a", "b", "a"]})
+        vectors = resp.json()["embeddings"]
+        tags = (await http.get("/api/tags")).json()
+
+    assert len(vectors) == 3 and len(vectors[0]) == 8
+    assert vectors[0] == vectors[2] != vectors[1]
+    assert sum(x * x for x in vectors[0]) == pytest.approx(1.0)
+    assert tags["models"][0]["name"] == "stub"
+
+
+def test_cli_rejects_unknown_mode():
+    result = CliRunner().invoke(cli_app, ["stub-ollama", "--mode", "bogus"])
+    assert result.exit_code != 0
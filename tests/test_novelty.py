@@ -0,0 +1,42 @@
+"""Tests for the evidence-novelty estimate."""
+
+from __future__ import annotations
+
+from research_agent.tools.base import EvidenceItem
+from research_agent.util.novelty import marginal_novelty, shingles
+
+
+def _ev(url: str, snippet: str) -> EvidenceItem:
+    return EvidenceItem(title=url, url=url, snippet=snippet)
+
+
+SEEN = [_ev("https://a.com/x", "kubernetes autoscaling scales pods on cpu usage")]
+
+
+def test_shingles_ignore_case_and_punctuation():
+    assert shingles("Pods scale, on CPU!") == shingles("pods scale on cpu")
+    assert shingles("") == set()
+    assert len(shingles("one two")) == 1  # shorter than a shingle
+
+
+def test_no_new_evidence_is_not_novel():
+    assert marginal_novelty([], SEEN) == 0.0
+
+
+def test_known_url_is_not_novel():
+    assert marginal_novelty([_ev("https://A.com/x/", "something else entirely")], SEEN) == 0.0
+
+
+def test_new_url_with_new_content_is_novel():
+    new = [_ev("https://b.com", "vertical pod autoscaler adjusts requests")]
+    assert marginal_novelty(new, SEEN) == 1.0
+
+
+def test_new_url_repeating_known_snippet_is_not_novel():
+    new = [_ev("https://mirror.com", "Kubernetes autoscaling scales pods on CPU usage.")]
+    assert marginal_novelty(new, SEEN) == 0.0
+
+
+def test_duplicates_within_new_batch_count_once():
+    item = _ev("https://b.com", "vertical pod autoscaler adjusts requests")
+    assert marginal_novelty([item, item], SEEN) == 0.5
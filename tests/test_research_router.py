@@ -50,6 +50,7 @@ def test_status_from_state_extracts_fields():
         "pending_tool": "web_search",
         "evidence": [{"title": "a"}],
         "confidence": 0.75,
+        "stop_reason": "max iterations reached",
     }
     result = _status_from_state("act", state)
     assert result["node"] == "act"
@@ -60,6 +61,7 @@ def test_status_from_state_extracts_fields():
     assert result["tool"] == "web_search"
     assert result["evidence_count"] == 1
     assert result["confidence"] == 0.75
+    assert result["stop_reason"] == "max iterations reached"
 
 
 def test_status_from_state_defaults():
@@ -238,6 +240,22 @@ def test_run_research_json_path():
     assert body["evidence_count"] == 1
 
 
+def test_run_research_releases_the_run_when_the_graph_fails():
+    with (
+        patch("research_agent.api.routers.research.build_graph") as mock_build,
+        patch("research_agent.api.routers.research.end_run") as mock_end_run,
+    ):
+        mock_graph = AsyncMock()
+        mock_graph.ainvoke = AsyncMock(side_effect=RuntimeError("boom"))
+        mock_build.return_value = mock_graph
+
+        with pytest.raises(RuntimeError):
+            client.post("/api/research", data={"question": "test?"})
+
+    run_id = mock_graph.ainvoke.call_args.kwargs["config"]["configurable"]["thread_id"]
+    mock_end_run.assert_called_once_with(run_id)
+
+
 # ---------------------------------------------------------------------------
 # POST /api/research — SSE path
 # ---------------------------------------------------------------------------
@@ -252,8 +270,11 @@ def test_run_research_sse_path():
         status="done",
     )
 
-    async def mock_astream(state_dict, stream_mode=None):
-        yield {"plan": {"plan": ["1. [web_search] test"], "status": "acting"}}
+    async def mock_astream(state_dict, config=None, stream_mode=None):
+        assert "custom" in stream_mode
+        yield ("updates", {"plan": {"plan": ["1. [web_search] test"], "status": "acting"}})
+        yield ("custom", {"type": "report_delta", "text": "## SSE"})
+        yield ("custom", {"type": "report_delta", "text": " Report"})
 
     with (
         patch("research_agent.api.routers.research.build_graph") as mock_build,
@@ -278,6 +299,32 @@ def test_run_research_sse_path():
     assert "text/event-stream" in resp.headers["content-type"]
     body = resp.text
     assert "event: status" in body
+    assert "event: plan" in body
+    assert body.count("event: report_delta") == 2
+    assert body.index("event: report_delta") < body.index("event: complete")
+
+
+def test_run_research_sse_releases_the_run_on_error():
+    async def mock_astream(state_dict, config=None, stream_mode=None):
+        yield ("updates", {"plan": {"plan": ["1. [web_search] test"], "status": "acting"}})
+        raise RuntimeError("boom")
+
+    with (
+        patch("research_agent.api.routers.research.build_graph") as mock_build,
+        patch("research_agent.api.routers.research.end_run") as mock_end_run,
+    ):
+        mock_graph = MagicMock()
+        mock_graph.astream = mock_astream
+        mock_build.return_value = mock_graph
+
+        resp = client.post(
+            "/api/research",
+            data={"question": "test?"},
+            headers={"accept": "text/event-stream"},
+        )
+
+    assert "event: error" in resp.text
+    mock_end_run.assert_called_once()
 
 
 # ---------------------------------------------------------------------------
@@ -330,3 +377,58 @@ def test_get_run_not_found():
         resp = client.get("/api/runs/missing")
 
     assert resp.status_code == 404
+
+
+# ---------------------------------------------------------------------------
+# POST /api/runs/{run_id}/resume
+# ---------------------------------------------------------------------------
+
+
+def test_resume_continues_interrupted_run_from_checkpoint(mock_ollama, monkeypatch):
+    from research_agent.graph import builder
+    from research_agent.tools.base import ToolResult
+
+    monkeypatch.setattr("research_agent.api.app.settings.warmup_on_startup", False)
+    real_write_report = builder.write_report_node
+    write_calls = 0
+
+    async def flaky_write_report(state):
+        nonlocal write_calls
+        write_calls += 1
+        if write_calls == 1:
+            raise RuntimeError("Ollama timed out")
+        return await real_write_report(state)
+
+    class MockTool:
+        async def run(self, *, query, **kwargs):
+            return ToolResult(tool="web_search", success=True, data="data", evidence=[])
+
+    registry = {"web_search": MockTool, "fetch_url": MockTool}
+    with (
+        patch.object(builder, "write_report_node", flaky_write_report),
+        patch("research_agent.graph.nodes.TOOL_REGISTRY", registry),
+        patch(
+            "research_agent.api.routers.research.uuid.uuid4", return_value=MagicMock(hex="r" * 12)
+        ),
+        TestClient(app, raise_server_exceptions=False) as live,
+    ):
+        assert live.post("/api/research", data={"question": "q?"}).status_code == 500
+        assert live.post("/api/runs/missing/resume").status_code == 404
+
+        resp = live.post("/api/runs/rrrrrrrrrrrr/resume")
+        assert resp.status_code == 200
+        body = resp.json()
+        assert "## Summary" in body["report"]
+        # Nodes that completed before the failure were not re-executed.
+        nodes = [c["node"] for c in body["metrics"]["llm_calls"]]
+        assert nodes.count("plan") == 1
+        assert nodes.count("write_report") == 1
+        assert write_calls == 2
+
+        assert live.post("/api/runs/rrrrrrrrrrrr/resume").status_code == 409
+        assert live.get("/api/runs/rrrrrrrrrrrr").status_code == 200
+
+
+def test_resume_without_checkpointer_is_rejected():
+    resp = client.post("/api/runs/abc/resume")
+    assert resp.status_code == 409
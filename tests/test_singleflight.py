@@ -0,0 +1,122 @@
+"""Tests for coalescing identical in-flight calls."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from research_agent.graph.nodes import _llm_metric
+from research_agent.graph.state import RunMetrics
+from research_agent.llm.adapter import LLMAdapter
+from research_agent.llm.client import LLMResponse, OllamaClient
+from research_agent.util.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def work() -> str:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "result"
+
+    tasks = [asyncio.create_task(flight.do("k", work)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert calls == 1
+    assert [r for r, _ in results] == ["result"] * 3
+    assert sorted(shared for _, shared in results) == [False, True, True]
+    assert flight.stats() == {"executed": 1, "coalesced": 2, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_key_is_forgotten_after_completion_and_errors_propagate():
+    flight = SingleFlight()
+
+    async def boom() -> str:
+        raise ValueError("nope")
+
+    results = await asyncio.gather(
+        flight.do("k", boom), flight.do("k", boom), return_exceptions=True
+    )
+    assert all(isinstance(r, ValueError) for r in results)
+
+    async def ok() -> str:
+        return "fresh"
+
+    assert await flight.do("k", ok) == ("fresh", False)
+
+
+@pytest.mark.asyncio
+async def test_cancelling_one_waiter_keeps_the_call_alive():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def work() -> str:
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(flight.do("k", work))
+    second = asyncio.create_task(flight.do("k", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == ("done", True)
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+@pytest.mark.asyncio
+async def test_adapter_coalesces_identical_queries():
+    client = AsyncMock(spec=OllamaClient)
+    release = asyncio.Event()
+
+    async def _generate(prompt, **kwargs):
+        await release.wait()
+        return LLMResponse(text="shared", prompt_eval_count=100, eval_count=20)
+
+    client.generate = AsyncMock(side_effect=_generate)
+    adapter = LLMAdapter(client=client)
+
+    tasks = [asyncio.create_task(adapter.query("same prompt", node="plan")) for _ in range(2)]
+    await asyncio.sleep(0)
+    release.set()
+    leader, follower = sorted(await asyncio.gather(*tasks), key=lambda r: r.coalesced)
+
+    assert client.generate.await_count == 1
+    assert leader.text == follower.text == "shared"
+    assert follower.coalesced and follower.prompt_eval_count == 0
+    assert leader.prompt_eval_count == 100
+    assert adapter.flight.stats()["coalesced"] == 1
+
+
+@pytest.mark.asyncio
+async def test_coalesced_followers_do_not_repeat_retries_or_hedges():
+    client = AsyncMock(spec=OllamaClient)
+    release = asyncio.Event()
+
+    async def _generate(prompt, **kwargs):
+        await release.wait()
+        return LLMResponse(text="shared", eval_count=20, retries=1, hedged=True)
+
+    client.generate = AsyncMock(side_effect=_generate)
+    adapter = LLMAdapter(client=client)
+
+    tasks = [asyncio.create_task(adapter.query("same prompt", node="plan")) for _ in range(2)]
+    await asyncio.sleep(0)
+    release.set()
+    responses = await asyncio.gather(*tasks)
+    summary = RunMetrics(llm_calls=[_llm_metric("plan", r) for r in responses]).summary()
+
+    assert summary["llm_retries"] == 1
+    assert summary["hedged_llm_calls"] == 1
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import time
+
 import pytest
 
 from research_agent.tools.base import EvidenceItem, ToolResult
 from research_agent.tools.local_docs import LocalDocsTool
 from research_agent.tools.python_sandbox import PythonSandboxTool
+from research_agent.util.deadline import Deadline, DeadlineExceededError
 
 
 @pytest.mark.asyncio
@@ -25,6 +28,15 @@ async def test_python_sandbox_error() -> None:
     assert "boom" in result.data
 
 
+@pytest.mark.asyncio
+async def test_python_sandbox_is_cancelled_at_a_deadline() -> None:
+    tool = PythonSandboxTool()
+    start = time.perf_counter()
+    with pytest.raises(DeadlineExceededError):
+        await Deadline(time.time() + 0.3).run(tool.run(query="import time; time.sleep(10)"))
+    assert time.perf_counter() - start < 2
+
+
 @pytest.mark.asyncio
 async def test_local_docs_no_match(tmp_path) -> None:
     tool = LocalDocsTool()
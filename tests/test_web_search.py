@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -66,6 +67,7 @@ async def test_web_search_rate_limit_then_success():
             pass
 
         mock_asyncio.sleep = noop_sleep
+        mock_asyncio.to_thread = asyncio.to_thread  # DDGS still runs off the loop
 
         tool = WebSearchTool()
         result = await tool.run(query="retry test")
@@ -88,6 +90,7 @@ async def test_web_search_rate_limit_exhausted():
             pass
 
         mock_asyncio.sleep = noop_sleep
+        mock_asyncio.to_thread = asyncio.to_thread  # DDGS still runs off the loop
 
         tool = WebSearchTool()
         result = await tool.run(query="always limited")